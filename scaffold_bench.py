@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+TrackIt 2.0 Scaffolder Benchmarks
+
+Measures ProjectScaffolder itself: import time, render time, write time,
+peak memory, batch throughput (on tmpfs and on disk) and the disk footprint
+of many tenant trees with and without a content store. Results are stored
+as JSON so runs can be compared and regressions flagged.
+
+Usage:
+    python scaffold_bench.py run --output bench.json
+    python scaffold_bench.py compare baseline.json bench.json --threshold 0.1
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from scaffold_trackit import ProjectScaffolder
+
+
+# Metrics where a larger value is better; every other metric is a cost.
+HIGHER_IS_BETTER = ("tenants_per_s",)
+
+TMPFS_CANDIDATES = ("/dev/shm",)
+
+
+def _median_time(func: Callable[[], None], repeat: int) -> float:
+    """Run func `repeat` times and return the median wall time in seconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def _locations(disk_dir: Optional[str]) -> Dict[str, str]:
+    """Directories to benchmark writes in, keyed by label."""
+    locations = {"disk": disk_dir or tempfile.gettempdir()}
+    for candidate in TMPFS_CANDIDATES:
+        if os.path.isdir(candidate) and os.access(candidate, os.W_OK):
+            locations["tmpfs"] = candidate
+            break
+    return locations
+
+
+def bench_import(repeat: int) -> float:
+    """Time `import scaffold_trackit` in a fresh interpreter."""
+    code = (
+        "import time; start = time.perf_counter(); "
+        "import scaffold_trackit; print(time.perf_counter() - start)"
+    )
+    here = str(Path(__file__).resolve().parent)
+    samples = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=here,
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        samples.append(float(output.strip()))
+    return statistics.median(samples)
+
+
+def bench_render(repeat: int) -> Dict[str, float]:
+    """Time constructing a scaffolder and rendering its files."""
+    # Rendering is lazy, so a fresh scaffolder's first `files` access is the
+    # cost create_project pays; init_s does not include it.
+    render = []
+    for _ in range(repeat):
+        fresh = ProjectScaffolder("unused")
+        start = time.perf_counter()
+        fresh.files
+        render.append(time.perf_counter() - start)
+    scaffolder = ProjectScaffolder("unused")
+    return {
+        "init_s": _median_time(lambda: ProjectScaffolder("unused"), repeat),
+        "render_s": statistics.median(render),
+        "define_files_s": _median_time(scaffolder._define_files, repeat),
+    }
+
+
+def bench_write(base_dir: str, repeat: int) -> Dict[str, float]:
+    """Time writing a fresh tree, then regenerating it with nothing changed."""
+    work = Path(tempfile.mkdtemp(prefix="trackit-bench-", dir=base_dir))
+    try:
+        dirs, files, regenerate = [], [], []
+        for i in range(repeat):
+            scaffolder = ProjectScaffolder(str(work / f"run-{i}"), quiet=True)
+            # Render up front so the timings below are writes only.
+            scaffolder.files
+            start = time.perf_counter()
+            scaffolder._create_directories()
+            dirs.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            scaffolder._create_files()
+            files.append(time.perf_counter() - start)
+            # Records the manifest; every file is already up to date.
+            scaffolder.create_project()
+            start = time.perf_counter()
+            ProjectScaffolder(str(work / f"run-{i}"), quiet=True).regenerate()
+            regenerate.append(time.perf_counter() - start)
+        return {
+            "create_directories_s": statistics.median(dirs),
+            "create_files_s": statistics.median(files),
+            "regenerate_noop_s": statistics.median(regenerate),
+        }
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+def bench_batch(base_dir: str, tenants: int) -> Dict[str, float]:
+    """Provision `tenants` full trees back to back."""
+    work = Path(tempfile.mkdtemp(prefix="trackit-bench-", dir=base_dir))
+    try:
+        start = time.perf_counter()
+        for i in range(tenants):
+            ProjectScaffolder(str(work / f"tenant-{i}"), quiet=True).create_project()
+        elapsed = time.perf_counter() - start
+        return {"batch_s": elapsed, "tenants_per_s": tenants / elapsed}
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+def _footprint(*roots: Path) -> Dict[str, float]:
+    """Allocated bytes and inodes under roots, counting each hardlinked inode once."""
+    seen = {}
+    for root in roots:
+        for path in root.rglob("*"):
+            stat = path.lstat()
+            seen[(stat.st_dev, stat.st_ino)] = stat.st_blocks * 512
+    return {"disk_bytes": float(sum(seen.values())), "inodes": float(len(seen))}
+
+
+def bench_footprint(base_dir: str, tenants: int) -> Dict[str, float]:
+    """Disk use of `tenants` trees, written plainly and via a content store."""
+    work = Path(tempfile.mkdtemp(prefix="trackit-bench-", dir=base_dir))
+    try:
+        metrics = {}
+        for label, store in (("plain", None), ("store", work / "blobs")):
+            trees = work / label
+            for i in range(tenants):
+                ProjectScaffolder(str(trees / f"tenant-{i}"), quiet=True, content_store=store).create_project()
+            roots = (trees,) if store is None else (trees, store)
+            for name, value in _footprint(*roots).items():
+                metrics[f"{name}.{label}"] = value
+        return metrics
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+def bench_memory(base_dir: str) -> Dict[str, float]:
+    """Peak Python heap while rendering and writing one tree."""
+    work = Path(tempfile.mkdtemp(prefix="trackit-bench-", dir=base_dir))
+    try:
+        tracemalloc.start()
+        ProjectScaffolder(str(work / "tenant"), quiet=True).create_project()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return {"peak_memory_bytes": float(peak)}
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+def run_benchmarks(repeat: int, tenants: int, disk_dir: Optional[str] = None) -> Dict:
+    """Run the full suite and return the results document."""
+    sample = ProjectScaffolder("unused")
+    metrics: Dict[str, float] = {"import_s": bench_import(repeat)}
+    metrics.update(bench_render(repeat))
+
+    for label, base_dir in _locations(disk_dir).items():
+        results = bench_write(base_dir, repeat)
+        results.update(bench_batch(base_dir, tenants))
+        for name, value in results.items():
+            metrics[f"{name}.{label}"] = value
+    metrics.update(bench_footprint(disk_dir or tempfile.gettempdir(), tenants))
+    metrics.update(bench_memory(tempfile.gettempdir()))
+
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": repeat,
+            "tenants": tenants,
+            "files": len(sample.files),
+            "bytes": sum(len(content.encode("utf-8")) for content in sample.files.values()),
+        },
+        "metrics": metrics,
+    }
+
+
+def compare_results(baseline: Dict, current: Dict, threshold: float) -> List[Dict]:
+    """
+    Compare two result documents.
+
+    Args:
+        baseline: Results of the reference run
+        current: Results of the run under test
+        threshold: Relative change (0.1 = 10%) beyond which a metric regresses
+
+    Returns:
+        One row per metric present in both runs
+    """
+    rows = []
+    for name, before in sorted(baseline["metrics"].items()):
+        after = current["metrics"].get(name)
+        if after is None or before == 0:
+            continue
+        change = (after - before) / before
+        worse = -change if name.split(".")[0] in HIGHER_IS_BETTER else change
+        rows.append({
+            "metric": name,
+            "baseline": before,
+            "current": after,
+            "change": change,
+            "regression": worse > threshold,
+        })
+    return rows
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark the TrackIt scaffolder.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="run the benchmark suite")
+    run.add_argument("--output", default="bench.json", help="where to write the results")
+    run.add_argument("--repeat", type=int, default=5, help="samples per timing")
+    run.add_argument("--tenants", type=int, default=20, help="trees per batch run")
+    run.add_argument("--disk-dir", help="directory for on-disk runs (default: system temp)")
+
+    compare = commands.add_parser("compare", help="compare two result files")
+    compare.add_argument("baseline")
+    compare.add_argument("current")
+    compare.add_argument("--threshold", type=float, default=0.10,
+                         help="relative slowdown that counts as a regression")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        results = run_benchmarks(args.repeat, args.tenants, args.disk_dir)
+        Path(args.output).write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+        for name, value in results["metrics"].items():
+            print(f"{name:40} {value:.6g}")
+        return 0
+
+    baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+    current = json.loads(Path(args.current).read_text(encoding="utf-8"))
+    rows = compare_results(baseline, current, args.threshold)
+    for row in rows:
+        flag = "REGRESSION" if row["regression"] else ""
+        print(f"{row['metric']:40} {row['baseline']:12.6g} {row['current']:12.6g} "
+              f"{row['change']:+8.1%} {flag}")
+    return 1 if any(row["regression"] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
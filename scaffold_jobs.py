@@ -0,0 +1,434 @@
+#!/usr/bin/env python3
+"""
+TrackIt 2.0 Provisioning Job Queue
+
+A local, SQLite-backed queue of scaffold jobs (a target directory plus
+ProjectScaffolder options) and a runner that works through it on a pool of
+processes, so provisioning can use every core on the host.
+
+- Enqueueing a job identical to one already pending returns the pending job.
+- Jobs for the same target never run at once; runs against one tree are
+  also serialized by ProjectScaffolder's lock on the tree itself, so
+  several runners (or other tools) can share a host safely.
+- A failed job is retried with backoff. Retries, and jobs whose tree
+  already exists, go through ProjectScaffolder.regenerate(), which resumes
+  from the tree's manifest and only writes what is missing or stale.
+- Jobs left running by a runner that died are picked up again.
+
+Usage:
+    python scaffold_jobs.py enqueue tenants/acme --options '{"service_worker": true}'
+    python scaffold_jobs.py enqueue --from-file tenants.jsonl
+    python scaffold_jobs.py run --workers 8
+    python scaffold_jobs.py status
+"""
+
+import argparse
+import json
+import os
+import socket
+import sqlite3
+import sys
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from scaffold_trackit import MANIFEST_FILE, TENANT_FIELDS, ProjectScaffolder
+
+
+# ProjectScaffolder options a job may set, with their types.
+JOB_FIELDS = dict(TENANT_FIELDS, content_store=str, validate=bool, template_pack=str)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  target TEXT NOT NULL,
+  options TEXT NOT NULL,
+  state TEXT NOT NULL DEFAULT 'pending',
+  attempts INTEGER NOT NULL DEFAULT 0,
+  run_after REAL NOT NULL DEFAULT 0,
+  claimed_by TEXT,
+  error TEXT,
+  created_at REAL NOT NULL,
+  updated_at REAL NOT NULL
+);
+
+-- At most one pending job per (target, options): enqueueing dedupes on it.
+CREATE UNIQUE INDEX IF NOT EXISTS jobs_pending_unique
+  ON jobs (target, options) WHERE state = 'pending';
+
+CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, run_after, id);
+"""
+
+# Seconds before retry n (1-based) of a failed job: 1, 2, 4, ... capped.
+RETRY_BASE_S = 1.0
+RETRY_MAX_S = 60.0
+
+
+def _runner_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _is_alive(runner: Optional[str]) -> bool:
+    """Whether a runner id names a live process; runners on other hosts count as alive."""
+    host, _, pid = (runner or "").rpartition(":")
+    if host != socket.gethostname() or not pid.isdigit():
+        return bool(runner)
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def provision(target: str, options: Dict) -> Dict:
+    """
+    Run one job: create the tree, or bring an existing one up to date.
+
+    Runs in a worker process, so it takes and returns plain data.
+
+    Returns:
+        The run's file counters, and how it ran ("create" or "regenerate")
+    """
+    scaffolder = ProjectScaffolder(target, quiet=True, **options)
+    if (Path(target) / MANIFEST_FILE).exists():
+        scaffolder.regenerate()
+        mode = "regenerate"
+    else:
+        scaffolder.create_project()
+        mode = "create"
+    return {"mode": mode, **scaffolder.stats}
+
+
+class JobQueue:
+    """Scaffold jobs persisted in a SQLite database."""
+
+    def __init__(self, path: str = "trackit-jobs.db"):
+        self.path = path
+        # Autocommit; transactions are opened explicitly where they matter.
+        self.db = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.db.close()
+
+    @staticmethod
+    def _check_options(options: Dict) -> str:
+        """Validate job options and return their canonical JSON form."""
+        unknown = sorted(set(options) - set(JOB_FIELDS))
+        if unknown:
+            raise ValueError(f"unknown options: {', '.join(unknown)}")
+        for name, value in options.items():
+            expected = JOB_FIELDS[name]
+            # bool is an int subclass; True is not a sample rate.
+            if isinstance(value, bool) and expected is not bool:
+                raise ValueError(f"{name} must be a {expected.__name__}")
+            if not isinstance(value, expected) and not (expected is float and isinstance(value, int)):
+                raise ValueError(f"{name} must be a {expected.__name__}")
+        return json.dumps(options, sort_keys=True)
+
+    def enqueue(self, target: str, options: Optional[Dict] = None) -> Tuple[int, bool]:
+        """
+        Add a job unless an identical one is already pending.
+
+        Args:
+            target: Directory to provision; made absolute so equal trees dedupe
+            options: ProjectScaffolder options (see JOB_FIELDS)
+
+        Returns:
+            The job's id, and whether it was newly added
+        """
+        encoded = self._check_options(options or {})
+        target = os.path.abspath(target)
+        now = time.time()
+        cursor = self.db.execute(
+            "INSERT INTO jobs (target, options, created_at, updated_at) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (target, options) WHERE state = 'pending' DO NOTHING",
+            (target, encoded, now, now),
+        )
+        if cursor.rowcount:
+            return cursor.lastrowid, True
+        row = self.db.execute(
+            "SELECT id FROM jobs WHERE target = ? AND options = ? AND state = 'pending'",
+            (target, encoded),
+        ).fetchone()
+        return row["id"], False
+
+    def claim(self, runner: str) -> Optional[sqlite3.Row]:
+        """
+        Take the oldest runnable pending job and mark it running.
+
+        A job is runnable once its retry delay has passed and no other job
+        for the same target is running.
+        """
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            row = self.db.execute(
+                "SELECT * FROM jobs WHERE state = 'pending' AND run_after <= ? "
+                "AND target NOT IN (SELECT target FROM jobs WHERE state = 'running') "
+                "ORDER BY run_after, id LIMIT 1",
+                (time.time(),),
+            ).fetchone()
+            if row is not None:
+                self.db.execute(
+                    "UPDATE jobs SET state = 'running', claimed_by = ?, attempts = attempts + 1, "
+                    "updated_at = ? WHERE id = ?",
+                    (runner, time.time(), row["id"]),
+                )
+            self.db.execute("COMMIT")
+        except BaseException:
+            self.db.execute("ROLLBACK")
+            raise
+        return row
+
+    def finish(self, job_id: int) -> None:
+        self.db.execute(
+            "UPDATE jobs SET state = 'done', error = NULL, updated_at = ? WHERE id = ?",
+            (time.time(), job_id),
+        )
+
+    def fail(self, job_id: int, error: str, max_attempts: int) -> str:
+        """
+        Record a failed attempt; requeue the job unless it is out of attempts.
+
+        Returns:
+            The job's new state
+        """
+        row = self.db.execute("SELECT attempts FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        now = time.time()
+        if row["attempts"] >= max_attempts:
+            state, run_after = "failed", now
+        else:
+            state = "pending"
+            run_after = now + min(RETRY_MAX_S, RETRY_BASE_S * 2 ** (row["attempts"] - 1))
+        try:
+            self.db.execute(
+                "UPDATE jobs SET state = ?, error = ?, run_after = ?, updated_at = ? WHERE id = ?",
+                (state, error, run_after, now, job_id),
+            )
+        except sqlite3.IntegrityError:
+            # An identical job was enqueued meanwhile; it will do this work.
+            state = "superseded"
+            self.db.execute(
+                "UPDATE jobs SET state = ?, error = ?, updated_at = ? WHERE id = ?",
+                (state, error, now, job_id),
+            )
+        return state
+
+    def release(self, job_id: int) -> str:
+        """
+        Return a claimed job that never started to the queue.
+
+        The attempt it was claimed for is given back.
+
+        Returns:
+            The job's new state
+        """
+        state = "pending"
+        try:
+            self.db.execute(
+                "UPDATE jobs SET state = ?, attempts = attempts - 1, claimed_by = NULL, updated_at = ? "
+                "WHERE id = ?",
+                (state, time.time(), job_id),
+            )
+        except sqlite3.IntegrityError:
+            state = "superseded"
+            self.db.execute(
+                "UPDATE jobs SET state = ?, updated_at = ? WHERE id = ?",
+                (state, time.time(), job_id),
+            )
+        return state
+
+    def recover(self) -> int:
+        """Requeue jobs left running by runners that are no longer alive."""
+        stale = [
+            row["id"]
+            for row in self.db.execute("SELECT id, claimed_by FROM jobs WHERE state = 'running'")
+            if not _is_alive(row["claimed_by"])
+        ]
+        requeued = 0
+        for job_id in stale:
+            try:
+                self.db.execute(
+                    "UPDATE jobs SET state = 'pending', run_after = 0, updated_at = ? WHERE id = ?",
+                    (time.time(), job_id),
+                )
+                requeued += 1
+            except sqlite3.IntegrityError:
+                self.db.execute(
+                    "UPDATE jobs SET state = 'superseded', updated_at = ? WHERE id = ?",
+                    (time.time(), job_id),
+                )
+        return requeued
+
+    def next_run_after(self) -> Optional[float]:
+        """When the earliest pending job becomes runnable, if any is pending."""
+        row = self.db.execute("SELECT MIN(run_after) AS at FROM jobs WHERE state = 'pending'").fetchone()
+        return row["at"]
+
+    def counts(self) -> Dict[str, int]:
+        """Number of jobs in each state."""
+        return {
+            row["state"]: row["n"]
+            for row in self.db.execute("SELECT state, COUNT(*) AS n FROM jobs GROUP BY state")
+        }
+
+
+def run(
+    queue: JobQueue,
+    workers: Optional[int] = None,
+    max_attempts: int = 3,
+    drain: bool = True,
+    log=print,
+) -> Dict[str, int]:
+    """
+    Execute queued jobs on a process pool.
+
+    Args:
+        queue: The queue to work through
+        workers: Jobs run at once (default: one per CPU)
+        max_attempts: Attempts per job before it is marked failed
+        drain: Return once nothing is pending or running; otherwise keep
+            polling for new jobs until interrupted
+        log: Receives one line per finished attempt
+
+    Returns:
+        Number of attempts that ended in each outcome
+    """
+    workers = workers or os.cpu_count() or 1
+    runner = _runner_id()
+    outcomes: Dict[str, int] = {}
+    requeued = queue.recover()
+    if requeued:
+        log(f"requeued {requeued} job(s) left running by a dead runner")
+
+    running: Dict[Future, sqlite3.Row] = {}
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        while True:
+            while len(running) < workers:
+                job = queue.claim(runner)
+                if job is None:
+                    break
+                try:
+                    future = pool.submit(provision, job["target"], json.loads(job["options"]))
+                except BrokenProcessPool:
+                    queue.release(job["id"])
+                    pool = _restart_pool(pool, workers, log)
+                    continue
+                running[future] = job
+
+            if not running:
+                run_after = queue.next_run_after()
+                if run_after is None and drain:
+                    return outcomes
+                delay = 1.0 if run_after is None else run_after - time.time()
+                time.sleep(min(1.0, max(0.05, delay)))
+                continue
+
+            # Wake up periodically so delayed retries and new jobs get claimed.
+            done, _ = wait(running, timeout=1.0, return_when=FIRST_COMPLETED)
+            broken = False
+            for future in done:
+                job = running.pop(future)
+                try:
+                    result = future.result()
+                except Exception as exc:
+                    # A worker that died fails every job in its pool; they are
+                    # retried like any other failure, on a fresh pool.
+                    broken = broken or isinstance(exc, BrokenProcessPool)
+                    error = "".join(traceback.format_exception_only(type(exc), exc)).strip()
+                    state = queue.fail(job["id"], error, max_attempts)
+                    outcome = "retried" if state == "pending" else state
+                    log(f"job {job['id']} {job['target']}: {error} ({outcome})")
+                else:
+                    queue.finish(job["id"])
+                    outcome = "done"
+                    log(f"job {job['id']} {job['target']}: {result['mode']}, "
+                        f"{result['files_written']} written, {result['files_skipped']} skipped")
+                outcomes[outcome] = outcomes.get(outcome, 0) + 1
+            if broken:
+                pool = _restart_pool(pool, workers, log)
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+
+def _restart_pool(pool: ProcessPoolExecutor, workers: int, log) -> ProcessPoolExecutor:
+    """Replace a pool broken by a worker that died abruptly."""
+    pool.shutdown(wait=False)
+    log("a worker process died; restarting the pool")
+    return ProcessPoolExecutor(max_workers=workers)
+
+
+def _read_jobs(path: str) -> List[Tuple[str, Dict]]:
+    """(target, options) pairs from a JSON-lines file of {"target", "options"} objects."""
+    jobs = []
+    with open(path, encoding="utf-8") as handle:
+        for line in handle:
+            if line.strip():
+                entry = json.loads(line)
+                jobs.append((entry["target"], entry.get("options", {})))
+    return jobs
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Queue and run TrackIt provisioning jobs.")
+    parser.add_argument("--db", default="trackit-jobs.db", help="queue database")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    enqueue = commands.add_parser("enqueue", help="add jobs to the queue")
+    enqueue.add_argument("target", nargs="?", help="directory to provision")
+    enqueue.add_argument("--options", default="{}", help="ProjectScaffolder options as JSON")
+    enqueue.add_argument("--from-file", help="JSON lines of {\"target\": ..., \"options\": {...}}")
+
+    runner = commands.add_parser("run", help="execute queued jobs")
+    runner.add_argument("--workers", type=int, help="jobs run at once (default: one per CPU)")
+    runner.add_argument("--max-attempts", type=int, default=3)
+    runner.add_argument("--follow", action="store_true",
+                        help="keep waiting for new jobs instead of exiting when the queue is empty")
+
+    commands.add_parser("status", help="count jobs by state")
+
+    args = parser.parse_args(argv)
+    queue = JobQueue(args.db)
+    try:
+        if args.command == "enqueue":
+            if args.from_file:
+                jobs = _read_jobs(args.from_file)
+            elif args.target:
+                jobs = [(args.target, json.loads(args.options))]
+            else:
+                parser.error("give a target or --from-file")
+            added = 0
+            for target, options in jobs:
+                try:
+                    job_id, new = queue.enqueue(target, options)
+                except ValueError as exc:
+                    print(f"{target}: {exc}", file=sys.stderr)
+                    return 2
+                added += new
+            print(f"{added} job(s) added, {len(jobs) - added} already pending")
+        elif args.command == "run":
+            try:
+                outcomes = run(queue, args.workers, args.max_attempts, drain=not args.follow)
+            except KeyboardInterrupt:
+                return 130
+            print(", ".join(f"{count} {outcome}" for outcome, count in sorted(outcomes.items())) or "nothing to do")
+            return 1 if outcomes.get("failed") else 0
+        else:
+            for state, count in sorted(queue.counts().items()):
+                print(f"{state:12} {count}")
+    finally:
+        queue.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,436 @@
+#!/usr/bin/env python3
+"""
+TrackIt 2.0 Scaffold Service
+
+An embeddable asyncio HTTP service around ProjectScaffolder. A provisioning
+backend POSTs a tenant config and gets the generated tree back as a tar.gz
+or zip, without paying interpreter startup or a full render per request.
+
+Rendered trees are cached per set of scaffolder options; only the files
+carrying the tenant's credentials are rendered per tenant. Finished
+archives are cached too, so repeated requests are served from memory. Both
+caches are LRU, bounded by entry count and by bytes.
+
+Endpoints:
+    POST /scaffold   JSON tenant config -> archive (see TENANT_FIELDS)
+    GET  /metrics    Prometheus text format
+    GET  /healthz    liveness
+
+Usage:
+    python scaffold_service.py --port 8080 --cache-mb 256 --concurrency 4
+"""
+
+import argparse
+import asyncio
+import gzip
+import hashlib
+import io
+import json
+import sys
+import tarfile
+import time
+import zipfile
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Optional, Tuple
+
+from scaffold_trackit import TENANT_FIELDS, ProjectScaffolder
+
+
+# Fields that only change the tenant's own files, not the shared render.
+CREDENTIAL_FIELDS = ("supabase_url", "supabase_anon_key")
+
+FORMATS = {
+    "tar.gz": "application/gzip",
+    "zip": "application/zip",
+}
+
+# Fixed timestamp for archive members so identical trees give identical bytes.
+ARCHIVE_MTIME = 1704067200  # 2024-01-01T00:00:00Z
+
+MAX_BODY_BYTES = 64 * 1024
+
+# Longest request or header line, and most header lines, read per request.
+MAX_LINE_BYTES = 8 * 1024
+MAX_HEADERS = 100
+
+REASONS = {
+    200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found",
+    405: "Method Not Allowed", 413: "Payload Too Large",
+    431: "Request Header Fields Too Large", 500: "Internal Server Error",
+    503: "Service Unavailable",
+}
+
+
+class RequestError(Exception):
+    """A client error, reported with its HTTP status."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class LRUCache:
+    """Least-recently-used cache bounded by entry count and total size in bytes."""
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries: "OrderedDict[Hashable, Tuple[object, int]]" = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[object]:
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key: Hashable, value: object, size: int) -> None:
+        """Store value; values larger than the whole cache are not kept."""
+        if key in self.entries:
+            self.bytes -= self.entries.pop(key)[1]
+        if size > self.max_bytes:
+            return
+        self.entries[key] = (value, size)
+        self.bytes += size
+        while len(self.entries) > self.max_entries or self.bytes > self.max_bytes:
+            _, (_, evicted) = self.entries.popitem(last=False)
+            self.bytes -= evicted
+            self.evictions += 1
+
+
+def _fail(future: asyncio.Future, exc: BaseException) -> None:
+    """Resolve a shared in-flight future with the error its builder hit."""
+    # A cancelled builder must still release the requests waiting on it.
+    if not isinstance(exc, Exception):
+        exc = RequestError(503, "build was cancelled")
+    future.set_exception(exc)
+    # Mark retrieved so a failure nobody else awaited is not logged as unhandled.
+    future.exception()
+
+
+def build_archive(files: Dict[str, str], fmt: str, root: str = "trackit-app") -> bytes:
+    """Pack files under root/ as a deterministic tar.gz or zip."""
+    buffer = io.BytesIO()
+    if fmt == "zip":
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+            for file_path, content in sorted(files.items()):
+                info = zipfile.ZipInfo(f"{root}/{file_path}", date_time=(2024, 1, 1, 0, 0, 0))
+                info.compress_type = zipfile.ZIP_DEFLATED
+                info.external_attr = 0o644 << 16
+                archive.writestr(info, content)
+    else:
+        with gzip.GzipFile(fileobj=buffer, mode="wb", mtime=ARCHIVE_MTIME) as compressed:
+            with tarfile.open(fileobj=compressed, mode="w") as archive:
+                for file_path, content in sorted(files.items()):
+                    data = content.encode("utf-8")
+                    info = tarfile.TarInfo(f"{root}/{file_path}")
+                    info.size = len(data)
+                    info.mtime = ARCHIVE_MTIME
+                    info.mode = 0o644
+                    archive.addfile(info, io.BytesIO(data))
+    return buffer.getvalue()
+
+
+class ScaffoldService:
+    """
+    Renders tenant trees on request, caching shared renders and archives.
+
+    Embed it by calling handle() directly, or run it with start()/serve().
+    """
+
+    def __init__(
+        self,
+        cache_entries: int = 256,
+        cache_bytes: int = 256 * 1024 * 1024,
+        concurrency: int = 4,
+        max_pending: int = 64,
+    ):
+        """
+        Initialize the service.
+
+        Args:
+            cache_entries: Entries kept in each of the render and archive caches
+            cache_bytes: Bytes kept in each of the render and archive caches
+            concurrency: Renders/archives built at the same time
+            max_pending: Requests allowed to wait for a slot before getting 503
+        """
+        self.renders = LRUCache(cache_entries, cache_bytes)
+        self.archives = LRUCache(cache_entries, cache_bytes)
+        self.slots = asyncio.Semaphore(concurrency)
+        self.max_pending = max_pending
+        self.pending = 0
+        self.building: Dict[Hashable, asyncio.Future] = {}
+        self.rendering: Dict[str, asyncio.Future] = {}
+        self.requests: Dict[int, int] = {}
+        self.build_seconds = 0.0
+        self.builds = 0
+        self.server: Optional[asyncio.AbstractServer] = None
+
+    async def handle(self, method: str, path: str, body: bytes, headers: Dict[str, str]) -> Tuple[int, Dict[str, str], bytes]:
+        """Answer one request; returns status, response headers and body."""
+        try:
+            if path == "/healthz":
+                return 200, {"Content-Type": "text/plain"}, b"ok\n"
+            if path == "/metrics":
+                return 200, {"Content-Type": "text/plain; version=0.0.4"}, self.render_metrics().encode("utf-8")
+            if path != "/scaffold":
+                raise RequestError(404, f"no route for {path}")
+            if method != "POST":
+                raise RequestError(405, "use POST")
+            return await self._scaffold(body, headers)
+        except RequestError as exc:
+            return exc.status, {"Content-Type": "text/plain"}, f"{exc}\n".encode("utf-8")
+        except Exception as exc:
+            return 500, {"Content-Type": "text/plain"}, f"{type(exc).__name__}: {exc}\n".encode("utf-8")
+
+    async def _scaffold(self, body: bytes, headers: Dict[str, str]) -> Tuple[int, Dict[str, str], bytes]:
+        options, fmt = self._parse_tenant(body)
+        key = (json.dumps(options, sort_keys=True), fmt)
+
+        archive = self.archives.get(key)
+        if archive is None:
+            archive = await self._build_once(key, options, fmt)
+
+        etag = '"' + hashlib.sha256(archive).hexdigest()[:32] + '"'
+        response_headers = {"ETag": etag}
+        if headers.get("if-none-match") == etag:
+            return 304, response_headers, b""
+        response_headers["Content-Type"] = FORMATS[fmt]
+        response_headers["Content-Disposition"] = f'attachment; filename="trackit-app.{fmt}"'
+        return 200, response_headers, archive
+
+    @staticmethod
+    def _parse_tenant(body: bytes) -> Tuple[Dict, str]:
+        """Validate the request body; returns scaffolder options and archive format."""
+        try:
+            request = json.loads(body or b"{}")
+        except ValueError as exc:
+            raise RequestError(400, f"invalid JSON: {exc}")
+        if not isinstance(request, dict):
+            raise RequestError(400, "expected a JSON object")
+
+        fmt = request.pop("format", "tar.gz")
+        if fmt not in FORMATS:
+            raise RequestError(400, f"format must be one of {', '.join(FORMATS)}")
+        unknown = sorted(set(request) - set(TENANT_FIELDS))
+        if unknown:
+            raise RequestError(400, f"unknown fields: {', '.join(unknown)}")
+        for name, value in request.items():
+            expected = TENANT_FIELDS[name]
+            if expected is float and isinstance(value, int) and not isinstance(value, bool):
+                request[name] = value = float(value)
+            if not isinstance(value, expected):
+                raise RequestError(400, f"{name} must be a {expected.__name__}")
+            # Values end up in .env and JS sources; a newline would start a new variable.
+            if expected is str and not value.isprintable():
+                raise RequestError(400, f"{name} must not contain control characters")
+        return request, fmt
+
+    async def _build_once(self, key: Hashable, options: Dict, fmt: str) -> bytes:
+        """Build an archive, sharing the work between identical concurrent requests."""
+        if key in self.building:
+            return await asyncio.shield(self.building[key])
+        if self.pending >= self.max_pending:
+            raise RequestError(503, "too many requests in progress")
+
+        future = asyncio.get_running_loop().create_future()
+        self.building[key] = future
+        self.pending += 1
+        try:
+            async with self.slots:
+                start = time.perf_counter()
+                archive = await self._build(options, fmt)
+                self.build_seconds += time.perf_counter() - start
+                self.builds += 1
+            self.archives.put(key, archive, len(archive))
+            future.set_result(archive)
+            return archive
+        except BaseException as exc:
+            _fail(future, exc)
+            raise
+        finally:
+            self.pending -= 1
+            del self.building[key]
+
+    async def _build(self, options: Dict, fmt: str) -> bytes:
+        """Render (or reuse) the shared tree, add the tenant's files and pack it."""
+        try:
+            scaffolder = ProjectScaffolder(quiet=True, **options)
+        except ValueError as exc:
+            raise RequestError(400, str(exc))
+
+        # Caches are only touched on the event loop; rendering and packing
+        # run in worker threads.
+        shared_options = {name: value for name, value in options.items() if name not in CREDENTIAL_FIELDS}
+        shared_key = json.dumps(shared_options, sort_keys=True)
+        shared = self.renders.get(shared_key)
+        if shared is None:
+            shared = await self._render_once(shared_key, shared_options)
+
+        return await asyncio.to_thread(self._pack, scaffolder, shared, fmt)
+
+    async def _render_once(self, key: str, options: Dict) -> Dict[str, str]:
+        """Render a shared tree, sharing the work between builds that differ only in credentials."""
+        if key in self.rendering:
+            return await asyncio.shield(self.rendering[key])
+
+        future = asyncio.get_running_loop().create_future()
+        self.rendering[key] = future
+        try:
+            shared = await asyncio.to_thread(lambda: ProjectScaffolder(quiet=True, **options).files)
+            self.renders.put(key, shared, sum(len(content) for content in shared.values()))
+            future.set_result(shared)
+            return shared
+        except BaseException as exc:
+            _fail(future, exc)
+            raise
+        finally:
+            del self.rendering[key]
+
+    @staticmethod
+    def _pack(scaffolder: ProjectScaffolder, shared: Dict[str, str], fmt: str) -> bytes:
+        # Only outputs declared to depend on credentials differ per tenant.
+        files = dict(shared)
+        for file_path, (_, _, inputs) in scaffolder.outputs.items():
+            if "credentials" in inputs:
+                files[file_path] = scaffolder._render(file_path)
+        return build_archive(files, fmt)
+
+    def render_metrics(self) -> str:
+        """Current counters and gauges in the Prometheus text format."""
+        lines = ["# TYPE trackit_service_requests_total counter"]
+        for status, count in sorted(self.requests.items()):
+            lines.append(f'trackit_service_requests_total{{status="{status}"}} {count}')
+        for name, kind in (("hits", "counter"), ("misses", "counter"), ("evictions", "counter"),
+                           ("bytes", "gauge"), ("entries", "gauge")):
+            suffix = "_total" if kind == "counter" else ""
+            metric = f"trackit_service_cache_{name}{suffix}"
+            lines.append(f"# TYPE {metric} {kind}")
+            for label, cache in (("render", self.renders), ("archive", self.archives)):
+                value = len(cache.entries) if name == "entries" else getattr(cache, name)
+                lines.append(f'{metric}{{cache="{label}"}} {value}')
+        lines.append("# TYPE trackit_service_builds_total counter")
+        lines.append(f"trackit_service_builds_total {self.builds}")
+        lines.append("# TYPE trackit_service_build_seconds_total counter")
+        lines.append(f"trackit_service_build_seconds_total {self.build_seconds:.6f}")
+        lines.append("# TYPE trackit_service_pending gauge")
+        lines.append(f"trackit_service_pending {self.pending}")
+        return "\n".join(lines) + "\n"
+
+    async def _serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Handle HTTP/1.1 requests on one connection until it closes."""
+        try:
+            while True:
+                try:
+                    request_line = await reader.readline()
+                except ValueError:
+                    # Longer than MAX_LINE_BYTES, the stream limit.
+                    await self._respond(writer, 400, {"Content-Type": "text/plain"}, b"request line too long\n", False)
+                    break
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await self._respond(writer, 400, {"Content-Type": "text/plain"}, b"bad request line\n", False)
+                    break
+
+                try:
+                    headers = await self._read_headers(reader)
+                except RequestError as exc:
+                    await self._respond(writer, exc.status, {"Content-Type": "text/plain"},
+                                        f"{exc}\n".encode("utf-8"), False)
+                    break
+
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                try:
+                    length = int(headers.get("content-length") or 0)
+                    if length < 0:
+                        raise ValueError(length)
+                except ValueError:
+                    # Without a usable length the body cannot be skipped, so close.
+                    await self._respond(writer, 400, {"Content-Type": "text/plain"}, b"bad content-length\n", False)
+                    break
+                if length > MAX_BODY_BYTES:
+                    await self._respond(writer, 413, {"Content-Type": "text/plain"}, b"body too large\n", False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                status, response_headers, payload = await self.handle(method, target.split("?", 1)[0], body, headers)
+                await self._respond(writer, status, response_headers, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _read_headers(reader: asyncio.StreamReader) -> Dict[str, str]:
+        """Read header lines up to the blank line, within MAX_HEADERS and MAX_LINE_BYTES."""
+        headers = {}
+        for _ in range(MAX_HEADERS + 1):
+            try:
+                line = await reader.readline()
+            except ValueError:
+                raise RequestError(431, "header line too long")
+            if line in (b"\r\n", b"\n", b""):
+                return headers
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        raise RequestError(431, "too many headers")
+
+    async def _respond(self, writer: asyncio.StreamWriter, status: int, headers: Dict[str, str],
+                       body: bytes, keep_alive: bool) -> None:
+        self.requests[status] = self.requests.get(status, 0) + 1
+        head = [f"HTTP/1.1 {status} {REASONS.get(status, '')}"]
+        headers = {**headers, "Content-Length": str(len(body)),
+                   "Connection": "keep-alive" if keep_alive else "close"}
+        head.extend(f"{name}: {value}" for name, value in headers.items())
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8080) -> asyncio.AbstractServer:
+        """Start listening; returns the asyncio server."""
+        self.server = await asyncio.start_server(self._serve_connection, host, port, limit=MAX_LINE_BYTES)
+        return self.server
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 8080) -> None:
+        """Listen and serve until cancelled."""
+        server = await self.start(host, port)
+        async with server:
+            await server.serve_forever()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Serve TrackIt scaffolds over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--cache-entries", type=int, default=256, help="entries per cache")
+    parser.add_argument("--cache-mb", type=int, default=256, help="megabytes per cache")
+    parser.add_argument("--concurrency", type=int, default=4, help="builds at the same time")
+    parser.add_argument("--max-pending", type=int, default=64, help="queued builds before 503")
+    args = parser.parse_args(argv)
+
+    async def run() -> None:
+        service = ScaffoldService(args.cache_entries, args.cache_mb * 1024 * 1024,
+                                  args.concurrency, args.max_pending)
+        print(f"Serving on http://{args.host}:{args.port}")
+        await service.serve(args.host, args.port)
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,25 +7,1082 @@ using Vue 3, Vite, Tailwind CSS, and Supabase.
 """
 
 import os
+import re
+import ast
+import sys
 import json
+import time
+import errno
+import atexit
 import shutil
+import hashlib
+import inspect
+import tarfile
+import zipfile
+import posixpath
+import threading
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from typing import Dict, IO, Iterator, List, Optional, Tuple, Union
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+DEFAULT_THEME = "ocean-breeze"
+DEFAULT_FONT = "Inter"
+
+# localStorage key holding the last applied theme/font in the generated app.
+PREFERENCES_STORAGE_KEY = "trackit:preferences"
+
+# Single source for every theme. The scaffolder compiles this into the critical
+# CSS for the default theme, one lazily loaded stylesheet per other theme and
+# the theme registry (src/styles/themes.js) used by the store and
+# ThemeSelector.vue. Adding a theme means adding one entry here.
+THEMES: List[Dict] = [
+    # Light themes
+    {"name": "ocean-breeze", "label": "Ocean Breeze", "dark": False,
+     "colors": {"primary": "#38bdf8", "secondary": "#0ea5e9", "accent": "#0284c7", "background": "#f0f9ff", "text": "#0f172a"},
+     "fonts": {"body": "'Inter', sans-serif", "heading": "'Montserrat', sans-serif"}},
+    {"name": "sunrise-glow", "label": "Sunrise Glow", "dark": False,
+     "colors": {"primary": "#fb923c", "secondary": "#f97316", "accent": "#ea580c", "background": "#fff7ed", "text": "#431407"},
+     "fonts": {"body": "'Roboto', sans-serif", "heading": "'Playfair Display', serif"}},
+    {"name": "minimal-mist", "label": "Minimal Mist", "dark": False,
+     "colors": {"primary": "#64748b", "secondary": "#475569", "accent": "#334155", "background": "#f8fafc", "text": "#0f172a"},
+     "fonts": {"body": "'Lato', sans-serif", "heading": "'Helvetica Neue', sans-serif"}},
+    {"name": "soft-leaf", "label": "Soft Leaf", "dark": False,
+     "colors": {"primary": "#84cc16", "secondary": "#65a30d", "accent": "#4d7c0f", "background": "#f7fee7", "text": "#1a2e05"},
+     "fonts": {"body": "'Nunito', sans-serif", "heading": "'Nunito Sans', sans-serif"}},
+    {"name": "neon-day", "label": "Neon Day", "dark": False,
+     "colors": {"primary": "#3b82f6", "secondary": "#2563eb", "accent": "#1d4ed8", "background": "#eff6ff", "text": "#1e3a8a"},
+     "fonts": {"body": "'Quicksand', sans-serif", "heading": "'Poppins', sans-serif"}},
+    # Dark themes
+    {"name": "midnight-code", "label": "Midnight Code", "dark": True,
+     "colors": {"primary": "#22d3ee", "secondary": "#06b6d4", "accent": "#0891b2", "background": "#0f172a", "text": "#e2e8f0"},
+     "fonts": {"body": "'Source Code Pro', monospace", "heading": "'Space Mono', monospace"}},
+    {"name": "galaxy-grape", "label": "Galaxy Grape", "dark": True,
+     "colors": {"primary": "#c084fc", "secondary": "#a855f7", "accent": "#9333ea", "background": "#1a103d", "text": "#e9d5ff"},
+     "fonts": {"body": "'Rubik', sans-serif", "heading": "'Exo 2', sans-serif"}},
+    {"name": "forest-night", "label": "Forest Night", "dark": True,
+     "colors": {"primary": "#4ade80", "secondary": "#22c55e", "accent": "#16a34a", "background": "#0d160b", "text": "#dcfce7"},
+     "fonts": {"body": "'Merriweather', serif", "heading": "'Bitter', serif"}},
+    {"name": "cyber-noir", "label": "Cyber Noir", "dark": True,
+     "colors": {"primary": "#ec4899", "secondary": "#db2777", "accent": "#be185d", "background": "#18181b", "text": "#f5f5f5"},
+     "fonts": {"body": "'IBM Plex Sans', sans-serif", "heading": "'Rajdhani', sans-serif"}},
+    {"name": "solar-void", "label": "Solar Void", "dark": True,
+     "colors": {"primary": "#fcd34d", "secondary": "#fbbf24", "accent": "#f59e0b", "background": "#030711", "text": "#fef3c7"},
+     "fonts": {"body": "'Titillium Web', sans-serif", "heading": "'Orbitron', sans-serif"}},
+]
+
+FONTS: List[str] = [
+    "Inter",
+    "Roboto",
+    "Montserrat",
+    "Poppins",
+    "Source Code Pro",
+    "Playfair Display",
+]
+
+
+class EventSink:
+    """Receives the structured events emitted while scaffolding."""
+
+    def emit(self, event: Dict) -> None:
+        """Handle a single event."""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Flush and release any resources."""
+
+
+class MemorySink(EventSink):
+    """Keeps every event in memory; meant for tests."""
+
+    def __init__(self):
+        self.events: List[Dict] = []
+
+    def emit(self, event: Dict) -> None:
+        self.events.append(event)
+
+    def of_type(self, name: str) -> List[Dict]:
+        """Return the events whose "event" field equals name."""
+        return [event for event in self.events if event["event"] == name]
+
+
+class JsonLinesSink(EventSink):
+    """Writes one JSON object per event to a file or stream."""
+
+    def __init__(self, target: Union[str, Path, IO[str]]):
+        """
+        Args:
+            target: Path to append to, or an open text stream
+        """
+        if isinstance(target, (str, Path)):
+            self._stream: IO[str] = open(target, "a", encoding="utf-8")
+            self._owned = True
+        else:
+            self._stream = target
+            self._owned = False
+
+    def emit(self, event: Dict) -> None:
+        self._stream.write(json.dumps(event, sort_keys=True) + "\n")
+
+    def close(self) -> None:
+        self._stream.flush()
+        if self._owned:
+            self._stream.close()
+
+
+class PrometheusTextfileSink(EventSink):
+    """
+    Aggregates events into counters for the node_exporter textfile collector.
+
+    The file is rewritten atomically after every project created or
+    regenerated, so a scrape never sees a partial file.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.counters: Dict[str, float] = {
+            "projects_total": 0,
+            "projects_regenerated_total": 0,
+            "files_written_total": 0,
+            "files_skipped_total": 0,
+            "bytes_written_total": 0,
+            "errors_total": 0,
+        }
+        self.phase_seconds: Dict[str, float] = {}
+
+    def emit(self, event: Dict) -> None:
+        name = event["event"]
+        if name == "phase":
+            phase = event["phase"]
+            self.phase_seconds[phase] = self.phase_seconds.get(phase, 0.0) + event["duration_s"]
+        elif name == "file_written":
+            self.counters["files_written_total"] += 1
+            self.counters["bytes_written_total"] += event["bytes"]
+        elif name == "file_skipped":
+            self.counters["files_skipped_total"] += 1
+        elif name == "error":
+            self.counters["errors_total"] += 1
+        elif name == "project_created":
+            self.counters["projects_total"] += 1
+            self.write()
+        elif name == "project_regenerated":
+            self.counters["projects_regenerated_total"] += 1
+            self.write()
+
+    def render(self) -> str:
+        """Render the current values in the Prometheus text format."""
+        lines = []
+        for name, value in self.counters.items():
+            metric = f"trackit_scaffold_{name}"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {value:g}")
+        metric = "trackit_scaffold_phase_seconds_total"
+        lines.append(f"# TYPE {metric} counter")
+        for phase, seconds in sorted(self.phase_seconds.items()):
+            lines.append(f'{metric}{{phase="{phase}"}} {seconds:.6f}')
+        return "\n".join(lines) + "\n"
+
+    def write(self) -> None:
+        """Atomically replace the textfile with the current values."""
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        tmp_path.write_text(self.render(), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+
+    def close(self) -> None:
+        self.write()
+
+
+# ioctl request for FICLONE (linux/fs.h): make a file share another's extents.
+FICLONE = 0x40049409
+
+# Errors meaning "this way of materializing does not work here"; the next
+# method in the chain is tried instead.
+LINK_FALLBACK_ERRNOS = {
+    errno.EXDEV, errno.EPERM, errno.EMLINK, errno.EOPNOTSUPP,
+    errno.ENOTTY, errno.EINVAL, errno.ENOSYS,
+}
+
+
+class ContentStore:
+    """
+    Content-addressed store for generated file bodies.
+    
+    Each distinct body is written once, read-only, to <root>/<sha[:2]>/<sha>.
+    Trees are then materialized from the store by hardlink or reflink, and
+    by copy where neither is possible (e.g. across devices), so near-identical
+    tenant trees share their data and, with hardlinks, their inodes.
+    """
+
+    MODES = ("hardlink", "reflink", "copy")
+
+    def __init__(self, root: Union[str, Path], mode: str = "hardlink"):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown materialize mode '{mode}'; expected one of {', '.join(self.MODES)}")
+        self.root = Path(root)
+        self.mode = mode
+
+    def blob_path(self, digest: str) -> Path:
+        """Where the body with this sha256 hex digest lives."""
+        return self.root / digest[:2] / digest
+
+    def put(self, data: bytes) -> Tuple[Path, bool]:
+        """Store data unless already present; return its blob and whether it was new."""
+        blob = self.blob_path(hashlib.sha256(data).hexdigest())
+        if blob.exists():
+            return blob, False
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = blob.with_name(f"{blob.name}.{os.getpid()}.tmp")
+        tmp_path.write_bytes(data)
+        os.chmod(tmp_path, 0o444)
+        os.replace(tmp_path, blob)
+        return blob, True
+
+    def materialize(self, blob: Path, target: Path) -> str:
+        """
+        Place blob at target, replacing any existing file.
+        
+        The new file is built beside target and renamed over it, so a target
+        that is itself a link into the store is never written through.
+        
+        Returns:
+            The method that worked: "hardlink", "reflink" or "copy"
+        """
+        tmp_path = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+        methods = self.MODES[self.MODES.index(self.mode):]
+        for method in methods:
+            try:
+                getattr(self, f"_{method}")(blob, tmp_path)
+            except OSError as error:
+                try:
+                    tmp_path.unlink()
+                except FileNotFoundError:
+                    pass
+                if error.errno not in LINK_FALLBACK_ERRNOS or method == methods[-1]:
+                    raise
+                continue
+            os.replace(tmp_path, target)
+            return method
+        raise AssertionError("unreachable")
+
+    @staticmethod
+    def _hardlink(blob: Path, target: Path) -> None:
+        os.link(blob, target)
+
+    @staticmethod
+    def _reflink(blob: Path, target: Path) -> None:
+        if fcntl is None:
+            raise OSError(errno.EOPNOTSUPP, "reflinks are not supported on this platform")
+        with open(blob, "rb") as source, open(target, "wb") as dest:
+            fcntl.ioctl(dest.fileno(), FICLONE, source.fileno())
+
+    @staticmethod
+    def _copy(blob: Path, target: Path) -> None:
+        shutil.copyfile(blob, target)
+
+
+# Template packs: versioned sets of output overrides, shipped separately
+# from this script. A pack is a directory, or a .tar.gz/.tgz/.zip of one,
+# holding pack.json and a files/ tree mirroring the generated project:
+#
+#     {"name": "trackit-templates", "version": "2.1.0",
+#      "files": {"src/pages/Home.vue": "<sha256 of files/src/pages/Home.vue>"}}
+PACK_MANIFEST = "pack.json"
+PACK_FILES_DIR = "files"
+PACK_ARCHIVE_SUFFIXES = (".tar.gz", ".tgz", ".zip")
+PACKS_DIR = os.environ.get("TRACKIT_PACKS_DIR", "packs")
+PACK_CACHE_DIR = os.environ.get(
+    "TRACKIT_PACK_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "trackit", "packs"))
+PACK_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+
+class TemplatePackError(Exception):
+    """A template pack is missing, malformed or fails its integrity check."""
+
+
+class TemplatePack:
+    """A loaded, verified template pack."""
+
+    def __init__(self, name: str, version: str, digest: str, files: Dict[str, str]):
+        self.name = name
+        self.version = version
+        # sha256 of pack.json, which pins every file's hash: identifies the pack.
+        self.digest = digest
+        self.files = files
+
+    @classmethod
+    def load(cls, root: Union[str, Path]) -> "TemplatePack":
+        """
+        Load the pack in directory root, verifying every file against pack.json.
+        
+        Raises:
+            TemplatePackError: If pack.json is invalid, a listed file is missing
+                or altered, or the files/ tree holds a file pack.json does not list
+        """
+        root = Path(root)
+        try:
+            raw = (root / PACK_MANIFEST).read_bytes()
+            manifest = json.loads(raw)
+            name, version, hashes = manifest["name"], manifest["version"], manifest["files"]
+        except (OSError, ValueError, KeyError, TypeError) as exc:
+            raise TemplatePackError(f"{root}: invalid {PACK_MANIFEST}: {exc}")
+        
+        files_root = root / PACK_FILES_DIR
+        present = {
+            path.relative_to(files_root).as_posix()
+            for path in files_root.rglob("*") if not path.is_dir()
+        } if files_root.is_dir() else set()
+        unlisted = sorted(present - hashes.keys())
+        if unlisted:
+            raise TemplatePackError(f"{root}: files not listed in {PACK_MANIFEST}: {', '.join(unlisted)}")
+        
+        files = {}
+        for file_path, expected in sorted(hashes.items()):
+            _check_pack_path(file_path)
+            full_path = files_root / file_path
+            if full_path.is_symlink() or not full_path.is_file():
+                raise TemplatePackError(f"{root}: missing {file_path}")
+            data = full_path.read_bytes()
+            if hashlib.sha256(data).hexdigest() != expected:
+                raise TemplatePackError(f"{root}: {file_path} does not match its hash in {PACK_MANIFEST}")
+            files[file_path] = data.decode("utf-8")
+        return cls(name, version, hashlib.sha256(raw).hexdigest(), files)
+
+
+def _check_pack_path(file_path: str) -> None:
+    """Reject pack paths that would land outside the generated tree."""
+    parts = file_path.split("/")
+    if not file_path or file_path.startswith("/") or "\\" in file_path or ".." in parts or "" in parts:
+        raise TemplatePackError(f"Unsafe path in template pack: '{file_path}'")
+
+
+def write_pack_manifest(root: Union[str, Path], name: str, version: str) -> Path:
+    """
+    Write pack.json for the files/ tree in root, hashing every file.
+    
+    Returns:
+        Path of the written pack.json
+    """
+    root = Path(root)
+    files_root = root / PACK_FILES_DIR
+    hashes = {
+        path.relative_to(files_root).as_posix(): _sha256_file(path)
+        for path in sorted(files_root.rglob("*")) if path.is_file()
+    }
+    path = root / PACK_MANIFEST
+    manifest = {"name": name, "version": version, "files": hashes}
+    path.write_text(json.dumps(manifest, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    return path
+
+
+class TemplatePackCache:
+    """
+    Opens template packs, unpacking archives into a size-bounded disk cache.
+    
+    Archives are unpacked once into <root>/<sha256 of the archive>, verified,
+    and only then renamed into place, so a cache entry that exists is whole.
+    Later opens of the same archive, from any process, reuse the entry. When
+    the cache outgrows max_bytes the least recently opened entries are
+    deleted. Loaded packs are also kept in memory for the life of the cache.
+    """
+
+    def __init__(
+        self,
+        root: Union[str, Path] = PACK_CACHE_DIR,
+        max_bytes: int = PACK_CACHE_MAX_BYTES,
+        packs_dir: Union[str, Path] = PACKS_DIR,
+    ):
+        """
+        Args:
+            root: Directory unpacked archives are kept in
+            max_bytes: Size the cache is trimmed to after unpacking an archive
+            packs_dir: Where "name@version" references are looked up
+        """
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.packs_dir = Path(packs_dir)
+        self.loaded: Dict[str, TemplatePack] = {}
+        self._digests: Dict[Tuple[str, int, int], str] = {}
+    
+    def resolve(self, reference: Union[str, Path]) -> Path:
+        """
+        The pack directory or archive a reference names.
+        
+        A reference is a path, or "name@version" for <packs_dir>/name-version
+        as a directory or archive.
+        """
+        path = Path(reference)
+        if path.exists():
+            return path
+        name, sep, version = str(reference).partition("@")
+        if sep:
+            stem = self.packs_dir / f"{name}-{version}"
+            for candidate in [stem] + [stem.with_name(stem.name + suffix) for suffix in PACK_ARCHIVE_SUFFIXES]:
+                if candidate.exists():
+                    return candidate
+        raise TemplatePackError(f"Template pack '{reference}' not found")
+    
+    def open(self, reference: Union[str, Path]) -> TemplatePack:
+        """Load a pack by path or "name@version", unpacking it if it is an archive."""
+        source = self.resolve(reference)
+        if source.is_dir():
+            pack = TemplatePack.load(source)
+            return self.loaded.setdefault(pack.digest, pack)
+        
+        digest = self._archive_digest(source)
+        if digest in self.loaded:
+            return self.loaded[digest]
+        self.root.mkdir(parents=True, exist_ok=True)
+        with self._locked():
+            entry = self.root / digest
+            pack = None
+            if entry.is_dir():
+                # The entry's mtime is its last use, for LRU eviction.
+                os.utime(entry)
+                try:
+                    pack = TemplatePack.load(entry)
+                except TemplatePackError:
+                    # Altered since it was unpacked; unpack it again.
+                    shutil.rmtree(entry)
+            if pack is None:
+                self._unpack(source, entry)
+                self._evict(keep=entry)
+                pack = TemplatePack.load(entry)
+        self.loaded[digest] = pack
+        return pack
+    
+    def _archive_digest(self, source: Path) -> str:
+        stat = source.stat()
+        key = (str(source.resolve()), stat.st_mtime_ns, stat.st_size)
+        if key not in self._digests:
+            self._digests[key] = _sha256_file(source)
+        return self._digests[key]
+    
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Serialize unpacking and eviction across processes sharing the cache."""
+        if fcntl is None:
+            yield
+            return
+        with open(self.root / ".lock", "a") as lock:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+    
+    @staticmethod
+    def _unpack(source: Path, entry: Path) -> None:
+        """Extract and verify an archive, then move it into place as entry."""
+        staging = entry.with_name(f".{entry.name}.{os.getpid()}.tmp")
+        shutil.rmtree(staging, ignore_errors=True)
+        staging.mkdir()
+        try:
+            if source.name.endswith(".zip"):
+                with zipfile.ZipFile(source) as archive:
+                    members = [info.filename for info in archive.infolist() if not info.is_dir()]
+                    for member in members:
+                        _check_pack_path(member)
+                    archive.extractall(staging, members)
+            else:
+                with tarfile.open(source, "r:gz") as archive:
+                    members = [member for member in archive.getmembers() if not member.isdir()]
+                    for member in members:
+                        _check_pack_path(member.name)
+                        if not member.isfile():
+                            raise TemplatePackError(f"{source}: {member.name} is not a regular file")
+                    # Members are checked above; the data filter also keeps
+                    # modes and owners from the archive out of the cache.
+                    extra = {"filter": "data"} if hasattr(tarfile, "data_filter") else {}
+                    archive.extractall(staging, members, **extra)
+            roots = list(staging.iterdir())
+            # Accept archives of the pack directory itself as well as of its contents.
+            root = roots[0] if len(roots) == 1 and roots[0].is_dir() else staging
+            TemplatePack.load(root)
+            os.replace(root, entry)
+        except (OSError, tarfile.TarError, zipfile.BadZipFile) as exc:
+            raise TemplatePackError(f"{source}: cannot unpack: {exc}")
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+    
+    def _evict(self, keep: Path) -> None:
+        """Delete least recently used entries until the cache fits max_bytes."""
+        entries = []
+        for entry in self.root.iterdir():
+            if not entry.is_dir() or entry.name.startswith("."):
+                continue
+            size = sum(path.stat().st_size for path in entry.rglob("*") if path.is_file())
+            entries.append((entry.stat().st_mtime, size, entry))
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if entry != keep:
+                shutil.rmtree(entry, ignore_errors=True)
+                total -= size
+
+
+_default_pack_cache: Optional[TemplatePackCache] = None
+
+
+def open_template_pack(reference: Union[str, Path]) -> TemplatePack:
+    """Open a pack through a process-wide TemplatePackCache with default settings."""
+    global _default_pack_cache
+    if _default_pack_cache is None:
+        _default_pack_cache = TemplatePackCache()
+    return _default_pack_cache.open(reference)
+
+
+# Written into every generated tree; records what each file was built from.
+MANIFEST_FILE = ".trackit-manifest.json"
+MANIFEST_VERSION = 1
+
+# Locked (flock) for the duration of every run against a tree.
+LOCK_FILE = ".trackit.lock"
+
+
+def recorded_options(project_path: Union[str, Path]) -> Dict:
+    """
+    ProjectScaffolder options a tree was last generated with.
+    
+    These are read from the tree's MANIFEST_FILE (see
+    ProjectScaffolder.build_options). Trees written before options were
+    recorded, or that have no manifest yet, give an empty dict.
+    """
+    try:
+        manifest = json.loads((Path(project_path) / MANIFEST_FILE).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if manifest.get("version") != MANIFEST_VERSION:
+        return {}
+    return manifest.get("options", {})
+
+
+@lru_cache(maxsize=None)
+def _template_fingerprint(cls: type, method: str) -> str:
+    """
+    Hash of a template method's source plus every _get_* method it calls.
+    
+    A template is edited by changing its source, so this is what tells
+    regenerate() that outputs rendered by it are out of date.
+    """
+    seen = set()
+    pending = [method]
+    digest = hashlib.sha256()
+    while pending:
+        name = pending.pop()
+        if name in seen or not hasattr(cls, name):
+            continue
+        seen.add(name)
+        function = getattr(cls, name)
+        try:
+            source = inspect.getsource(function)
+        except (OSError, TypeError):
+            digest.update(function.__code__.co_code)
+            continue
+        digest.update(source.encode("utf-8"))
+        # Wrapped so methods indented as class members parse on their own.
+        for node in ast.walk(ast.parse("class _Source:\n" + source)):
+            if (isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name)
+                    and node.value.id == "self" and node.attr.startswith("_get_")):
+                pending.append(node.attr)
+    return digest.hexdigest()
+
+
+def _sha256_file(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+class ScaffoldValidationError(Exception):
+    """Generated sources failed validation; `problems` lists (path, message) pairs."""
+
+    def __init__(self, problems: List[Tuple[str, str]]):
+        self.problems = problems
+        lines = [f"{path}: {message}" for path, message in problems]
+        super().__init__(f"{len(problems)} problem(s) in generated sources:\n" + "\n".join(lines))
+
+
+# Node built-ins the generated build scripts may import without a dependency.
+NODE_BUILTINS = {"crypto", "fs", "fs/promises", "http", "https", "os", "path", "url"}
+
+# A `/` after one of these starts a regular expression rather than a division.
+_REGEX_PRECEDERS = set("(,=:[!&|?{};+-*%<>~^")
+_REGEX_KEYWORDS = {"return", "typeof", "instanceof", "in", "of", "new", "delete",
+                   "void", "throw", "case", "do", "else", "yield", "await"}
+_BRACKETS = {"(": ")", "[": "]", "{": "}"}
+
+_STATIC_IMPORT = re.compile(r"^\s*(?:import|export)\s+(?:[\w$*{},\s]+?\s+from\s+)?['\"]([^'\"]+)['\"]", re.M)
+_DYNAMIC_IMPORT = re.compile(r"\bimport\(\s*['\"]([^'\"]+)['\"]\s*\)")
+_CSS_IMPORT = re.compile(r"@import\s+['\"]([^'\"]+)['\"]")
+_HTML_MODULE_SCRIPT = re.compile(r"<script\b[^>]*\bsrc=\"(/[^\"]+)\"")
+_SFC_BLOCK = re.compile(r"<(script|style)\b([^>]*)>(.*?)</\1>", re.S)
+_IMPORT_CLAUSE = re.compile(r"^\s*import\s+([A-Za-z_$][\w$]*)?\s*,?\s*(?:\{([^}]*)\})?\s*(?:\*\s+as\s+([\w$]+)\s*)?from\b", re.M)
+_DECLARATION = re.compile(r"\b(?:const|let|var|function|class)\s+([A-Za-z_$][\w$]*)")
+_ROUTE_COMPONENT = re.compile(r"\bcomponent:\s*([A-Za-z_$][\w$]*)\s*[,}\n]")
+_COMPONENT_TAG = re.compile(r"<([A-Z][A-Za-z0-9]*)\b")
+
+# Components Vue and vue-router register globally; templates use them unimported.
+VUE_BUILTIN_COMPONENTS = {"Component", "KeepAlive", "RouterLink", "RouterView",
+                          "Suspense", "Teleport", "Transition", "TransitionGroup"}
+
+# Results of _check_source keyed by a hash of its arguments, so a file
+# identical across tenants or runs is only ever checked once per process.
+_VALIDATION_CACHE: "OrderedDict[str, Tuple[Tuple[str, ...], Tuple[str, ...]]]" = OrderedDict()
+_VALIDATION_CACHE_SIZE = 4096
+_VALIDATION_PARALLEL_MIN = 16
+_validation_lock = threading.Lock()
+_validation_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _shutdown_validation_pool() -> None:
+    """Stop the default validation pool, if one was started (run at exit)."""
+    global _validation_pool
+    with _validation_lock:
+        pool, _validation_pool = _validation_pool, None
+    if pool is not None:
+        pool.shutdown(cancel_futures=True)
+
+
+atexit.register(_shutdown_validation_pool)
+
+
+def _scan_brackets(source: str, first_line: int = 1) -> List[str]:
+    """
+    Problems with the bracket structure of JavaScript source.
+    
+    Strings, template literals (including their ${} holes), comments and
+    regular expression literals are skipped, so only code brackets count.
+    """
+    stack: List[Tuple[str, int]] = []
+    line = first_line
+    previous = ""
+    word = ""
+    i, n = 0, len(source)
+    in_template = False
+    while i < n:
+        if in_template:
+            # Inside a template literal: find its end or the next ${ hole.
+            char = source[i]
+            if char == "\\":
+                i += 2
+                continue
+            if char == "\n":
+                line += 1
+            elif char == "`":
+                in_template = False
+                previous, word = "a", ""
+            elif source.startswith("${", i):
+                stack.append(("${", line))
+                in_template = False
+                previous, word = "{", ""
+                i += 2
+                continue
+            i += 1
+            continue
+        
+        char = source[i]
+        if char == "\n":
+            line += 1
+            i += 1
+        elif char in " \t\r":
+            i += 1
+        elif source.startswith("//", i):
+            end = source.find("\n", i)
+            i = n if end < 0 else end
+        elif source.startswith("/*", i):
+            end = source.find("*/", i + 2)
+            if end < 0:
+                return [f"line {line}: unterminated comment"]
+            line += source.count("\n", i, end)
+            i = end + 2
+        elif char in "'\"":
+            start_line = line
+            i += 1
+            while i < n and source[i] != char:
+                if source[i] == "\n":
+                    return [f"line {start_line}: unterminated string"]
+                i += 2 if source[i] == "\\" else 1
+            if i >= n:
+                return [f"line {start_line}: unterminated string"]
+            i += 1
+            previous, word = "a", ""
+        elif char == "`":
+            in_template = True
+            i += 1
+        elif char == "/" and (previous in _REGEX_PRECEDERS or previous == "" or word in _REGEX_KEYWORDS):
+            start_line = line
+            i += 1
+            in_class = False
+            while i < n and (in_class or source[i] != "/"):
+                if source[i] == "\n":
+                    return [f"line {start_line}: unterminated regular expression"]
+                if source[i] == "\\":
+                    i += 1
+                elif source[i] == "[":
+                    in_class = True
+                elif source[i] == "]":
+                    in_class = False
+                i += 1
+            i += 1
+            while i < n and source[i].isalpha():
+                i += 1
+            previous, word = "a", ""
+        elif char in _BRACKETS:
+            stack.append((char, line))
+            previous, word = char, ""
+            i += 1
+        elif char in ")]}":
+            if not stack:
+                return [f"line {line}: unexpected '{char}'"]
+            opener, opened = stack.pop()
+            if opener == "${" and char == "}":
+                in_template = True
+            elif _BRACKETS.get(opener) != char:
+                return [f"line {line}: '{char}' closes '{opener[-1]}' opened on line {opened}"]
+            previous, word = char, ""
+            i += 1
+        elif char.isalnum() or char in "_$":
+            start = i
+            while i < n and (source[i].isalnum() or source[i] in "_$"):
+                i += 1
+            word = source[start:i]
+            previous = "a"
+        else:
+            previous, word = char, ""
+            i += 1
+    
+    if in_template:
+        return [f"line {line}: unterminated template literal"]
+    return [f"line {opened}: '{opener[-1]}' is never closed" for opener, opened in stack[-1:]]
+
+
+def _script_imports(source: str) -> List[str]:
+    return _STATIC_IMPORT.findall(source) + _DYNAMIC_IMPORT.findall(source)
+
+
+def _bindings(source: str) -> set:
+    """Names a module imports or declares at any level."""
+    names = set(_DECLARATION.findall(source))
+    for default, named, namespace in _IMPORT_CLAUSE.findall(source):
+        names.update(filter(None, [default, namespace]))
+        for part in named.split(","):
+            names.update(part.split(" as ")[-1].split()[-1:])
+    return names
+
+
+def _check_source(kind: str, content: str) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """
+    Context-free checks of one generated file.
+    
+    Depends on nothing but its arguments, so results can be cached by
+    content and computed in worker processes.
+    
+    Args:
+        kind: "vue", "js", "css", "html" or "json"
+        content: The file's content
+    
+    Returns:
+        The problems found, and every import specifier the file uses
+    """
+    problems: List[str] = []
+    imports: List[str] = []
+    if kind == "json":
+        try:
+            json.loads(content)
+        except ValueError as exc:
+            problems.append(f"invalid JSON: {exc}")
+    elif kind == "js":
+        problems += _scan_brackets(content)
+        imports += _script_imports(content)
+        bound = _bindings(content)
+        for name in sorted(set(_ROUTE_COMPONENT.findall(content)) - bound):
+            problems.append(f"route component {name} is not imported or defined")
+    elif kind == "css":
+        imports += _CSS_IMPORT.findall(content)
+    elif kind == "html":
+        for match in _SFC_BLOCK.finditer(content):
+            if match.group(1) == "script":
+                first_line = content.count("\n", 0, match.start(3)) + 1
+                problems += _scan_brackets(match.group(3), first_line)
+        imports += _HTML_MODULE_SCRIPT.findall(content)
+    elif kind == "vue":
+        for tag in ("template", "script", "style"):
+            opened = len(re.findall(rf"<{tag}\b", content))
+            closed = content.count(f"</{tag}>")
+            if opened != closed:
+                problems.append(f"{opened} <{tag}> tag(s) but {closed} </{tag}>")
+        if not re.match(r"\s*<(template|script)\b", content):
+            problems.append("does not start with a <template> or <script> block")
+        template = re.search(r"^<template>(.*)^</template>", content, re.S | re.M)
+        if template and template.group(1).count("{{") != template.group(1).count("}}"):
+            problems.append("unbalanced {{ }} interpolation in <template>")
+        setups = 0
+        for match in _SFC_BLOCK.finditer(content):
+            first_line = content.count("\n", 0, match.start(3)) + 1
+            if match.group(1) == "script":
+                setups += "setup" in match.group(2)
+                problems += _scan_brackets(match.group(3), first_line)
+                imports += _script_imports(match.group(3))
+            else:
+                imports += _CSS_IMPORT.findall(match.group(3))
+        if setups > 1:
+            problems.append("more than one <script setup> block")
+        if template:
+            bound = set()
+            for match in _SFC_BLOCK.finditer(content):
+                if match.group(1) == "script":
+                    bound |= _bindings(match.group(3))
+            used = set(_COMPONENT_TAG.findall(template.group(1)))
+            for name in sorted(used - bound - VUE_BUILTIN_COMPONENTS):
+                problems.append(f"<{name}> is used in <template> but never imported")
+    return tuple(problems), tuple(imports)
+
+
+def _source_kind(file_path: str) -> Optional[str]:
+    suffix = os.path.splitext(file_path)[1]
+    return {".vue": "vue", ".js": "js", ".mjs": "js", ".css": "css",
+            ".html": "html", ".json": "json"}.get(suffix)
+
+
+def _check_sources(
+    sources: List[Tuple[str, str]],
+    executor: Optional[Executor] = None,
+) -> Tuple[List[Tuple[Tuple[str, ...], Tuple[str, ...]]], int]:
+    """
+    _check_source for many (kind, content) pairs, from the cache where possible.
+    
+    Misses are spread over a process pool when there are cores to spare and
+    enough misses to repay the hand-off; a handful are cheaper in process.
+    Inside a worker process (a job runner or upgrade worker) the default
+    pool is never started, so workers do not each spawn a pool of their own.
+    
+    Args:
+        sources: (kind, content) pairs to check
+        executor: Executor to spread misses over instead of the default pool
+    
+    Returns:
+        One result per pair, in order, and the number of cache hits
+    """
+    global _validation_pool
+    keys = [
+        hashlib.sha256(f"{kind}\0{content}".encode("utf-8")).hexdigest()
+        for kind, content in sources
+    ]
+    found = {}
+    misses = {}
+    with _validation_lock:
+        for key, source in zip(keys, sources):
+            if key in _VALIDATION_CACHE:
+                _VALIDATION_CACHE.move_to_end(key)
+                found[key] = _VALIDATION_CACHE[key]
+            else:
+                misses[key] = source
+        parallel = len(misses) >= _VALIDATION_PARALLEL_MIN
+        if parallel and executor is None:
+            workers = min(8, os.cpu_count() or 1)
+            parallel = workers > 1 and multiprocessing.parent_process() is None
+            if parallel and _validation_pool is None:
+                _validation_pool = ProcessPoolExecutor(max_workers=workers)
+            executor = _validation_pool
+    
+    if parallel:
+        pending = list(misses.values())
+        results = list(executor.map(_check_source, *zip(*pending), chunksize=4))
+    else:
+        results = [_check_source(kind, content) for kind, content in misses.values()]
+    
+    found.update(zip(misses, results))
+    with _validation_lock:
+        _VALIDATION_CACHE.update(zip(misses, results))
+        while len(_VALIDATION_CACHE) > _VALIDATION_CACHE_SIZE:
+            _VALIDATION_CACHE.popitem(last=False)
+    return [found[key] for key in keys], len(keys) - len(misses)
+
+
+def _resolve_import(importer: str, specifier: str, paths) -> Optional[str]:
+    """
+    The output an @/ or relative import refers to.
+    
+    Returns:
+        The output's path, "" when nothing matches, or None for a package import
+    """
+    if specifier.startswith("@/"):
+        base = "src/" + specifier[2:]
+    elif specifier.startswith((".", "/")):
+        base = posixpath.normpath(posixpath.join(posixpath.dirname(importer), specifier)).lstrip("/")
+    else:
+        return None
+    for candidate in (base, base + ".js", base + ".vue", base + "/index.js"):
+        if candidate in paths:
+            return candidate
+    return ""
+
+
+def _package_name(specifier: str) -> str:
+    parts = specifier.split("/")
+    return "/".join(parts[:2]) if specifier.startswith("@") else parts[0]
+
+
+# Per-tenant ProjectScaffolder options, with their types: what the scaffold
+# service accepts in a request and what provisioning jobs may set.
+TENANT_FIELDS = {
+    "default_theme": str,
+    "service_worker": bool,
+    "runtime_config": bool,
+    "dashboard_summary_tables": bool,
+    "perf_endpoint": str,
+    "perf_sample_rate": float,
+    "supabase_url": str,
+    "supabase_anon_key": str,
+}
+
+
+def tenant_config(
+    supabase_url: str,
+    supabase_anon_key: str,
+    default_theme: str = DEFAULT_THEME,
+    perf_endpoint: Optional[str] = None,
+    perf_sample_rate: float = 0.1,
+) -> Dict:
+    """Settings one tenant's config.json carries for a runtime-config build."""
+    config = {
+        "supabaseUrl": supabase_url,
+        "supabaseAnonKey": supabase_anon_key,
+        "defaultTheme": default_theme,
+    }
+    if perf_endpoint:
+        config["perfEndpoint"] = perf_endpoint
+        config["perfSampleRate"] = perf_sample_rate
+    return config
+
+
+def write_tenant_config(
+    build_dir: Union[str, Path],
+    supabase_url: str,
+    supabase_anon_key: str,
+    default_theme: str = DEFAULT_THEME,
+    themes: Optional[List[Dict]] = None,
+    perf_endpoint: Optional[str] = None,
+    perf_sample_rate: float = 0.1,
+) -> Path:
+    """
+    Provision one tenant of a runtime-config build by writing its config.json.
+    
+    Args:
+        build_dir: Directory the built app is served from (usually its dist/)
+        supabase_url: The tenant's Supabase project URL
+        supabase_anon_key: The tenant's Supabase anon key
+        default_theme: Theme for users without a saved preference; must be
+            one of the themes the app was built with
+        themes: Theme definitions the app was built with, in the shape of THEMES
+        perf_endpoint: URL the app beacons performance data to, if any
+        perf_sample_rate: Fraction of page loads that report performance data
+    
+    Returns:
+        Path of the written config.json
+    """
+    if not any(theme["name"] == default_theme for theme in (themes if themes is not None else THEMES)):
+        raise ValueError(f"Default theme '{default_theme}' is not defined")
+    
+    config = tenant_config(supabase_url, supabase_anon_key, default_theme, perf_endpoint, perf_sample_rate)
+    path = Path(build_dir) / "config.json"
+    # Replace atomically: the file may be served while it is rewritten.
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(json.dumps(config, indent=2) + "\n", encoding="utf-8")
+    os.replace(tmp_path, path)
+    return path
 
 
 class ProjectScaffolder:
     """Handles the creation of the TrackIt 2.0 project scaffold."""
 
-    def __init__(self, project_path: str = "trackit-app"):
+    def __init__(
+        self,
+        project_path: str = "trackit-app",
+        themes: Optional[List[Dict]] = None,
+        default_theme: str = DEFAULT_THEME,
+        service_worker: bool = False,
+        sinks: Optional[List[EventSink]] = None,
+        quiet: bool = False,
+        perf_endpoint: Optional[str] = None,
+        perf_sample_rate: float = 0.1,
+        dashboard_summary_tables: bool = False,
+        runtime_config: bool = False,
+        content_store: Optional[Union[str, Path, ContentStore]] = None,
+        supabase_url: Optional[str] = None,
+        supabase_anon_key: Optional[str] = None,
+        validate: bool = True,
+        template_pack: Optional[Union[str, Path, TemplatePack]] = None,
+        validation_executor: Optional[Executor] = None,
+    ):
         """
         Initialize the project scaffolder.
         
         Args:
             project_path: The root directory for the project
+            themes: Theme definitions to compile, in the shape of THEMES
+            default_theme: Name of the theme inlined as critical CSS
+            service_worker: Emit a service worker and precache manifest
+            sinks: Receivers for structured progress and timing events
+            quiet: Suppress the per-directory/per-file console output
+            perf_endpoint: URL the generated app beacons performance data to;
+                the perf module is only generated when this is set
+            perf_sample_rate: Fraction of page loads that report performance data
+            dashboard_summary_tables: Back the dashboard aggregates with summary
+                tables maintained by triggers instead of computing them per call
+            runtime_config: Build a tenant-agnostic app that reads its Supabase
+                settings and default theme from /config.json at startup instead
+                of .env; provision tenants with write_tenant_config()
+            content_store: Write file bodies once into this content-addressed
+                store (a directory or a ContentStore) and hardlink them into
+                the tree, falling back to reflinks and then copies
+            supabase_url: Supabase project URL written to .env or config.json;
+                a placeholder when not given
+            supabase_anon_key: Supabase anon key, likewise
+            validate: Check generated sources (see validate()) before writing
+                anything, raising ScaffoldValidationError on problems
+            template_pack: Template pack whose files replace (or add to) the
+                built-in outputs: a TemplatePack, a pack directory or archive,
+                or "name@version" in PACKS_DIR; opened via open_template_pack()
+            validation_executor: Executor validate() spreads uncached checks
+                over; by default a process-wide pool, which is not used
+                inside worker processes
         """
         self.project_path = Path(project_path)
+        self.themes: List[Dict] = themes if themes is not None else THEMES
+        self.default_theme = default_theme
+        self.service_worker = service_worker
+        self.sinks: List[EventSink] = sinks or []
+        self.quiet = quiet
+        self.stats: Dict[str, int] = {}
+        self.perf_endpoint = perf_endpoint
+        self.perf_sample_rate = perf_sample_rate
+        self.dashboard_summary_tables = dashboard_summary_tables
+        self.runtime_config = runtime_config
+        if content_store is not None and not isinstance(content_store, ContentStore):
+            content_store = ContentStore(content_store)
+        self.content_store: Optional[ContentStore] = content_store
+        self.supabase_url = supabase_url
+        self.supabase_anon_key = supabase_anon_key
+        self.validate_sources = validate
+        self.validation_executor = validation_executor
+        self._template_pack_reference = template_pack if isinstance(template_pack, (str, Path)) else None
+        if template_pack is not None and not isinstance(template_pack, TemplatePack):
+            template_pack = open_template_pack(template_pack)
+        self.template_pack: Optional[TemplatePack] = template_pack
+        if not any(theme["name"] == default_theme for theme in self.themes):
+            raise ValueError(f"Default theme '{default_theme}' is not defined")
         self.directories: List[str] = [
             "public",
+            "public/themes",
             "src/assets",
             "src/components",
             "src/layouts",
@@ -34,103 +1091,538 @@ class ProjectScaffolder:
             "src/store",
             "src/supabase",
             "src/styles",
+            "supabase/migrations",
         ]
-        self.files: Dict[str, str] = self._define_files()
+        self.outputs: Dict[str, Tuple[str, tuple, Tuple[str, ...]]] = self._define_outputs()
+        self._files: Optional[Dict[str, str]] = None
+        self._rendered: Dict[str, str] = {}
+        self._fingerprint_cache: Dict[str, str] = {}
+    
+    @property
+    def files(self) -> Dict[str, str]:
+        """Every generated file's content, rendered on first access."""
+        if self._files is None:
+            with self._phase("render"):
+                self._files = self._define_files()
+        return self._files
+    
+    def _define_outputs(self) -> Dict[str, Tuple[str, tuple, Tuple[str, ...]]]:
+        """
+        Declare every generated file.
         
-    def _define_files(self) -> Dict[str, str]:
-        """Define the content for all files to be created in the project."""
-        return {
-            "index.html": self._get_index_html_content(),
+        Each entry maps a path to the method rendering it, that method's
+        arguments, and the inputs besides its own template source that the
+        content depends on (see _input_fingerprint). regenerate() uses these
+        declarations to decide which files need rendering again.
+        """
+        outputs = {
+            "index.html": ("_get_index_html_content", (), ("themes", "options.runtime_config")),
 
             # Config files
-            ".env": self._get_env_content(),
-            "tailwind.config.js": self._get_tailwind_config_content(),
-            "vite.config.js": self._get_vite_config_content(),
-            "package.json": self._get_package_json_content(),
+            "tailwind.config.js": ("_get_tailwind_config_content", (), ()),
+            "package.json": ("_get_package_json_content", (), ("tenant",)),
             
             # Vue files
-            "src/App.vue": self._get_app_vue_content(),
-            "src/main.js": self._get_main_js_content(),
+            "src/App.vue": ("_get_app_vue_content", (), ()),
+            "src/main.js": ("_get_main_js_content", (), ("options.runtime_config", "options.service_worker", "tenant")),
             
             # Components
-            "src/components/Sidebar.vue": self._get_sidebar_content(),
-            "src/components/Navbar.vue": self._get_navbar_content(),
-            "src/components/ToDoPane.vue": self._get_todo_pane_content(),
-            "src/components/ProjectCard.vue": self._get_project_card_content(),
-            "src/components/ProjectForm.vue": self._get_project_form_content(),
-            "src/components/ThemeSelector.vue": self._get_theme_selector_content(),
+            "src/components/Sidebar.vue": ("_get_sidebar_content", (), ("routes",)),
+            "src/components/Navbar.vue": ("_get_navbar_content", (), ("routes",)),
+            "src/components/ToDoPane.vue": ("_get_todo_pane_content", (), ()),
+            "src/components/ProjectCard.vue": ("_get_project_card_content", (), ()),
+            "src/components/ProjectForm.vue": ("_get_project_form_content", (), ()),
+            "src/components/ThemeSelector.vue": ("_get_theme_selector_content", (), ()),
+            "src/components/SyncConflicts.vue": ("_get_sync_conflicts_content", (), ()),
             
             # Layouts
-            "src/layouts/DashboardLayout.vue": self._get_dashboard_layout_content(),
+            "src/layouts/DashboardLayout.vue": ("_get_dashboard_layout_content", (), ()),
             
             # Pages
-            "src/pages/Home.vue": self._get_home_content(),
-            "src/pages/Login.vue": self._get_login_content(),
-            "src/pages/Register.vue": self._get_register_content(),
-            "src/pages/Dashboard.vue": self._get_dashboard_content(),
-            "src/pages/Projects.vue": self._get_projects_content(),
-            "src/pages/ScrumBoard.vue": self._get_scrum_board_content(),
-            "src/pages/Matrix.vue": self._get_matrix_content(),
-            "src/pages/History.vue": self._get_history_content(),
-            "src/pages/Profile.vue": self._get_profile_content(),
+            "src/pages/Home.vue": ("_get_home_content", (), ()),
+            "src/pages/Login.vue": ("_get_login_content", (), ()),
+            "src/pages/Register.vue": ("_get_register_content", (), ()),
+            "src/pages/Dashboard.vue": ("_get_dashboard_content", (), ()),
+            "src/pages/Projects.vue": ("_get_projects_content", (), ()),
+            "src/pages/ScrumBoard.vue": ("_get_scrum_board_content", (), ()),
+            "src/pages/Matrix.vue": ("_get_matrix_content", (), ()),
+            "src/pages/History.vue": ("_get_history_content", (), ()),
+            "src/pages/Profile.vue": ("_get_profile_content", (), ()),
             
             # Router
-            "src/router/index.js": self._get_router_content(),
+            "src/router/index.js": ("_get_router_content", (), ("routes",)),
             
             # Store
-            "src/store/index.js": self._get_store_content(),
+            "src/store/index.js": ("_get_store_content", (), ("themes", "options.runtime_config")),
+            "src/store/offline.js": ("_get_offline_db_content", (), ()),
             
             # Supabase
-            "src/supabase/client.js": self._get_supabase_client_content(),
+            "src/supabase/client.js": ("_get_supabase_client_content", (), ("options.runtime_config",)),
             
             # Styles
-            "src/styles/themes.css": self._get_themes_css_content(),
-            "src/styles/tailwind.css": self._get_tailwind_css_content(),
+            "src/styles/themes.css": ("_get_themes_css_content", (), ("themes",)),
+            "src/styles/themes.js": ("_get_themes_js_content", (), ("themes",)),
+            "src/styles/tailwind.css": ("_get_tailwind_css_content", (), ()),
+            
+            # Database
+            "supabase/migrations/20250101000000_initial_schema.sql": ("_get_initial_schema_sql_content", (), ()),
+            "supabase/migrations/20250102000000_bulk_status.sql": ("_get_bulk_status_sql_content", (), ()),
+            "supabase/migrations/20250103000000_dashboard_stats.sql": ("_get_dashboard_stats_sql_content", (), ("options.dashboard_summary_tables",)),
+            "supabase/migrations/20250104000000_project_archive.sql": ("_get_project_archive_sql_content", (), ()),
+            "supabase/migrations/20250105000000_full_text_search.sql": ("_get_full_text_search_sql_content", (), ()),
+            "supabase/migrations/20250106000000_task_quadrants.sql": ("_get_task_quadrants_sql_content", (), ()),
+            "supabase/migrations/20250107000000_bootstrap.sql": ("_get_bootstrap_sql_content", (), ()),
         }
+        
+        # Build-time settings, or a placeholder config.json that each tenant's
+        # deployment replaces
+        if self.runtime_config:
+            outputs["src/config.js"] = ("_get_config_module_content", (), ())
+            outputs["public/config.json"] = ("_get_runtime_config_content", (), ("themes", "tenant", "credentials"))
+        else:
+            outputs[".env"] = ("_get_env_content", (), ("tenant", "credentials"))
+        
+        # Lazily loaded stylesheets for every non-default theme
+        for theme in self.themes:
+            if theme["name"] != self.default_theme:
+                outputs[f"public/themes/{theme['name']}.css"] = ("_get_lazy_theme_css", (theme,), ("themes",))
+        
+        if self.service_worker:
+            outputs["public/sw.js"] = ("_get_service_worker_content", (), ())
+        
+        if self.perf_endpoint:
+            outputs["src/perf/index.js"] = ("_get_perf_module_content", (), ("options.runtime_config",))
+            outputs["scripts/perf-collector.mjs"] = ("_get_perf_collector_content", (), ())
+        
+        # Last: the precache manifest hashes the public files above.
+        outputs["vite.config.js"] = ("_get_precaching_vite_config_content", (), ("options.service_worker", "public"))
+        
+        # A template pack's files take the place of the built-in templates
+        if self.template_pack:
+            for file_path in self.template_pack.files:
+                outputs[file_path] = ("_get_pack_file_content", (file_path,), ("pack",))
+        
+        return outputs
+    
+    def _define_files(self) -> Dict[str, str]:
+        """Define the content for all files to be created in the project."""
+        self._rendered = {}
+        return {file_path: self._render(file_path) for file_path in self.outputs}
+    
+    def _render(self, file_path: str) -> str:
+        """Render one output, at most once per _define_files/regenerate run."""
+        if file_path not in self._rendered:
+            method, args, _ = self.outputs[file_path]
+            self._rendered[file_path] = getattr(self, method)(*args)
+        return self._rendered[file_path]
+    
+    def _get_pack_file_content(self, file_path: str) -> str:
+        return self.template_pack.files[file_path]
+    
+    def _get_precaching_vite_config_content(self) -> str:
+        public = {path: self._render(path) for path in self.outputs if path.startswith("public/")}
+        return self._get_vite_config_content(public)
+    
+    def _input_fingerprint(self, name: str) -> str:
+        """
+        Hash of one declared input.
+        
+        themes: the theme registry, default theme and font list
+        routes: the router template, which is the route table
+        tenant: per-tenant settings (perf endpoint and sampling)
+        credentials: the tenant's Supabase URL and anon key
+        options.<name>: one constructor switch that changes what templates emit
+        public: the inputs of every public/ output (for the precache manifest)
+        pack: the template pack's name, version and file hashes
+        """
+        if name not in self._fingerprint_cache:
+            if name == "themes":
+                payload = {
+                    "themes": self.themes,
+                    "default_theme": self.default_theme,
+                    "fonts": FONTS,
+                    "default_font": DEFAULT_FONT,
+                    "storage_key": PREFERENCES_STORAGE_KEY,
+                }
+            elif name == "routes":
+                payload = _template_fingerprint(type(self), "_get_router_content")
+            elif name == "tenant":
+                payload = {"perf_endpoint": self.perf_endpoint, "perf_sample_rate": self.perf_sample_rate}
+            elif name == "credentials":
+                payload = {"supabase_url": self.supabase_url, "supabase_anon_key": self.supabase_anon_key}
+            elif name in ("options.service_worker", "options.runtime_config", "options.dashboard_summary_tables"):
+                payload = getattr(self, name.split(".", 1)[1])
+            elif name == "pack":
+                pack = self.template_pack
+                payload = pack and {"name": pack.name, "version": pack.version, "digest": pack.digest}
+            elif name == "public":
+                payload = {path: self._fingerprints(path) for path in self.outputs if path.startswith("public/")}
+            else:
+                raise ValueError(f"Unknown input '{name}'")
+            encoded = json.dumps(payload, sort_keys=True).encode("utf-8")
+            self._fingerprint_cache[name] = hashlib.sha256(encoded).hexdigest()
+        return self._fingerprint_cache[name]
+    
+    def _fingerprints(self, file_path: str) -> Dict[str, str]:
+        """Fingerprint of every input of one output, keyed by input name."""
+        method, _, inputs = self.outputs[file_path]
+        fingerprints = {"template": _template_fingerprint(type(self), method)}
+        for name in inputs:
+            fingerprints[name] = self._input_fingerprint(name)
+        return fingerprints
     
     def create_project(self) -> None:
         """Create the entire project structure."""
-        print(f"Creating TrackIt 2.0 project at {self.project_path}")
+        self._log(f"Creating TrackIt 2.0 project at {self.project_path}")
+        self.stats = {"files_written": 0, "files_skipped": 0, "bytes_written": 0}
+        start = time.perf_counter()
+        
+        if self.validate_sources:
+            with self._phase("validate"):
+                self.validate()
+        
+        with self._locked():
+            # Create directories
+            with self._phase("directories"):
+                self._create_directories()
+            
+            # Create files
+            with self._phase("files"):
+                # Files an earlier run generated (e.g. from a previous template
+                # pack version) that this configuration no longer produces.
+                self._remove_stale_outputs(self._read_manifest())
+                manifest: Dict[str, Dict] = {}
+                try:
+                    self._create_files(manifest)
+                finally:
+                    # Record what was written even if the run fails part way,
+                    # so regenerate() resumes it instead of starting over.
+                    self._write_manifest(manifest)
+        
+        self._emit("project_created", duration_s=time.perf_counter() - start, **self.stats)
+        self._log(f"Project successfully created at {self.project_path}")
+        self._log("To get started, run:")
+        self._log(f"cd {self.project_path}")
+        self._log("npm install")
+        self._log("npm run dev")
+    
+    def regenerate(self) -> Dict[str, List[str]]:
+        """
+        Bring a tree made by create_project up to date, rendering only what changed.
+        
+        Each output's input fingerprints are compared with the ones recorded in
+        MANIFEST_FILE by the previous run. Outputs whose inputs are unchanged,
+        and whose file on disk is as written, are not rendered at all. Outputs
+        that are no longer generated are removed.
+        
+        Returns:
+            Every rebuilt or removed path mapped to the reasons why
+        """
+        self._log(f"Regenerating TrackIt 2.0 project at {self.project_path}")
+        self.stats = {"files_written": 0, "files_skipped": 0, "bytes_written": 0}
+        start = time.perf_counter()
+        with self._locked():
+            report = self._regenerate()
+        self._emit("project_regenerated", duration_s=time.perf_counter() - start,
+                   files_rebuilt=len(report), **self.stats)
+        return report
+    
+    def _regenerate(self) -> Dict[str, List[str]]:
+        """regenerate() proper, run with the tree locked."""
+        previous = self._read_manifest()
+        self._rendered = {}
+        report: Dict[str, List[str]] = {}
+        manifest: Dict[str, Dict] = {}
         
-        # Create directories
-        self._create_directories()
+        stale = {}
+        for file_path in self.outputs:
+            reasons = self._stale_reasons(file_path, previous.get(file_path))
+            if reasons:
+                stale[file_path] = reasons
+        if self.validate_sources and stale:
+            with self._phase("validate"):
+                self.validate(list(stale))
         
-        # Create files
-        self._create_files()
+        with self._phase("regenerate"):
+            for file_path in self.outputs:
+                reasons = stale.get(file_path)
+                if not reasons:
+                    manifest[file_path] = previous[file_path]
+                    self.stats["files_skipped"] += 1
+                    self._emit("file_skipped", path=file_path, reason="up to date")
+                    continue
+                
+                content = self._render(file_path)
+                self._write_file(file_path, content)
+                manifest[file_path] = self._manifest_entry(file_path, content)
+                report[file_path] = reasons
+                self._emit("file_rebuilt", path=file_path, reasons=reasons)
+                self._log(f"Rebuilt {file_path}: {', '.join(reasons)}")
+            
+            for file_path in self._remove_stale_outputs(previous):
+                report[file_path] = ["no longer generated"]
+            
+            self._write_manifest(manifest)
+        return report
+    
+    def _remove_stale_outputs(self, previous: Dict[str, Dict]) -> List[str]:
+        """Delete files recorded in a previous manifest that are no longer outputs."""
+        removed = sorted(previous.keys() - self.outputs.keys())
+        for file_path in removed:
+            try:
+                (self.project_path / file_path).unlink()
+            except FileNotFoundError:
+                pass
+            self._emit("file_removed", path=file_path)
+            self._log(f"Removed {file_path}: no longer generated")
+        return removed
+    
+    def validate(self, paths: Optional[List[str]] = None) -> None:
+        """
+        Check generated sources without running a JavaScript toolchain.
+        
+        Vue SFCs must have balanced <template>/<script>/<style> blocks and
+        import every component their template uses; script and JS brackets
+        must balance; route components must be imported; @/ and relative
+        imports must resolve to a generated file, and package imports to a
+        dependency in package.json. Per-file results are cached by content
+        hash, so validating many tenant variants only checks each distinct
+        file once.
+        
+        Args:
+            paths: Outputs to check (default: all); imports are resolved
+                against every output either way
+        
+        Raises:
+            ScaffoldValidationError: Listing every problem found
+        """
+        start = time.perf_counter()
+        if paths is None:
+            paths = list(self.files)
+        paths = [path for path in paths if _source_kind(path)]
+        sources = [(_source_kind(path), self._render(path)) for path in paths]
+        results, hits = _check_sources(sources, self.validation_executor)
+        
+        problems: List[Tuple[str, str]] = []
+        try:
+            package = json.loads(self._render("package.json"))
+            packages = set(package.get("dependencies", {})) | set(package.get("devDependencies", {}))
+        except ValueError as exc:
+            # Package imports cannot be checked against a broken package.json.
+            packages = None
+            if "package.json" not in paths:
+                problems.append(("package.json", f"invalid JSON: {exc}"))
+        for path, (found, imports) in zip(paths, results):
+            problems += [(path, message) for message in found]
+            for specifier in imports:
+                target = _resolve_import(path, specifier, self.outputs)
+                if target == "":
+                    problems.append((path, f"imports '{specifier}', which is not generated"))
+                elif (target is None and packages is not None and _package_name(specifier) not in packages
+                        and specifier.removeprefix("node:") not in NODE_BUILTINS):
+                    problems.append((path, f"imports '{specifier}', which is not in package.json"))
+        
+        self._emit("validated", files=len(paths), cache_hits=hits, problems=len(problems),
+                   duration_s=time.perf_counter() - start)
+        if problems:
+            raise ScaffoldValidationError(problems)
+    
+    def _stale_reasons(self, file_path: str, entry: Optional[Dict]) -> List[str]:
+        """Why an output needs rebuilding; empty when it is up to date."""
+        if entry is None:
+            return ["new output"]
+        full_path = self.project_path / file_path
+        if not full_path.exists():
+            return ["missing on disk"]
+        
+        recorded = entry.get("inputs", {})
+        reasons = [
+            f"{name} changed"
+            for name, fingerprint in self._fingerprints(file_path).items()
+            if recorded.get(name) != fingerprint
+        ]
+        if not reasons and _sha256_file(full_path) != entry.get("sha256"):
+            reasons.append("modified on disk")
+        return reasons
+    
+    def _manifest_entry(self, file_path: str, content: str) -> Dict:
+        return {
+            "sha256": hashlib.sha256(content.encode("utf-8")).hexdigest(),
+            "inputs": self._fingerprints(file_path),
+        }
+    
+    def build_options(self) -> Dict:
+        """
+        The constructor options that shape this tree's content, as JSON values.
+        
+        Recorded in MANIFEST_FILE so that tools re-rendering an existing tree
+        (watch mode, provisioning) keep the options it was built with; read
+        them back with recorded_options(). The built-in THEMES are left out
+        so edits to the registry still reach the tree.
+        """
+        options = {
+            "default_theme": self.default_theme,
+            "service_worker": self.service_worker,
+            "perf_endpoint": self.perf_endpoint,
+            "perf_sample_rate": self.perf_sample_rate,
+            "dashboard_summary_tables": self.dashboard_summary_tables,
+            "runtime_config": self.runtime_config,
+            "supabase_url": self.supabase_url,
+            "supabase_anon_key": self.supabase_anon_key,
+        }
+        if self.themes is not THEMES:
+            options["themes"] = self.themes
+        if self.content_store is not None:
+            options["content_store"] = str(self.content_store.root.resolve())
+        if self.template_pack is not None:
+            reference = self._template_pack_reference
+            if reference is None:
+                reference = f"{self.template_pack.name}@{self.template_pack.version}"
+            elif Path(reference).exists():
+                reference = Path(reference).resolve()
+            options["template_pack"] = str(reference)
+        return options
+    
+    def _read_manifest(self) -> Dict[str, Dict]:
+        """Entries recorded by the last run, or nothing for a fresh tree."""
+        try:
+            manifest = json.loads((self.project_path / MANIFEST_FILE).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        if manifest.get("version") != MANIFEST_VERSION:
+            return {}
+        return manifest.get("files", {})
+    
+    def _write_manifest(self, files: Dict[str, Dict]) -> None:
+        path = self.project_path / MANIFEST_FILE
+        tmp_path = path.with_name(path.name + ".tmp")
+        manifest = {"version": MANIFEST_VERSION, "options": self.build_options(), "files": files}
+        tmp_path.write_text(json.dumps(manifest, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        os.replace(tmp_path, path)
+    
+    def _log(self, message: str) -> None:
+        """Print progress output unless running quietly."""
+        if not self.quiet:
+            print(message)
+    
+    def _emit(self, event: str, **fields) -> None:
+        """Send a structured event to every sink."""
+        if not self.sinks:
+            return
+        payload = {"event": event, "ts": time.time(), "project": str(self.project_path), **fields}
+        for sink in self.sinks:
+            sink.emit(payload)
+    
+    @contextmanager
+    def _phase(self, name: str) -> Iterator[None]:
+        """Time a phase of the run and report failures inside it."""
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception as exc:
+            self._emit("error", phase=name, error=f"{type(exc).__name__}: {exc}")
+            raise
+        finally:
+            self._emit("phase", phase=name, duration_s=time.perf_counter() - start)
+    
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """
+        Hold an exclusive lock on the target tree.
         
-        print(f"Project successfully created at {self.project_path}")
-        print("To get started, run:")
-        print(f"cd {self.project_path}")
-        print("npm install")
-        print("npm run dev")
+        Runs against the same tree, from threads or processes, take turns
+        instead of interleaving their writes; runs against different trees
+        are unaffected. The lock is advisory (flock) and a no-op on Windows.
+        """
+        self.project_path.mkdir(parents=True, exist_ok=True)
+        if fcntl is None:
+            yield
+            return
+        with open(self.project_path / LOCK_FILE, "a") as lock:
+            start = time.perf_counter()
+            fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+            self._emit("lock_acquired", waited_s=time.perf_counter() - start)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
     
     def _create_directories(self) -> None:
         """Create all project directories."""
         for directory in self.directories:
             dir_path = self.project_path / directory
             dir_path.mkdir(parents=True, exist_ok=True)
-            print(f"Created directory: {dir_path}")
+            self._log(f"Created directory: {dir_path}")
     
-    def _create_files(self) -> None:
-      """Create all project files with content."""
+    def _create_files(self, manifest: Optional[Dict[str, Dict]] = None) -> None:
+      """Create all project files with content, skipping ones already up to date.
+      
+      Args:
+          manifest: If given, receives each file's manifest entry once it is on disk
+      """
       for file_path, content in self.files.items():
-          full_path = self.project_path / file_path
-          full_path.parent.mkdir(parents=True, exist_ok=True)
-          
-          # Add UTF-8 encoding here
-          with open(full_path, 'w', encoding='utf-8') as f:
-              f.write(content)
-          
-          print(f"Created file: {full_path}")
+          self._write_file(file_path, content)
+          if manifest is not None:
+              manifest[file_path] = self._manifest_entry(file_path, content)
+
+    def _write_file(self, file_path: str, content: str) -> None:
+      """Write one project file unless it already holds content."""
+      stats = self.stats
+      for key in ("files_written", "files_skipped", "bytes_written"):
+          stats.setdefault(key, 0)
+      full_path = self.project_path / file_path
+      data = content.encode("utf-8")
+      
+      if self._is_unchanged(full_path, data):
+          stats["files_skipped"] += 1
+          self._emit("file_skipped", path=file_path, reason="unchanged")
+          return
+      
+      full_path.parent.mkdir(parents=True, exist_ok=True)
+      
+      if self.content_store:
+          # Only bodies new to the store, or copied out of it, cost a write.
+          blob, stored = self.content_store.put(data)
+          method = self.content_store.materialize(blob, full_path)
+          written = len(data) * (stored + (method == "copy"))
+          stats[f"files_{method}"] = stats.get(f"files_{method}", 0) + 1
+      else:
+          method = "write"
+          written = len(data)
+          # Write beside the file and rename over it: watchers (e.g. Vite) never
+          # see a half-written file, and a hardlink left by a content-store
+          # run is replaced rather than written through.
+          tmp_path = full_path.with_name(f".{full_path.name}.{os.getpid()}.tmp")
+          tmp_path.write_bytes(data)
+          os.replace(tmp_path, full_path)
+      
+      stats["files_written"] += 1
+      stats["bytes_written"] += written
+      self._emit("file_written", path=file_path, bytes=written, method=method)
+      self._log(f"Created file: {full_path}")
+
+    @staticmethod
+    def _is_unchanged(path: Path, data: bytes) -> bool:
+        """Whether path already holds exactly data."""
+        try:
+            if path.stat().st_size != len(data):
+                return False
+            return path.read_bytes() == data
+        except OSError:
+            return False
 
     def _get_index_html_content(self) -> str:
-      return """<!DOCTYPE html>
-<html lang="en">
+      # With runtime config the tenant's default theme is only known once
+      # config.js has loaded, and it applies it only to an unclassed root.
+      html_class = "" if self.runtime_config else f' class="{self.default_theme}"'
+      return f"""<!DOCTYPE html>
+<html lang="en"{html_class}>
   <head>
     <meta charset="UTF-8" />
     <link rel="icon" type="image/svg+xml" href="/favicon.svg" />
     <meta name="viewport" content="width=device-width, initial-scale=1.0" />
     <title>TrackIt 2.0</title>
+{self._get_theme_boot_script()}
   </head>
   <body>
     <div id="app"></div>
@@ -138,11 +1630,75 @@ class ProjectScaffolder:
   </body>
 </html>
 """
+
+    def _get_theme_boot_script(self) -> str:
+        """Inline script that applies the cached theme before the bundle loads."""
+        stylesheets = json.dumps(self._get_theme_stylesheets())
+        return f"""    <script>
+      // Apply the last used theme/font before the Vue bundle loads so the
+      // first paint already uses it. The store reconciles with the server later.
+      (function () {{
+        var root = document.documentElement;
+        var stylesheets = {stylesheets};
+        try {{
+          var prefs = JSON.parse(localStorage.getItem('{PREFERENCES_STORAGE_KEY}') || '{{}}');
+          if (prefs.theme && stylesheets[prefs.theme]) {{
+            // Written by the parser, unlike an appended <link>, so it blocks
+            // first paint; the href only ever comes from the map above.
+            document.write('<link id="theme-stylesheet" rel="stylesheet" href="' + stylesheets[prefs.theme] + '">');
+          }}
+          if (prefs.theme) root.className = prefs.theme;
+          if (prefs.font) root.style.setProperty('--font-body', prefs.font);
+        }} catch (e) {{
+          root.className = '{"" if self.runtime_config else self.default_theme}';
+        }}
+      }})();
+    </script>"""
     
     # File content methods
     def _get_env_content(self) -> str:
-        return """VITE_SUPABASE_URL=your-supabase-url
-VITE_SUPABASE_ANON_KEY=your-supabase-anon-key
+        content = f"""VITE_SUPABASE_URL={self.supabase_url or 'your-supabase-url'}
+VITE_SUPABASE_ANON_KEY={self.supabase_anon_key or 'your-supabase-anon-key'}
+"""
+        if self.perf_endpoint:
+            content += f"""VITE_PERF_ENDPOINT={self.perf_endpoint}
+VITE_PERF_SAMPLE_RATE={self.perf_sample_rate}
+"""
+        return content
+
+    def _get_runtime_config_content(self) -> str:
+        config = tenant_config(
+            self.supabase_url or "your-supabase-url",
+            self.supabase_anon_key or "your-supabase-anon-key",
+            self.default_theme,
+            self.perf_endpoint,
+            self.perf_sample_rate,
+        )
+        return json.dumps(config, indent=2) + "\n"
+
+    def _get_config_module_content(self) -> str:
+        return """// Tenant settings, fetched at startup so one build can serve every tenant.
+// main.js awaits loadConfig() before importing anything that reads `config`.
+import { loadThemeStylesheet } from '@/styles/themes'
+
+export const config = {}
+
+export async function loadConfig(url = '/config.json') {
+  const response = await fetch(url, { cache: 'no-cache' })
+  if (!response.ok) {
+    throw new Error(`Could not load ${url}: ${response.status}`)
+  }
+  Object.assign(config, await response.json())
+  
+  // index.html only sets a class when the user has a saved theme; everyone
+  // else starts on the tenant's default.
+  const root = document.documentElement
+  if (config.defaultTheme && !root.className) {
+    await loadThemeStylesheet(config.defaultTheme)
+    root.className = config.defaultTheme
+  }
+  return config
+}
 """
 
     def _get_tailwind_config_content(self) -> str:
@@ -172,8 +1728,9 @@ module.exports = {
 }
 """
 
-    def _get_vite_config_content(self) -> str:
-        return """import { defineConfig } from 'vite'
+    def _get_vite_config_content(self, files: Optional[Dict[str, str]] = None) -> str:
+        if not self.service_worker:
+            return """import { defineConfig } from 'vite'
 import vue from '@vitejs/plugin-vue'
 import path from 'path'
 
@@ -186,10 +1743,175 @@ export default defineConfig({
     },
   },
 })
+"""
+        
+        static_precache = json.dumps(self._get_static_precache_entries(files or {}), indent=2)
+        return """import { defineConfig } from 'vite'
+import vue from '@vitejs/plugin-vue'
+import path from 'path'
+import { createHash } from 'crypto'
+
+// Public files emitted by the scaffolder, keyed by content hash.
+const staticPrecache = """ + static_precache + """
+
+const revision = (source) => createHash('sha256').update(source).digest('hex').slice(0, 16)
+
+// Writes precache-manifest.json for public/sw.js: every emitted bundle file
+// plus the scaffolder's public files, each with a content hash.
+function precacheManifest() {
+  return {
+    name: 'trackit-precache-manifest',
+    apply: 'build',
+    enforce: 'post',
+    generateBundle(_, bundle) {
+      const entries = Object.values(bundle)
+        .filter(file => !file.fileName.endsWith('.map'))
+        .map(file => ({
+          url: '/' + file.fileName,
+          revision: revision(file.type === 'chunk' ? file.code : file.source)
+        }))
+      this.emitFile({
+        type: 'asset',
+        fileName: 'precache-manifest.json',
+        source: JSON.stringify([...entries, ...staticPrecache], null, 2)
+      })
+    }
+  }
+}
+
+// https://vitejs.dev/config/
+export default defineConfig({
+  plugins: [vue(), precacheManifest()],
+  define: {
+    // Changes on every build so the browser picks up the new service worker.
+    __BUILD_ID__: JSON.stringify(Date.now().toString(36)),
+  },
+  resolve: {
+    alias: {
+      '@': path.resolve(__dirname, 'src'),
+    },
+  },
+})
+"""
+
+    def _get_static_precache_entries(self, files: Dict[str, str]) -> List[Dict[str, str]]:
+        """Precache entries for the generated public/ files, except the worker and tenant config."""
+        entries = []
+        for file_path, content in sorted(files.items()):
+            if not file_path.startswith("public/") or file_path in ("public/sw.js", "public/config.json"):
+                continue
+            entries.append({
+                "url": "/" + file_path[len("public/"):],
+                "revision": hashlib.sha256(content.encode("utf-8")).hexdigest()[:16],
+            })
+        return entries
+
+    def _get_service_worker_content(self) -> str:
+        return """// TrackIt service worker, generated by the scaffolder.
+// Static assets come from a precache keyed by content hash; Supabase reads
+// are served stale-while-revalidate.
+const PRECACHE = 'trackit-precache';
+const API_CACHE = 'trackit-api';
+const MANIFEST_URL = '/precache-manifest.json';
+const REVISIONS_KEY = '/__precache-revisions';
+const CONFIG_URL = '/config.json';
+
+// Download only the entries whose content hash changed since the last install.
+const precache = async () => {
+  const response = await fetch(MANIFEST_URL, { cache: 'no-store' });
+  if (!response.ok) return;
+  
+  const manifest = await response.json();
+  const cache = await caches.open(PRECACHE);
+  const stored = await cache.match(REVISIONS_KEY);
+  const previous = stored ? await stored.json() : {};
+  const next = {};
+  
+  await Promise.all(manifest.map(async ({ url, revision }) => {
+    next[url] = revision;
+    if (previous[url] === revision && await cache.match(url)) return;
+    const asset = await fetch(url, { cache: 'no-store' });
+    if (asset.ok) await cache.put(url, asset);
+  }));
+  await Promise.all(
+    Object.keys(previous)
+      .filter(url => !(url in next))
+      .map(url => cache.delete(url))
+  );
+  await cache.put(REVISIONS_KEY, new Response(JSON.stringify(next)));
+};
+
+const cacheFirst = async (request) => {
+  const cache = await caches.open(PRECACHE);
+  const cached = await cache.match(request, { ignoreSearch: true });
+  return cached || fetch(request);
+};
+
+// The tenant config can change without a new build: prefer the network and
+// keep the last copy for offline starts.
+const networkFirst = async (request) => {
+  const cache = await caches.open(PRECACHE);
+  try {
+    const response = await fetch(request);
+    if (response.ok) await cache.put(CONFIG_URL, response.clone());
+    return response;
+  } catch (error) {
+    const cached = await cache.match(CONFIG_URL);
+    if (cached) return cached;
+    throw error;
+  }
+};
+
+const staleWhileRevalidate = async (event, request) => {
+  const cache = await caches.open(API_CACHE);
+  const cached = await cache.match(request);
+  const refresh = fetch(request).then(response => {
+    if (response.ok) cache.put(request, response.clone());
+    return response;
+  });
+  if (cached) {
+    event.waitUntil(refresh.catch(() => {}));
+    return cached;
+  }
+  return refresh;
+};
+
+self.addEventListener('install', (event) => {
+  event.waitUntil(precache().then(() => self.skipWaiting()));
+});
+
+self.addEventListener('activate', (event) => {
+  event.waitUntil(self.clients.claim());
+});
+
+self.addEventListener('message', (event) => {
+  // Cached API reads belong to the signed-in user.
+  if (event.data?.type === 'clear-api-cache') {
+    event.waitUntil(caches.delete(API_CACHE));
+  }
+});
+
+self.addEventListener('fetch', (event) => {
+  const { request } = event;
+  if (request.method !== 'GET') return;
+  
+  const url = new URL(request.url);
+  if (url.origin === self.location.origin) {
+    if (url.pathname === CONFIG_URL) {
+      event.respondWith(networkFirst(request));
+    } else if (request.mode === 'navigate') {
+      event.respondWith(cacheFirst(new Request('/index.html')));
+    } else {
+      event.respondWith(cacheFirst(request));
+    }
+  } else if (url.pathname.startsWith('/rest/v1/')) {
+    event.respondWith(staleWhileRevalidate(event, request));
+  }
+});
 """
 
     def _get_package_json_content(self) -> str:
-        return """{
+        content = """{
   "name": "trackit-app",
   "private": true,
   "version": "0.0.1",
@@ -214,6 +1936,14 @@ export default defineConfig({
   }
 }
 """
+        if not self.perf_endpoint:
+            return content
+        
+        package = json.loads(content)
+        package["scripts"]["perf:collect"] = "node scripts/perf-collector.mjs"
+        package["dependencies"]["web-vitals"] = "^3.5.2"
+        package["dependencies"] = dict(sorted(package["dependencies"].items()))
+        return json.dumps(package, indent=2) + "\n"
 
     def _get_app_vue_content(self) -> str:
         return """<template>
@@ -232,11 +1962,14 @@ const router = useRouter();
 const store = useStore();
 
 onMounted(() => {
+  store.watchConnectivity();
+  store.watchOtherTabs();
+  
   // Setup auth listener
   supabase.auth.onAuthStateChange((event, session) => {
     if (event === 'SIGNED_IN' && session) {
       store.setUser(session.user);
-      store.loadUserPreferences();
+      store.bootstrap();
     } else if (event === 'SIGNED_OUT') {
       store.clearUser();
       router.push('/');
@@ -248,7 +1981,8 @@ onMounted(() => {
     const { data } = await supabase.auth.getSession();
     if (data.session) {
       store.setUser(data.session.user);
-      store.loadUserPreferences();
+      // Deduplicated with the SIGNED_IN handler above: one request either way.
+      store.bootstrap();
     }
   };
   
@@ -263,17 +1997,60 @@ onMounted(() => {
 """
 
     def _get_main_js_content(self) -> str:
+        if self.runtime_config:
+            return self._get_runtime_main_js_content()
+        imports = "import { installPerf } from './perf'\n" if self.perf_endpoint else ""
+        # Installed before mount so the initial navigation is timed too.
+        perf = "installPerf({ router })\n" if self.perf_endpoint else ""
         return """import { createApp } from 'vue'
 import { createPinia } from 'pinia'
 import router from './router'
 import App from './App.vue'
-
+""" + imports + """
 const pinia = createPinia()
 const app = createApp(App)
 
 app.use(pinia)
 app.use(router)
-app.mount('#app')
+""" + perf + """app.mount('#app')
+""" + (self._get_service_worker_registration() if self.service_worker else "")
+
+    def _get_runtime_main_js_content(self) -> str:
+        perf = """  // Installed before mount so the initial navigation is timed too.
+  const { installPerf } = await import('./perf')
+  installPerf({ router })
+""" if self.perf_endpoint else ""
+        return """import { createApp } from 'vue'
+import { createPinia } from 'pinia'
+import { loadConfig } from './config'
+
+// The router, store and Supabase client read the tenant config when their
+// modules load, so they are imported only once it has arrived.
+const start = async () => {
+  await loadConfig()
+  const [{ default: router }, { default: App }] = await Promise.all([
+    import('./router'),
+    import('./App.vue')
+  ])
+  
+  const pinia = createPinia()
+  const app = createApp(App)
+  
+  app.use(pinia)
+  app.use(router)
+""" + perf + """  app.mount('#app')
+}
+
+start()
+""" + (self._get_service_worker_registration() if self.service_worker else "")
+
+    def _get_service_worker_registration(self) -> str:
+        return """
+if ('serviceWorker' in navigator && import.meta.env.PROD) {
+  window.addEventListener('load', () => {
+    navigator.serviceWorker.register(`/sw.js?build=${__BUILD_ID__}`);
+  });
+}
 """
 
     def _get_router_content(self) -> str:
@@ -315,7 +2092,8 @@ const routes = [
     children: [
       {
         path: '',
-        redirect: '/dashboard/projects'
+        name: 'Dashboard',
+        component: Dashboard
       },
       {
         path: 'projects',
@@ -376,26 +2154,97 @@ export default router
 """
 
     def _get_store_content(self) -> str:
-        return """import { defineStore } from 'pinia'
-import { supabase } from '@/supabase/client'
+        if self.runtime_config:
+            config_import = "import { config } from '@/config'\n"
+            default_theme = f"config.defaultTheme || '{self.default_theme}'"
+        else:
+            config_import = ""
+            default_theme = f"'{self.default_theme}'"
+        return f"""import {{ defineStore }} from 'pinia'
+import {{ supabase }} from '@/supabase/client'
+import {{ themeRegistry, loadThemeStylesheet }} from '@/styles/themes'
+import * as offline from '@/store/offline'
+{config_import}
+const PREFERENCES_KEY = '{PREFERENCES_STORAGE_KEY}'
+const DEFAULT_THEME = {default_theme}
+const DEFAULT_FONT = '{DEFAULT_FONT}'
+""" + """
+// Last theme/font applied on this device. index.html applies the same values
+// before the bundle loads, so starting from them avoids a repaint.
+const readCachedPreferences = () => {
+  try {
+    return JSON.parse(localStorage.getItem(PREFERENCES_KEY)) || {};
+  } catch (e) {
+    return {};
+  }
+};
+
+const cachedPreferences = readCachedPreferences();
+
+const byNewest = (a, b) => new Date(b.created_at) - new Date(a.created_at);
+
+// Columns maintained by the database; never sent back in an update.
+const withoutServerColumns = ({ id, user_id, created_at, updated_at, version, fts, ...patch }) => patch;
+
+// Search vectors are generated server-side and only used there; keep them
+// out of the store, the offline cache and any row written back.
+const toClientRow = ({ fts, ...row }) => row;
+
+let syncInFlight = null;
+const loadsInFlight = new Map();
+
+// Projects in the startup payload; users with more get the rest on demand.
+const BOOTSTRAP_PAGE_SIZE = 50;
+let bootstrapFor = null;
+let statsFromBootstrap = false;
+
+// Open tabs share confirmed writes instead of each refetching.
+const channel = typeof BroadcastChannel === 'undefined' ? null : new BroadcastChannel('trackit:store');
+
+// Rows carry a version bumped on every server write; never let a late
+// response or message replace a newer copy.
+const isOlder = (incoming, current) =>
+  incoming.version != null && current.version != null && incoming.version < current.version;
+
+// Rows per bulk request: keeps `in (...)` URLs and upsert bodies under the
+// gateway's size limits.
+const BULK_CHUNK_SIZE = 200;
+
+const chunked = (items, size = BULK_CHUNK_SIZE) => {
+  const chunks = [];
+  for (let i = 0; i < items.length; i += size) {
+    chunks.push(items.slice(i, i + size));
+  }
+  return chunks;
+};
+
+// RPCs from supabase/migrations that change status in one statement.
+const STATUS_RPC = {
+  projects: { name: 'set_project_status', ids: 'project_ids' },
+  tasks: { name: 'set_task_status', ids: 'task_ids' }
+};
 
 export const useStore = defineStore('main', {
   state: () => ({
     user: null,
-    theme: 'ocean-breeze', // Default theme
-    font: 'Inter', // Default font
+    theme: cachedPreferences.theme || DEFAULT_THEME,
+    font: cachedPreferences.font || DEFAULT_FONT,
     projects: [],
+    tasks: [],
     todos: [],
-    isToDoOpen: false
+    dashboardStats: null,
+    isToDoOpen: false,
+    isOnline: navigator.onLine,
+    pendingMutations: 0,
+    conflicts: [],
+    // Collections fetched this session. Writes and other tabs keep them
+    // current, so navigating back does not refetch.
+    loaded: { projects: false, tasks: false, todos: false }
   }),
   
   getters: {
     isLoggedIn: (state) => !!state.user,
-    isDarkTheme: (state) => state.theme.includes('midnight') || 
-                           state.theme.includes('galaxy') || 
-                           state.theme.includes('forest-night') || 
-                           state.theme.includes('cyber-noir') ||
-                           state.theme.includes('solar-void')
+    isDarkTheme: (state) => !!themeRegistry[state.theme]?.dark
   },
   
   actions: {
@@ -406,27 +2255,54 @@ export const useStore = defineStore('main', {
     clearUser() {
       this.user = null;
       this.projects = [];
+      this.tasks = [];
       this.todos = [];
+      this.dashboardStats = null;
+      this.conflicts = [];
+      this.loaded = { projects: false, tasks: false, todos: false };
+      bootstrapFor = null;
+      statsFromBootstrap = false;
+      navigator.serviceWorker?.controller?.postMessage({ type: 'clear-api-cache' });
+      offline.clearAll().catch(error => console.error('Error clearing offline cache:', error));
     },
     
-    setTheme(themeName) {
+    setTheme(themeName, { persist = true } = {}) {
       this.theme = themeName;
-      document.documentElement.className = themeName;
+      // Switch the class once the theme's stylesheet is in, so the page never
+      // renders with a class whose variables are missing.
+      loadThemeStylesheet(themeName).then(() => {
+        if (this.theme === themeName) {
+          document.documentElement.className = themeName;
+        }
+      });
+      this.cachePreferences();
       
-      if (this.user) {
+      if (persist && this.user) {
         this.saveUserPreferences();
       }
     },
     
-    setFont(fontName) {
+    setFont(fontName, { persist = true } = {}) {
       this.font = fontName;
       document.documentElement.style.setProperty('--font-body', fontName);
+      this.cachePreferences();
       
-      if (this.user) {
+      if (persist && this.user) {
         this.saveUserPreferences();
       }
     },
     
+    cachePreferences() {
+      try {
+        localStorage.setItem(PREFERENCES_KEY, JSON.stringify({
+          theme: this.theme,
+          font: this.font
+        }));
+      } catch (e) {
+        // Storage can be unavailable (private mode, quota); the cache is best effort.
+      }
+    },
+    
     toggleToDo() {
       this.isToDoOpen = !this.isToDoOpen;
     },
@@ -440,180 +2316,1633 @@ export const useStore = defineStore('main', {
         .eq('user_id', this.user.id)
         .single();
       
-      if (data && !error) {
-        this.setTheme(data.theme || 'ocean-breeze');
-        this.setFont(data.font || 'Inter');
-      } else {
-        // Set defaults if no preferences
-        this.setTheme('ocean-breeze');
-        this.setFont('Inter');
+      if (data && !error) {
+        this.applyPreferences(data);
+      }
+    },
+    
+    // The cached theme is already on screen; only repaint when the server disagrees.
+    applyPreferences({ theme, font }) {
+      if (theme && theme !== this.theme) {
+        this.setTheme(theme, { persist: false });
+      }
+      if (font && font !== this.font) {
+        this.setFont(font, { persist: false });
+      }
+    },
+    
+    // Everything the first screen needs (preferences, the newest projects,
+    // open todos, dashboard counts) in one RPC. Safe to call from every
+    // auth path: one request per signed-in user, and failures only log, so
+    // pages fall back to their own loads.
+    bootstrap() {
+      if (!this.user) return Promise.resolve();
+      
+      if (bootstrapFor?.userId !== this.user.id) {
+        const userId = this.user.id;
+        bootstrapFor = {
+          userId,
+          promise: this.fetchBootstrap().catch(error => {
+            console.error('Error loading startup data:', error);
+            if (bootstrapFor?.userId === userId) bootstrapFor = null;
+          })
+        };
+      }
+      return bootstrapFor.promise;
+    },
+    
+    async fetchBootstrap() {
+      // Render from the local cache first; the payload replaces it below.
+      await this.hydrateFromCache();
+      if (!this.isOnline) return;
+      
+      const { data, error } = await supabase.rpc('bootstrap', { page_size: BOOTSTRAP_PAGE_SIZE });
+      if (error) throw error;
+      
+      if (data.preferences) {
+        this.applyPreferences(data.preferences);
+      }
+      
+      if (this.pendingMutations === 0 && data.projects_complete) {
+        this.projects = data.projects;
+        this.loaded.projects = true;
+        offline.replaceAll('projects', this.projects);
+      } else {
+        this.applyLocalBatch('projects', 'upsert', data.projects);
+      }
+      this.applyLocalBatch('todos', 'upsert', data.todos);
+      
+      this.dashboardStats = data.stats;
+      statsFromBootstrap = true;
+    },
+    
+    async saveUserPreferences() {
+      if (!this.user) return;
+      
+      const { error } = await supabase
+        .from('user_preferences')
+        .upsert({
+          user_id: this.user.id,
+          theme: this.theme,
+          font: this.font
+        });
+        
+      if (error) {
+        console.error('Error saving user preferences:', error);
+      }
+    },
+    
+    // Keep isOnline current and replay the outbox as soon as we reconnect.
+    watchConnectivity() {
+      window.addEventListener('online', () => {
+        this.isOnline = true;
+        // Anything may have changed while we were away; refetch on next use.
+        this.loaded = { projects: false, tasks: false, todos: false };
+        this.syncOutbox();
+      });
+      window.addEventListener('offline', () => {
+        this.isOnline = false;
+      });
+    },
+    
+    // Apply writes confirmed in other tabs of the app.
+    watchOtherTabs() {
+      channel?.addEventListener('message', ({ data }) => {
+        if (data.userId === this.user?.id) {
+          this.applyLocalBatch(data.table, data.op, data.rows);
+        }
+      });
+    },
+    
+    // Fill the store from IndexedDB without touching the network.
+    async hydrateFromCache() {
+      const [cached, queued] = await Promise.all([
+        Promise.all(offline.CACHED_TABLES.map(table => offline.readAll(table))),
+        offline.pendingMutations()
+      ]);
+      offline.CACHED_TABLES.forEach((table, i) => {
+        if (!this[table].length) {
+          this[table] = cached[i].sort(byNewest);
+        }
+      });
+      this.pendingMutations = queued.length;
+    },
+    
+    // Load a collection once per session; later calls are free unless forced.
+    // Concurrent callers share one request.
+    async loadCollection(table, { force = false } = {}) {
+      if (!this.user) return;
+      
+      // The startup payload may already hold the whole collection.
+      await this.bootstrap();
+      if (this.loaded[table] && !force) return;
+      
+      if (!loadsInFlight.has(table)) {
+        loadsInFlight.set(table, this.fetchCollection(table).finally(() => {
+          loadsInFlight.delete(table);
+        }));
+      }
+      return loadsInFlight.get(table);
+    },
+    
+    async fetchCollection(table) {
+      // Serve whatever is cached right away, then refresh from the network.
+      if (!this[table].length) {
+        const cached = await offline.readAll(table);
+        if (cached.length && !this[table].length) {
+          this[table] = cached.sort(byNewest);
+        }
+      }
+      if (!this.isOnline) return;
+      
+      // Replay queued writes first so the refresh does not drop them.
+      await this.syncOutbox();
+      
+      const { data, error } = await supabase
+        .from(table)
+        .select('*')
+        .eq('user_id', this.user.id)
+        .order('created_at', { ascending: false });
+        
+      if (data && !error) {
+        this[table] = data.map(toClientRow);
+        this.loaded[table] = true;
+        offline.replaceAll(table, this[table]);
+      } else {
+        console.error(`Error loading ${table}:`, error);
+      }
+    },
+    
+    loadProjects() {
+      return this.loadCollection('projects');
+    },
+    
+    loadTasks() {
+      return this.loadCollection('tasks');
+    },
+    
+    loadTodos() {
+      return this.loadCollection('todos');
+    },
+    
+    // Aggregates are computed in the database; only the summary crosses the wire.
+    // The first call after startup reuses the counts from the bootstrap payload.
+    async loadDashboardStats({ force = false } = {}) {
+      if (!this.user) return;
+      
+      await this.bootstrap();
+      if (statsFromBootstrap && !force) {
+        statsFromBootstrap = false;
+        return;
+      }
+      statsFromBootstrap = false;
+      
+      const { data, error } = await supabase.rpc('dashboard_stats');
+      if (error) throw error;
+      this.dashboardStats = data;
+    },
+    
+    applyLocal(table, op, row) {
+      row = toClientRow(row);
+      if (op === 'insert') {
+        this[table] = [row, ...this[table].filter(r => r.id !== row.id)];
+        offline.putRow(table, row);
+      } else if (op === 'update') {
+        const index = this[table].findIndex(r => r.id === row.id);
+        if (index !== -1 && !isOlder(row, this[table][index])) {
+          this[table][index] = { ...this[table][index], ...row };
+          offline.putRow(table, { ...this[table][index] });
+        }
+      } else if (op === 'delete') {
+        this[table] = this[table].filter(r => r.id !== row.id);
+        offline.deleteRow(table, row.id);
+      }
+    },
+    
+    applyLocalBatch(table, op, rows) {
+      rows = rows.map(toClientRow);
+      if (op === 'delete') {
+        const ids = new Set(rows.map(row => row.id));
+        this[table] = this[table].filter(row => !ids.has(row.id));
+        offline.deleteRows(table, [...ids]);
+        return;
+      }
+      
+      const incoming = new Map(rows.map(row => [row.id, row]));
+      const merged = this[table].map(row => {
+        const next = incoming.get(row.id);
+        return next && !isOlder(next, row) ? { ...row, ...next } : row;
+      });
+      const known = new Set(this[table].map(row => row.id));
+      this[table] = [...rows.filter(row => !known.has(row.id)), ...merged];
+      offline.putRows(table, this[table].filter(row => incoming.has(row.id)));
+    },
+    
+    // Rows the server has confirmed: apply them here and in other open tabs.
+    applyServerRows(table, op, rows) {
+      this.applyLocalBatch(table, op, rows);
+      channel?.postMessage({ userId: this.user?.id, table, op, rows: rows.map(toClientRow) });
+    },
+    
+    // Bulk writes go out as one request per chunk. Offline, they fall back to
+    // per-row mutations so they land in the outbox like any other write.
+    async bulkUpsert(table, rows) {
+      if (!this.isOnline) {
+        for (const row of rows) {
+          const exists = this[table].some(r => r.id === row.id);
+          await this.mutate(table, exists ? 'update' : 'insert', row);
+        }
+        return;
+      }
+      
+      for (const part of chunked(rows)) {
+        const { data, error } = await supabase.from(table).upsert(part).select();
+        if (error) throw error;
+        this.applyServerRows(table, 'upsert', data);
+      }
+    },
+    
+    async bulkDelete(table, ids) {
+      if (!this.isOnline) {
+        for (const id of ids) {
+          await this.mutate(table, 'delete', { id });
+        }
+        return;
+      }
+      
+      for (const part of chunked(ids)) {
+        const { error } = await supabase.from(table).delete().in('id', part);
+        if (error) throw error;
+        this.applyServerRows(table, 'delete', part.map(id => ({ id })));
+      }
+    },
+    
+    async bulkSetStatus(table, ids, status) {
+      if (!this.isOnline) {
+        for (const id of ids) {
+          await this.mutate(table, 'update', { id, status });
+        }
+        return;
+      }
+      
+      const rpc = STATUS_RPC[table];
+      for (const part of chunked(ids)) {
+        const { data, error } = await supabase.rpc(rpc.name, { [rpc.ids]: part, new_status: status });
+        if (error) throw error;
+        this.applyServerRows(table, 'upsert', data);
+      }
+    },
+    
+    // Archived projects live in the partitioned project_archive table, so
+    // moving them in and out needs the server; there is no offline fallback.
+    async archiveProjects(ids) {
+      if (!this.isOnline) throw new Error('Archiving projects requires a connection');
+      
+      for (const part of chunked(ids)) {
+        const { error } = await supabase.rpc('archive_projects', { project_ids: part });
+        if (error) throw error;
+        this.applyServerRows('projects', 'delete', part.map(id => ({ id })));
+      }
+    },
+    
+    async restoreArchivedProjects(ids) {
+      if (!this.isOnline) throw new Error('Restoring projects requires a connection');
+      
+      for (const part of chunked(ids)) {
+        const { data, error } = await supabase.rpc('restore_archived_projects', { project_ids: part });
+        if (error) throw error;
+        this.applyServerRows('projects', 'upsert', data);
+      }
+    },
+    
+    async deleteArchivedProjects(ids) {
+      for (const part of chunked(ids)) {
+        const { error } = await supabase.from('project_archive').delete().in('id', part);
+        if (error) throw error;
+      }
+    },
+    
+    // One page of the archive, newest first unless `ascending`. Pages are
+    // keyed on (completed_at, id) rather than offsets so deep pages stay cheap.
+    async loadArchivePage({ status = null, search = '', ascending = false, cursor = null, pageSize = 50 } = {}) {
+      if (!this.user) return { rows: [], cursor: null };
+      
+      let query = supabase
+        .from('project_archive')
+        .select('id, name, description, status, due_date, created_at, completed_at')
+        .eq('user_id', this.user.id)
+        .order('completed_at', { ascending })
+        .order('id', { ascending })
+        .limit(pageSize + 1);
+      
+      if (status) query = query.eq('status', status);
+      if (search) query = query.ilike('name', `%${search.replace(/[%_\\\\]/g, '\\\\$&')}%`);
+      if (cursor) {
+        const op = ascending ? 'gt' : 'lt';
+        const at = `"${cursor.completed_at}"`;
+        query = query.or(`completed_at.${op}.${at},and(completed_at.eq.${at},id.${op}.${cursor.id})`);
+      }
+      
+      const { data, error } = await query;
+      if (error) throw error;
+      
+      const rows = data.slice(0, pageSize);
+      const last = rows[rows.length - 1];
+      return {
+        rows,
+        cursor: data.length > pageSize ? { completed_at: last.completed_at, id: last.id } : null
+      };
+    },
+    
+    // Move auto-classified tasks whose deadline has come close. Only the
+    // rows that changed quadrant come back.
+    async refreshQuadrants() {
+      if (!this.user || !this.isOnline) return;
+      
+      const { data, error } = await supabase.rpc('refresh_task_quadrants');
+      if (error) throw error;
+      if (data.length) this.applyServerRows('tasks', 'upsert', data);
+    },
+    
+    // Turn due-date classification on or off for every task in one request.
+    async setAutoQuadrant(enabled) {
+      if (!this.isOnline) throw new Error('Changing classification mode requires a connection');
+      
+      const { data, error } = await supabase
+        .from('tasks')
+        .update({ auto_quadrant: enabled })
+        .eq('user_id', this.user.id)
+        .neq('auto_quadrant', enabled)
+        .select();
+      if (error) throw error;
+      this.applyServerRows('tasks', 'upsert', data);
+    },
+    
+    // Ranked matches across projects, tasks, todos and the archive. Pass an
+    // AbortSignal so a newer query can cancel one still in flight.
+    async search(query, { signal, limit = 20 } = {}) {
+      let request = supabase.rpc('search_all', { search_query: query, max_results: limit });
+      if (signal) request = request.abortSignal(signal);
+      
+      const { data, error } = await request;
+      if (error) throw error;
+      return data;
+    },
+    
+    // Apply a write locally, then send it or queue it while offline.
+    // Inserts must carry a client-generated id so they can be replayed.
+    async mutate(table, op, row) {
+      const previous = this[table].find(r => r.id === row.id);
+      const mutation = { table, op, row, baseVersion: previous?.version ?? null };
+      this.applyLocal(table, op, row);
+      
+      if (!this.isOnline) {
+        await offline.enqueue(mutation);
+        this.pendingMutations += 1;
+        return { queued: true };
+      }
+      
+      const result = await this.sendMutation(mutation);
+      if (result.error) {
+        // Roll back the optimistic change.
+        if (op === 'insert') {
+          this.applyLocal(table, 'delete', row);
+        } else if (previous) {
+          this.applyLocal(table, 'insert', previous);
+          this[table].sort(byNewest);
+        }
+        throw result.error;
       }
+      return result;
     },
     
-    async saveUserPreferences() {
-      if (!this.user) return;
+    async sendMutation({ table, op, row, baseVersion }) {
+      if (op === 'insert') {
+        const { data, error } = await supabase.from(table).upsert(row).select().single();
+        if (!error) this.applyServerRows(table, 'upsert', [data]);
+        return { data, error };
+      }
       
-      const { error } = await supabase
-        .from('user_preferences')
-        .upsert({
-          user_id: this.user.id,
-          theme: this.theme,
-          font: this.font
-        });
-        
-      if (error) {
-        console.error('Error saving user preferences:', error);
+      if (op === 'update') {
+        let query = supabase.from(table).update(withoutServerColumns(row)).eq('id', row.id);
+        if (baseVersion !== null) {
+          query = query.eq('version', baseVersion);
+        }
+        const { data, error } = await query.select();
+        if (error) return { error };
+        if (data.length === 0) {
+          return this.resolveConflict(table, row);
+        }
+        this.applyServerRows(table, 'upsert', [data[0]]);
+        return { data: data[0] };
       }
+      
+      const { error } = await supabase.from(table).delete().eq('id', row.id);
+      if (!error) this.applyServerRows(table, 'delete', [row]);
+      return { error };
     },
     
-    async loadProjects() {
-      if (!this.user) return;
+    // The row changed on the server since we last saw it: keep the server copy
+    // and record the local edit so the UI can offer to re-apply it.
+    async resolveConflict(table, row) {
+      const { data, error } = await supabase.from(table).select('*').eq('id', row.id).maybeSingle();
+      if (error) return { error };
       
-      const { data, error } = await supabase
-        .from('projects')
-        .select('*')
-        .eq('user_id', this.user.id)
-        .order('created_at', { ascending: false });
-        
-      if (data && !error) {
-        this.projects = data;
+      this.conflicts.push({ table, local: row, server: data });
+      if (data) {
+        this.applyServerRows(table, 'upsert', [data]);
       } else {
-        console.error('Error loading projects:', error);
+        this.applyServerRows(table, 'delete', [row]);
       }
+      return { data, conflict: true };
     },
     
-    async loadTodos() {
-      if (!this.user) return;
-      
-      const { data, error } = await supabase
-        .from('todos')
-        .select('*')
-        .eq('user_id', this.user.id)
-        .order('created_at', { ascending: false });
+    // Send a conflicting local edit again, on top of the server's current row.
+    async reapplyConflict(conflict) {
+      this.dismissConflict(conflict);
+      if (!conflict.server) return null;
+      return this.mutate(conflict.table, 'update', conflict.local);
+    },
+    
+    dismissConflict(conflict) {
+      this.conflicts = this.conflicts.filter(c => c !== conflict);
+    },
+    
+    syncOutbox() {
+      if (!syncInFlight) {
+        syncInFlight = this.replayOutbox().finally(() => {
+          syncInFlight = null;
+        });
+      }
+      return syncInFlight;
+    },
+    
+    async replayOutbox() {
+      const queued = await offline.pendingMutations();
+      for (const mutation of queued) {
+        if (!navigator.onLine) break;
         
-      if (data && !error) {
-        this.todos = data;
-      } else {
-        console.error('Error loading todos:', error);
+        const result = await this.sendMutation(mutation);
+        if (result.error) {
+          console.error('Error replaying queued change:', result.error);
+          // Transient failures stay queued; rejected writes are dropped.
+          if (!navigator.onLine || !result.error.code) break;
+        }
+        await offline.dequeue(mutation.seq);
+        
+        // Later offline edits to this row were queued against the version this
+        // one replaced; move them onto the version it produced so they are not
+        // mistaken for conflicts with our own earlier edit.
+        if (!result.error && !result.conflict && result.data?.version !== undefined) {
+          for (const later of queued) {
+            if (later.seq > mutation.seq && later.op === 'update' &&
+                later.table === mutation.table && later.row.id === mutation.row.id) {
+              later.baseVersion = result.data.version;
+              await offline.requeue(later);
+            }
+          }
+        }
       }
+      this.pendingMutations = (await offline.pendingMutations()).length;
     }
   }
 })
+"""
+
+    def _get_offline_db_content(self) -> str:
+        return """// IndexedDB persistence for the store: cached rows per table plus an outbox
+// of mutations made while offline.
+const DB_NAME = 'trackit';
+const DB_VERSION = 1;
+const OUTBOX = 'outbox';
+
+export const CACHED_TABLES = ['projects', 'tasks', 'todos'];
+
+let dbPromise = null;
+
+const openDb = () => {
+  if (!dbPromise) {
+    dbPromise = new Promise((resolve, reject) => {
+      const request = indexedDB.open(DB_NAME, DB_VERSION);
+      
+      request.onupgradeneeded = () => {
+        const db = request.result;
+        CACHED_TABLES.forEach(table => {
+          if (!db.objectStoreNames.contains(table)) {
+            db.createObjectStore(table, { keyPath: 'id' });
+          }
+        });
+        if (!db.objectStoreNames.contains(OUTBOX)) {
+          db.createObjectStore(OUTBOX, { keyPath: 'seq', autoIncrement: true });
+        }
+      };
+      request.onsuccess = () => resolve(request.result);
+      request.onerror = () => reject(request.error);
+    });
+  }
+  return dbPromise;
+};
+
+// Run `work` inside a transaction and resolve with its request's result once
+// the transaction has committed.
+const run = async (storeNames, mode, work) => {
+  const db = await openDb();
+  return new Promise((resolve, reject) => {
+    const tx = db.transaction(storeNames, mode);
+    const request = work(tx);
+    tx.oncomplete = () => resolve(request ? request.result : undefined);
+    tx.onerror = () => reject(tx.error);
+    tx.onabort = () => reject(tx.error);
+  });
+};
+
+export const readAll = (table) =>
+  run(table, 'readonly', tx => tx.objectStore(table).getAll());
+
+export const replaceAll = (table, rows) =>
+  run(table, 'readwrite', tx => {
+    const store = tx.objectStore(table);
+    store.clear();
+    rows.forEach(row => store.put(row));
+  });
+
+export const putRow = (table, row) =>
+  run(table, 'readwrite', tx => tx.objectStore(table).put(row));
+
+export const deleteRow = (table, id) =>
+  run(table, 'readwrite', tx => tx.objectStore(table).delete(id));
+
+export const enqueue = (mutation) =>
+  run(OUTBOX, 'readwrite', tx => tx.objectStore(OUTBOX).add({ ...mutation, queued_at: Date.now() }));
+
+export const pendingMutations = () =>
+  run(OUTBOX, 'readonly', tx => tx.objectStore(OUTBOX).getAll());
+
+export const dequeue = (seq) =>
+  run(OUTBOX, 'readwrite', tx => tx.objectStore(OUTBOX).delete(seq));
+
+export const requeue = (mutation) =>
+  run(OUTBOX, 'readwrite', tx => tx.objectStore(OUTBOX).put(mutation));
+
+export const putRows = (table, rows) =>
+  run(table, 'readwrite', tx => {
+    const store = tx.objectStore(table);
+    rows.forEach(row => store.put(row));
+  });
+
+export const deleteRows = (table, ids) =>
+  run(table, 'readwrite', tx => {
+    const store = tx.objectStore(table);
+    ids.forEach(id => store.delete(id));
+  });
+
+export const clearAll = () =>
+  run([...CACHED_TABLES, OUTBOX], 'readwrite', tx => {
+    [...CACHED_TABLES, OUTBOX].forEach(name => tx.objectStore(name).clear());
+  });
+"""
+
+    def _get_initial_schema_sql_content(self) -> str:
+        return """-- TrackIt 2.0 base schema.
+-- Every synced table carries updated_at and a version counter bumped on each
+-- update; the offline outbox uses the version to detect conflicting edits.
+
+create extension if not exists pgcrypto;
+
+create or replace function public.touch_row()
+returns trigger
+language plpgsql
+as $$
+begin
+  new.updated_at := now();
+  new.version := old.version + 1;
+  return new;
+end;
+$$;
+
+create table if not exists public.user_preferences (
+  user_id uuid primary key references auth.users (id) on delete cascade,
+  theme text,
+  font text,
+  updated_at timestamptz not null default now()
+);
+
+create table if not exists public.projects (
+  id uuid primary key default gen_random_uuid(),
+  user_id uuid not null references auth.users (id) on delete cascade,
+  name text not null,
+  description text not null default '',
+  due_date date,
+  status text not null default 'Not Started',
+  progress integer not null default 0 check (progress between 0 and 100),
+  completed_at timestamptz,
+  created_at timestamptz not null default now(),
+  updated_at timestamptz not null default now(),
+  version integer not null default 1
+);
+
+create table if not exists public.tasks (
+  id uuid primary key default gen_random_uuid(),
+  user_id uuid not null references auth.users (id) on delete cascade,
+  project_id uuid references public.projects (id) on delete cascade,
+  title text not null,
+  description text not null default '',
+  status text not null default 'todo',
+  priority text not null default 'Medium',
+  due_date date,
+  created_at timestamptz not null default now(),
+  updated_at timestamptz not null default now(),
+  version integer not null default 1
+);
+
+create table if not exists public.todos (
+  id uuid primary key default gen_random_uuid(),
+  user_id uuid not null references auth.users (id) on delete cascade,
+  text text not null,
+  completed boolean not null default false,
+  created_at timestamptz not null default now(),
+  updated_at timestamptz not null default now(),
+  version integer not null default 1
+);
+
+create index if not exists projects_user_created_idx on public.projects (user_id, created_at desc);
+create index if not exists tasks_user_created_idx on public.tasks (user_id, created_at desc);
+create index if not exists todos_user_created_idx on public.todos (user_id, created_at desc);
+
+create trigger projects_touch before update on public.projects
+  for each row execute function public.touch_row();
+create trigger tasks_touch before update on public.tasks
+  for each row execute function public.touch_row();
+create trigger todos_touch before update on public.todos
+  for each row execute function public.touch_row();
+
+alter table public.user_preferences enable row level security;
+alter table public.projects enable row level security;
+alter table public.tasks enable row level security;
+alter table public.todos enable row level security;
+
+create policy "Users manage their preferences" on public.user_preferences
+  for all using (auth.uid() = user_id) with check (auth.uid() = user_id);
+create policy "Users manage their projects" on public.projects
+  for all using (auth.uid() = user_id) with check (auth.uid() = user_id);
+create policy "Users manage their tasks" on public.tasks
+  for all using (auth.uid() = user_id) with check (auth.uid() = user_id);
+create policy "Users manage their todos" on public.todos
+  for all using (auth.uid() = user_id) with check (auth.uid() = user_id);
+"""
+
+    def _get_bulk_status_sql_content(self) -> str:
+        return """-- Bulk status transitions: one statement for any number of rows.
+-- security invoker keeps the row level security policies in force.
+
+create or replace function public.set_project_status(project_ids uuid[], new_status text)
+returns setof public.projects
+language sql
+security invoker
+as $$
+  update public.projects
+     set status = new_status,
+         completed_at = case
+           when new_status in ('Completed', 'Archived') then coalesce(completed_at, now())
+           else null
+         end
+   where id = any(project_ids)
+  returning *;
+$$;
+
+create or replace function public.set_task_status(task_ids uuid[], new_status text)
+returns setof public.tasks
+language sql
+security invoker
+as $$
+  update public.tasks
+     set status = new_status
+   where id = any(task_ids)
+  returning *;
+$$;
+"""
+
+    def _get_dashboard_stats_sql_content(self) -> str:
+        header = """-- Per-user aggregates for the Dashboard page, returned by one RPC call.
+
+create index if not exists projects_user_status_idx on public.projects (user_id, status);
+create index if not exists tasks_user_status_idx on public.tasks (user_id, status);
+create index if not exists tasks_open_due_idx on public.tasks (user_id, due_date) where status <> 'done';
+create index if not exists projects_open_due_idx on public.projects (user_id, due_date)
+  where status not in ('Completed', 'Archived');
+create index if not exists todos_open_idx on public.todos (user_id) where not completed;
+"""
+        # Overdue counts depend on the clock, so they always come from the
+        # partial indexes above; they only scan the user's open rows.
+        overdue = """    'overdue_projects', (
+      select count(*) from public.projects
+       where user_id = auth.uid() and status not in ('Completed', 'Archived') and due_date < current_date
+    ),
+    'overdue_tasks', (
+      select count(*) from public.tasks
+       where user_id = auth.uid() and status <> 'done' and due_date < current_date
+    ),
+    'open_todos', (
+      select count(*) from public.todos where user_id = auth.uid() and not completed
+    )"""
+        if not self.dashboard_summary_tables:
+            return header + """
+create or replace function public.dashboard_stats()
+returns json
+language sql
+stable
+security invoker
+as $$
+  select json_build_object(
+    'projects_by_status', coalesce((
+      select json_object_agg(status, n)
+        from (select status, count(*) as n from public.projects where user_id = auth.uid() group by status) s
+    ), '{}'::json),
+    'tasks_by_status', coalesce((
+      select json_object_agg(status, n)
+        from (select status, count(*) as n from public.tasks where user_id = auth.uid() group by status) s
+    ), '{}'::json),
+    'average_progress', (
+      select coalesce(round(avg(progress)), 0) from public.projects
+       where user_id = auth.uid() and status not in ('Completed', 'Archived')
+    ),
+""" + overdue + """
+  );
+$$;
+"""
+        return header + """
+-- Counts and progress sums per (user, scope, status), kept current by
+-- statement-level triggers so dashboard_stats never scans the base tables.
+create table if not exists public.user_stats (
+  user_id uuid not null references auth.users (id) on delete cascade,
+  scope text not null check (scope in ('project', 'task')),
+  status text not null,
+  item_count bigint not null default 0,
+  progress_sum bigint not null default 0,
+  primary key (user_id, scope, status)
+);
+
+alter table public.user_stats enable row level security;
+
+create policy "Users read their stats" on public.user_stats
+  for select using (auth.uid() = user_id);
+
+create or replace function public.add_user_stats(deltas public.user_stats[])
+returns void
+language sql
+security definer
+set search_path = public
+as $$
+  insert into public.user_stats (user_id, scope, status, item_count, progress_sum)
+  select user_id, scope, status, sum(item_count), sum(progress_sum)
+    from unnest(deltas)
+   group by user_id, scope, status
+  on conflict (user_id, scope, status) do update
+    set item_count = user_stats.item_count + excluded.item_count,
+        progress_sum = user_stats.progress_sum + excluded.progress_sum;
+$$;
+
+-- Only the stats triggers (running as the owner) may write deltas.
+revoke execute on function public.add_user_stats(public.user_stats[]) from public, anon, authenticated;
+
+create or replace function public.track_project_stats()
+returns trigger
+language plpgsql
+security definer
+set search_path = public
+as $$
+declare
+  deltas public.user_stats[];
+begin
+  if tg_op = 'INSERT' then
+    select array_agg(row(user_id, 'project', status, 1, progress)::public.user_stats) into deltas from new_rows;
+  elsif tg_op = 'DELETE' then
+    select array_agg(row(user_id, 'project', status, -1, -progress)::public.user_stats) into deltas from old_rows;
+  else
+    select array_agg(d) into deltas from (
+      select row(user_id, 'project', status, -1, -progress)::public.user_stats as d from old_rows
+      union all
+      select row(user_id, 'project', status, 1, progress)::public.user_stats from new_rows
+    ) changes;
+  end if;
+  if deltas is not null then
+    perform public.add_user_stats(deltas);
+  end if;
+  return null;
+end;
+$$;
+
+create or replace function public.track_task_stats()
+returns trigger
+language plpgsql
+security definer
+set search_path = public
+as $$
+declare
+  deltas public.user_stats[];
+begin
+  if tg_op = 'INSERT' then
+    select array_agg(row(user_id, 'task', status, 1, 0)::public.user_stats) into deltas from new_rows;
+  elsif tg_op = 'DELETE' then
+    select array_agg(row(user_id, 'task', status, -1, 0)::public.user_stats) into deltas from old_rows;
+  else
+    select array_agg(d) into deltas from (
+      select row(user_id, 'task', status, -1, 0)::public.user_stats as d from old_rows
+      union all
+      select row(user_id, 'task', status, 1, 0)::public.user_stats from new_rows
+    ) changes;
+  end if;
+  if deltas is not null then
+    perform public.add_user_stats(deltas);
+  end if;
+  return null;
+end;
+$$;
+
+create trigger projects_stats_insert after insert on public.projects
+  referencing new table as new_rows
+  for each statement execute function public.track_project_stats();
+create trigger projects_stats_update after update on public.projects
+  referencing old table as old_rows new table as new_rows
+  for each statement execute function public.track_project_stats();
+create trigger projects_stats_delete after delete on public.projects
+  referencing old table as old_rows
+  for each statement execute function public.track_project_stats();
+
+create trigger tasks_stats_insert after insert on public.tasks
+  referencing new table as new_rows
+  for each statement execute function public.track_task_stats();
+create trigger tasks_stats_update after update on public.tasks
+  referencing old table as old_rows new table as new_rows
+  for each statement execute function public.track_task_stats();
+create trigger tasks_stats_delete after delete on public.tasks
+  referencing old table as old_rows
+  for each statement execute function public.track_task_stats();
+
+-- Backfill from the existing rows.
+insert into public.user_stats (user_id, scope, status, item_count, progress_sum)
+select user_id, 'project', status, count(*), sum(progress) from public.projects group by user_id, status
+union all
+select user_id, 'task', status, count(*), 0 from public.tasks group by user_id, status
+on conflict (user_id, scope, status) do update
+  set item_count = excluded.item_count, progress_sum = excluded.progress_sum;
+
+create or replace function public.dashboard_stats()
+returns json
+language sql
+stable
+security invoker
+as $$
+  select json_build_object(
+    'projects_by_status', coalesce((
+      select json_object_agg(status, item_count) from public.user_stats
+       where user_id = auth.uid() and scope = 'project' and item_count > 0
+    ), '{}'::json),
+    'tasks_by_status', coalesce((
+      select json_object_agg(status, item_count) from public.user_stats
+       where user_id = auth.uid() and scope = 'task' and item_count > 0
+    ), '{}'::json),
+    'average_progress', (
+      select coalesce(round(sum(progress_sum)::numeric / nullif(sum(item_count), 0)), 0)
+        from public.user_stats
+       where user_id = auth.uid() and scope = 'project' and status not in ('Completed', 'Archived')
+    ),
+""" + overdue + """
+  );
+$$;
+"""
+
+    def _get_project_archive_sql_content(self) -> str:
+        return """-- Archive for completed/archived projects, range-partitioned by completion
+-- month. History pages are keyset-paginated on (user_id, completed_at, id),
+-- so each page costs the same however many years of archive a user has.
+
+create extension if not exists pg_trgm;
+
+create table if not exists public.project_archive (
+  id uuid not null,
+  user_id uuid not null references auth.users (id) on delete cascade,
+  name text not null,
+  description text not null default '',
+  due_date date,
+  status text not null check (status in ('Completed', 'Archived')),
+  progress integer not null default 0,
+  -- Tasks are removed with their project; keep them so a restore brings them back.
+  tasks jsonb not null default '[]',
+  created_at timestamptz not null,
+  completed_at timestamptz not null,
+  archived_at timestamptz not null default now(),
+  primary key (completed_at, id)
+) partition by range (completed_at);
+
+-- Catches rows outside the pre-created months; archive_projects creates the
+-- month's partition first, so this normally stays empty.
+create table if not exists public.project_archive_default
+  partition of public.project_archive default;
+
+create index if not exists project_archive_page_idx
+  on public.project_archive (user_id, completed_at desc, id desc);
+create index if not exists project_archive_status_page_idx
+  on public.project_archive (user_id, status, completed_at desc, id desc);
+create index if not exists project_archive_name_trgm_idx
+  on public.project_archive using gin (name gin_trgm_ops);
+
+alter table public.project_archive enable row level security;
+
+create policy "Users read their archive" on public.project_archive
+  for select using (auth.uid() = user_id);
+create policy "Users delete from their archive" on public.project_archive
+  for delete using (auth.uid() = user_id);
+
+create or replace function public.ensure_archive_partition(month_start date)
+returns void
+language plpgsql
+security definer
+set search_path = public
+as $$
+declare
+  first_day date := date_trunc('month', month_start)::date;
+  partition_name text := format('project_archive_%s', to_char(first_day, 'YYYY_MM'));
+begin
+  perform pg_advisory_xact_lock(hashtext(partition_name));
+  if to_regclass(format('public.%I', partition_name)) is null then
+    execute format(
+      'create table public.%I partition of public.project_archive for values from (%L) to (%L)',
+      partition_name, first_day, (first_day + interval '1 month')::date
+    );
+  end if;
+end;
+$$;
+
+-- Partitions are created by archive_projects and this migration only.
+revoke execute on function public.ensure_archive_partition(date) from public, anon, authenticated;
+
+select public.ensure_archive_partition(month::date)
+  from generate_series(
+    date_trunc('month', now()) - interval '24 months',
+    date_trunc('month', now()) + interval '3 months',
+    interval '1 month'
+  ) as month;
+
+-- Move projects (and a snapshot of their tasks) into the archive.
+create or replace function public.archive_projects(project_ids uuid[])
+returns setof public.project_archive
+language plpgsql
+security definer
+set search_path = public
+as $$
+declare
+  month date;
+begin
+  for month in
+    select distinct date_trunc('month', coalesce(completed_at, now()))::date
+      from public.projects
+     where id = any(project_ids) and user_id = auth.uid()
+  loop
+    perform public.ensure_archive_partition(month);
+  end loop;
+  
+  return query
+  with moved as (
+    delete from public.projects
+     where id = any(project_ids) and user_id = auth.uid()
+    returning *
+  )
+  insert into public.project_archive
+    (id, user_id, name, description, due_date, status, progress, tasks, created_at, completed_at)
+  select m.id, m.user_id, m.name, m.description, m.due_date,
+         case when m.status = 'Completed' then 'Completed' else 'Archived' end,
+         m.progress,
+         coalesce((select jsonb_agg(to_jsonb(t)) from public.tasks t where t.project_id = m.id), '[]'),
+         m.created_at,
+         coalesce(m.completed_at, now())
+    from moved m
+  returning *;
+end;
+$$;
+
+-- Move archived projects back into projects, with their tasks.
+create or replace function public.restore_archived_projects(project_ids uuid[])
+returns setof public.projects
+language plpgsql
+security definer
+set search_path = public
+as $$
+begin
+  return query
+  insert into public.projects (id, user_id, name, description, due_date, status, progress, created_at)
+  select id, user_id, name, description, due_date, 'In Progress', progress, created_at
+    from public.project_archive
+   where id = any(project_ids) and user_id = auth.uid()
+  returning *;
+  
+  insert into public.tasks
+  select t.*
+    from public.project_archive a
+   cross join lateral jsonb_populate_recordset(null::public.tasks, a.tasks) t
+   where a.id = any(project_ids) and a.user_id = auth.uid();
+  
+  delete from public.project_archive
+   where id = any(project_ids) and user_id = auth.uid();
+end;
+$$;
+"""
+
+    def _get_full_text_search_sql_content(self) -> str:
+        return """-- Full-text search over projects, tasks, todos and the project archive.
+-- Each table gets a generated tsvector column and a (user_id, fts) GIN index,
+-- so a search only walks the signed-in user's postings however many rows
+-- other users have.
+
+create extension if not exists btree_gin;
+
+alter table public.projects add column if not exists fts tsvector
+  generated always as (
+    setweight(to_tsvector('english', coalesce(name, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce(description, '')), 'B')
+  ) stored;
+
+alter table public.tasks add column if not exists fts tsvector
+  generated always as (
+    setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce(description, '')), 'B')
+  ) stored;
+
+alter table public.todos add column if not exists fts tsvector
+  generated always as (to_tsvector('english', coalesce(text, ''))) stored;
+
+alter table public.project_archive add column if not exists fts tsvector
+  generated always as (
+    setweight(to_tsvector('english', coalesce(name, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce(description, '')), 'B')
+  ) stored;
+
+create index if not exists projects_fts_idx on public.projects using gin (user_id, fts);
+create index if not exists tasks_fts_idx on public.tasks using gin (user_id, fts);
+create index if not exists todos_fts_idx on public.todos using gin (user_id, fts);
+create index if not exists project_archive_fts_idx on public.project_archive using gin (user_id, fts);
+
+-- Ranked matches across every searchable table. Runs as the caller, so row
+-- level security applies on top of the explicit user filter.
+create or replace function public.search_all(search_query text, max_results integer default 20)
+returns table (kind text, id uuid, title text, detail text, rank real)
+language sql
+stable
+set search_path = public
+as $$
+  with q as (select websearch_to_tsquery('english', search_query) as query)
+  select * from (
+    (select 'project', p.id, p.name, p.description, ts_rank(p.fts, q.query)
+       from public.projects p, q
+      where p.user_id = auth.uid() and p.fts @@ q.query
+      order by 5 desc limit max_results)
+    union all
+    (select 'task', t.id, t.title, t.description, ts_rank(t.fts, q.query)
+       from public.tasks t, q
+      where t.user_id = auth.uid() and t.fts @@ q.query
+      order by 5 desc limit max_results)
+    union all
+    (select 'todo', d.id, d.text, '', ts_rank(d.fts, q.query)
+       from public.todos d, q
+      where d.user_id = auth.uid() and d.fts @@ q.query
+      order by 5 desc limit max_results)
+    union all
+    (select 'archive', a.id, a.name, a.description, ts_rank(a.fts, q.query)
+       from public.project_archive a, q
+      where a.user_id = auth.uid() and a.fts @@ q.query
+      order by 5 desc limit max_results)
+  ) as matches (kind, id, title, detail, rank)
+  order by rank desc
+  limit max_results;
+$$;
+
+-- Archived task snapshots now carry the generated column, which cannot be
+-- inserted; restore with an explicit column list instead.
+create or replace function public.restore_archived_projects(project_ids uuid[])
+returns setof public.projects
+language plpgsql
+security definer
+set search_path = public
+as $$
+begin
+  return query
+  insert into public.projects (id, user_id, name, description, due_date, status, progress, created_at)
+  select id, user_id, name, description, due_date, 'In Progress', progress, created_at
+    from public.project_archive
+   where id = any(project_ids) and user_id = auth.uid()
+  returning *;
+  
+  insert into public.tasks
+    (id, user_id, project_id, title, description, status, priority, due_date, created_at, updated_at, version)
+  select t.id, t.user_id, t.project_id, t.title, t.description, t.status, t.priority,
+         t.due_date, t.created_at, t.updated_at, t.version
+    from public.project_archive a
+   cross join lateral jsonb_populate_recordset(null::public.tasks, a.tasks) t
+   where a.id = any(project_ids) and a.user_id = auth.uid();
+  
+  delete from public.project_archive
+   where id = any(project_ids) and user_id = auth.uid();
+end;
+$$;
+"""
+
+    def _get_task_quadrants_sql_content(self) -> str:
+        return """-- Priority matrix: a persisted quadrant per task, plus an optional mode
+-- where urgency comes from due_date instead of manual placement.
+
+alter table public.tasks add column if not exists important boolean not null default false;
+alter table public.tasks add column if not exists auto_quadrant boolean not null default false;
+alter table public.tasks add column if not exists quadrant text
+  check (quadrant in ('urgent-important', 'important-not-urgent', 'urgent-not-important', 'not-urgent-not-important'));
+
+-- A task is urgent once it is open and due within two days.
+create or replace function public.classify_task(due date, important boolean, status text)
+returns text
+language sql
+stable
+as $$
+  select case
+    when status <> 'done' and due is not null and due <= current_date + 2 then
+      case when important then 'urgent-important' else 'urgent-not-important' end
+    when important then 'important-not-urgent'
+    else 'not-urgent-not-important'
+  end;
+$$;
+
+-- Where auto-classified tasks belong today.
+create or replace view public.task_quadrants
+with (security_invoker = true) as
+  select id, user_id, quadrant, public.classify_task(due_date, important, status) as computed_quadrant
+    from public.tasks
+   where auto_quadrant;
+
+create index if not exists tasks_auto_quadrant_idx on public.tasks (user_id) where auto_quadrant;
+
+-- Writes that change the inputs reclassify the row in the same statement.
+create or replace function public.classify_task_row()
+returns trigger
+language plpgsql
+as $$
+begin
+  if new.auto_quadrant or new.quadrant is null then
+    new.quadrant := public.classify_task(new.due_date, new.important, new.status);
+  end if;
+  return new;
+end;
+$$;
+
+create trigger tasks_classify before insert or update of due_date, important, status, quadrant, auto_quadrant
+  on public.tasks
+  for each row execute function public.classify_task_row();
+
+update public.tasks set quadrant = public.classify_task(due_date, important, status) where quadrant is null;
+
+-- Only the passage of time is left: move tasks whose deadline has come
+-- close. Rows already in the right quadrant are not touched, so the caller
+-- gets back (and syncs) just the tasks that moved.
+create or replace function public.refresh_task_quadrants()
+returns setof public.tasks
+language sql
+set search_path = public
+as $$
+  update public.tasks t
+     set quadrant = q.computed_quadrant
+    from public.task_quadrants q
+   where t.id = q.id
+     and t.user_id = auth.uid()
+     and q.quadrant is distinct from q.computed_quadrant
+  returning t.*;
+$$;
+
+-- Archived snapshots predate these columns; restore them with defaults.
+create or replace function public.restore_archived_projects(project_ids uuid[])
+returns setof public.projects
+language plpgsql
+security definer
+set search_path = public
+as $$
+begin
+  return query
+  insert into public.projects (id, user_id, name, description, due_date, status, progress, created_at)
+  select id, user_id, name, description, due_date, 'In Progress', progress, created_at
+    from public.project_archive
+   where id = any(project_ids) and user_id = auth.uid()
+  returning *;
+  
+  insert into public.tasks
+    (id, user_id, project_id, title, description, status, priority, due_date, created_at, updated_at, version,
+     important, auto_quadrant, quadrant)
+  select t.id, t.user_id, t.project_id, t.title, t.description, t.status, t.priority,
+         t.due_date, t.created_at, t.updated_at, t.version,
+         coalesce(t.important, false), coalesce(t.auto_quadrant, false), t.quadrant
+    from public.project_archive a
+   cross join lateral jsonb_populate_recordset(null::public.tasks, a.tasks) t
+   where a.id = any(project_ids) and a.user_id = auth.uid();
+  
+  delete from public.project_archive
+   where id = any(project_ids) and user_id = auth.uid();
+end;
+$$;
+"""
+
+    def _get_bootstrap_sql_content(self) -> str:
+        return """-- Startup payload: everything the first screen needs in one round trip.
+
+create index if not exists todos_user_open_idx on public.todos (user_id, created_at desc) where not completed;
+
+create or replace function public.bootstrap(page_size integer default 50)
+returns json
+language sql
+stable
+security invoker
+set search_path = public
+as $$
+  select json_build_object(
+    'preferences', (
+      select json_build_object('theme', theme, 'font', font)
+        from public.user_preferences
+       where user_id = auth.uid()
+    ),
+    'projects', coalesce((
+      select json_agg(to_jsonb(p) - 'fts' order by p.created_at desc)
+        from (
+          select *
+            from public.projects
+           where user_id = auth.uid()
+           order by created_at desc
+           limit page_size
+        ) p
+    ), '[]'),
+    -- True when the page above is every project the user has.
+    'projects_complete', (
+      select count(*) <= page_size
+        from (
+          select 1 from public.projects where user_id = auth.uid() limit page_size + 1
+        ) x
+    ),
+    'todos', coalesce((
+      select json_agg(to_jsonb(t) - 'fts' order by t.created_at desc)
+        from public.todos t
+       where t.user_id = auth.uid() and not t.completed
+    ), '[]'),
+    'stats', public.dashboard_stats()
+  );
+$$;
 """
 
     def _get_supabase_client_content(self) -> str:
-        return """import { createClient } from '@supabase/supabase-js'
+        if self.runtime_config:
+            settings = """import { config } from '@/config'
 
+const supabaseUrl = config.supabaseUrl
+const supabaseAnonKey = config.supabaseAnonKey
+"""
+        else:
+            settings = """
 const supabaseUrl = import.meta.env.VITE_SUPABASE_URL
 const supabaseAnonKey = import.meta.env.VITE_SUPABASE_ANON_KEY
-
-export const supabase = createClient(supabaseUrl, supabaseAnonKey)
+"""
+        return """import { createClient } from '@supabase/supabase-js'
+""" + settings + self._get_client_fetch_wrapper() + """
+export const supabase = createClient(supabaseUrl, supabaseAnonKey, {
+  global: { fetch: clientFetch }
+})
 """
 
-    def _get_themes_css_content(self) -> str:
-        return """/* Theme Variables */
-
-/* Light Themes */
-.ocean-breeze {
-  --color-primary: #38bdf8;
-  --color-secondary: #0ea5e9;
-  --color-accent: #0284c7;
-  --color-background: #f0f9ff;
-  --color-text: #0f172a;
-  --font-body: 'Inter', sans-serif;
-  --font-heading: 'Montserrat', sans-serif;
+    def _get_client_fetch_wrapper(self) -> str:
+        """fetch used by the Supabase client: dedup, concurrency cap, retries, timing hooks."""
+        return """
+// All Supabase traffic goes through clientFetch, so pages keep using the
+// plain client while getting:
+// - identical in-flight GETs shared instead of sent twice,
+// - at most MAX_CONCURRENT requests on the wire,
+// - retries with exponential backoff and full jitter for transient failures
+//   of idempotent requests,
+// - a timing event per request for onQuery listeners.
+const MAX_CONCURRENT = 6
+const MAX_RETRIES = 3
+const BASE_DELAY_MS = 200
+const MAX_DELAY_MS = 5000
+const RETRYABLE_STATUS = new Set([408, 425, 429, 500, 502, 503, 504])
+const IDEMPOTENT_METHODS = new Set(['GET', 'HEAD'])
+
+const listeners = new Set()
+const inFlight = new Map()
+const waiting = []
+let active = 0
+
+// Subscribe to per-request timings; returns an unsubscribe function.
+export const onQuery = (listener) => {
+  listeners.add(listener)
+  return () => listeners.delete(listener)
 }
 
-.sunrise-glow {
-  --color-primary: #fb923c;
-  --color-secondary: #f97316;
-  --color-accent: #ea580c;
-  --color-background: #fff7ed;
-  --color-text: #431407;
-  --font-body: 'Roboto', sans-serif;
-  --font-heading: 'Playfair Display', serif;
+const acquire = () => {
+  if (active < MAX_CONCURRENT) {
+    active += 1
+    return Promise.resolve()
+  }
+  return new Promise(resolve => waiting.push(resolve))
 }
 
-.minimal-mist {
-  --color-primary: #64748b;
-  --color-secondary: #475569;
-  --color-accent: #334155;
-  --color-background: #f8fafc;
-  --color-text: #0f172a;
-  --font-body: 'Lato', sans-serif;
-  --font-heading: 'Helvetica Neue', sans-serif;
+const release = () => {
+  const next = waiting.shift()
+  if (next) {
+    next()
+  } else {
+    active -= 1
+  }
 }
 
-.soft-leaf {
-  --color-primary: #84cc16;
-  --color-secondary: #65a30d;
-  --color-accent: #4d7c0f;
-  --color-background: #f7fee7;
-  --color-text: #1a2e05;
-  --font-body: 'Nunito', sans-serif;
-  --font-heading: 'Nunito Sans', sans-serif;
+const sleep = (ms) => new Promise(resolve => setTimeout(resolve, ms))
+
+const backoff = (attempt) => Math.random() * Math.min(MAX_DELAY_MS, BASE_DELAY_MS * 2 ** attempt)
+
+const send = async (input, init, method) => {
+  const retries = IDEMPOTENT_METHODS.has(method) ? MAX_RETRIES : 0
+  for (let attempt = 0; ; attempt++) {
+    let response = null
+    let error = null
+    await acquire()
+    try {
+      response = await fetch(input, init)
+    } catch (e) {
+      error = e
+    } finally {
+      release()
+    }
+    
+    const retryable = error ? error.name !== 'AbortError' : RETRYABLE_STATUS.has(response.status)
+    if (!retryable || attempt >= retries) {
+      if (error) throw error
+      return response
+    }
+    const retryAfter = Number(response?.headers.get('Retry-After'))
+    await sleep(retryAfter > 0 ? retryAfter * 1000 : backoff(attempt))
+  }
 }
 
-.neon-day {
-  --color-primary: #3b82f6; 
-  --color-secondary: #2563eb;
-  --color-accent: #1d4ed8;
-  --color-background: #eff6ff;
-  --color-text: #1e3a8a;
-  --font-body: 'Quicksand', sans-serif;
-  --font-heading: 'Poppins', sans-serif;
+// Requests only share a response when everything that shapes it matches.
+const requestKey = (method, url, headers) => [
+  method,
+  url,
+  headers.get('Authorization'),
+  headers.get('Accept'),
+  headers.get('Accept-Profile'),
+  headers.get('Prefer'),
+  headers.get('Range')
+].join(' ')
+
+export const clientFetch = (input, init = {}) => {
+  const url = typeof input === 'string' ? input : input.url ?? String(input)
+  const method = (init.method || input.method || 'GET').toUpperCase()
+  const start = performance.now()
+  const notify = (status, deduped) => {
+    const event = { method, url, status, deduped, duration: performance.now() - start }
+    listeners.forEach(listener => listener(event))
+  }
+  const timed = (promise, deduped) => promise.then(
+    (response) => {
+      notify(response.status, deduped)
+      return response
+    },
+    (error) => {
+      notify(0, deduped)
+      throw error
+    }
+  )
+  
+  // Cancellable requests are never shared: aborting one must not abort the others.
+  if (method !== 'GET' || init.signal) {
+    return timed(send(input, init, method), false)
+  }
+  
+  const key = requestKey(method, url, new Headers(init.headers))
+  const shared = inFlight.get(key)
+  if (shared) {
+    return timed(shared.then(response => response.clone()), true)
+  }
+  const request = send(input, init, method).finally(() => inFlight.delete(key))
+  inFlight.set(key, request)
+  return timed(request.then(response => response.clone()), false)
 }
+"""
 
-/* Dark Themes */
-.midnight-code {
-  --color-primary: #22d3ee;
-  --color-secondary: #06b6d4;
-  --color-accent: #0891b2;
-  --color-background: #0f172a;
-  --color-text: #e2e8f0;
-  --font-body: 'Source Code Pro', monospace;
-  --font-heading: 'Space Mono', monospace;
-}
+    def _get_perf_module_content(self) -> str:
+        return """// Lightweight production telemetry: web vitals, route transitions and
+// Supabase latency, sampled per page load and sent in batches.
+import { onCLS, onINP, onLCP } from 'web-vitals';
+import { onQuery } from '@/supabase/client';
+""" + self._get_perf_settings() + """const MAX_BATCH = 20;
+const FLUSH_INTERVAL_MS = 10000;
+
+// Sampling is decided once so a sampled page load reports everything.
+const sampled = !!ENDPOINT && Math.random() < SAMPLE_RATE;
+const session = Math.random().toString(36).slice(2);
+let queue = [];
+let timer = null;
+
+const flush = () => {
+  clearTimeout(timer);
+  timer = null;
+  if (!queue.length) return;
+  
+  // text/plain keeps sendBeacon free of a CORS preflight.
+  const body = JSON.stringify({ session, page: location.pathname, events: queue });
+  queue = [];
+  if (!(navigator.sendBeacon && navigator.sendBeacon(ENDPOINT, body))) {
+    fetch(ENDPOINT, { method: 'POST', body, keepalive: true }).catch(() => {});
+  }
+};
 
-.galaxy-grape {
-  --color-primary: #c084fc;
-  --color-secondary: #a855f7;
-  --color-accent: #9333ea;
-  --color-background: #1a103d;
-  --color-text: #e9d5ff;
-  --font-body: 'Rubik', sans-serif;
-  --font-heading: 'Exo 2', sans-serif;
-}
+export const record = (type, name, value, extra = {}) => {
+  if (!sampled) return;
+  
+  queue.push({ type, name, value: Math.round(value * 100) / 100, ts: Date.now(), ...extra });
+  if (queue.length >= MAX_BATCH) {
+    flush();
+  } else if (!timer) {
+    timer = setTimeout(flush, FLUSH_INTERVAL_MS);
+  }
+};
 
-.forest-night {
-  --color-primary: #4ade80;
-  --color-secondary: #22c55e;
-  --color-accent: #16a34a;
-  --color-background: #0d160b;
-  --color-text: #dcfce7;
-  --font-body: 'Merriweather', serif;
-  --font-heading: 'Bitter', serif;
-}
+// Label requests by table or RPC only; query strings may contain user data.
+const describeRequest = ({ method, url }) =>
+  `${method} ${new URL(url).pathname.replace(/^\\/(rest|auth|storage)\\/v1\\//, '$1:')}`;
 
-.cyber-noir {
-  --color-primary: #ec4899;
-  --color-secondary: #db2777;
-  --color-accent: #be185d;
-  --color-background: #18181b;
-  --color-text: #f5f5f5;
-  --font-body: 'IBM Plex Sans', sans-serif;
-  --font-heading: 'Rajdhani', sans-serif;
-}
+export const installPerf = ({ router }) => {
+  if (!sampled) return;
+  
+  onQuery((event) => {
+    record('supabase', describeRequest(event), event.duration, {
+      status: event.status,
+      deduped: event.deduped
+    });
+  });
+  
+  const report = (metric) => record('vital', metric.name, metric.value, { rating: metric.rating });
+  onLCP(report);
+  onINP(report);
+  onCLS(report);
+  
+  let navigationStart = 0;
+  router.beforeEach(() => {
+    navigationStart = performance.now();
+  });
+  router.afterEach((to, from, failure) => {
+    if (failure || !navigationStart) return;
+    record('route', to.name || to.path, performance.now() - navigationStart, {
+      from: from.name || from.path
+    });
+  });
+  
+  addEventListener('visibilitychange', () => {
+    if (document.visibilityState === 'hidden') flush();
+  });
+  addEventListener('pagehide', flush);
+};
+"""
 
-.solar-void {
-  --color-primary: #fcd34d;
-  --color-secondary: #fbbf24;
-  --color-accent: #f59e0b;
-  --color-background: #030711;
-  --color-text: #fef3c7;
-  --font-body: 'Titillium Web', sans-serif;
-  --font-heading: 'Orbitron', sans-serif;
-}
+    def _get_perf_settings(self) -> str:
+        if self.runtime_config:
+            return """import { config } from '@/config';
+
+const ENDPOINT = config.perfEndpoint;
+const SAMPLE_RATE = Number(config.perfSampleRate ?? 0.1);
+"""
+        return """
+const ENDPOINT = import.meta.env.VITE_PERF_ENDPOINT;
+const SAMPLE_RATE = Number(import.meta.env.VITE_PERF_SAMPLE_RATE ?? 0.1);
+"""
+
+    def _get_perf_collector_content(self) -> str:
+        return """// Local collector for the perf beacons, for development and tests.
+// Usage: npm run perf:collect  (PORT and PERF_OUTPUT are optional)
+import { createServer } from 'http';
+import { appendFile } from 'fs/promises';
+
+const PORT = Number(process.env.PORT || 4318);
+const OUTPUT = process.env.PERF_OUTPUT || 'perf-events.jsonl';
+
+createServer((req, res) => {
+  res.setHeader('Access-Control-Allow-Origin', '*');
+  if (req.method !== 'POST') {
+    res.writeHead(req.method === 'OPTIONS' ? 204 : 405);
+    res.end();
+    return;
+  }
+  
+  let body = '';
+  req.on('data', (chunk) => { body += chunk; });
+  req.on('end', async () => {
+    try {
+      const batch = JSON.parse(body);
+      const lines = batch.events.map(event => JSON.stringify({ session: batch.session, page: batch.page, ...event }));
+      await appendFile(OUTPUT, lines.join('\\n') + '\\n');
+      res.writeHead(204);
+    } catch (error) {
+      res.writeHead(400);
+    }
+    res.end();
+  });
+}).listen(PORT, () => {
+  console.log(`Perf collector listening on http://localhost:${PORT}, writing ${OUTPUT}`);
+});
+"""
+
+    def _get_themes_css_content(self) -> str:
+        """Critical CSS: only the default theme, also applied to :root."""
+        default = self._get_theme(self.default_theme)
+        return "/* Theme Variables (default theme; others load from /themes/) */\n\n" + \
+            self._get_theme_css(default, selector=f":root,\n.{default['name']}")
+
+    def _get_theme(self, name: str) -> Dict:
+        """Look up a theme definition by name."""
+        for theme in self.themes:
+            if theme["name"] == name:
+                return theme
+        raise KeyError(name)
+
+    def _get_theme_css(self, theme: Dict, selector: Optional[str] = None) -> str:
+        """Render the CSS variable block for a single theme."""
+        lines = [f"{selector or '.' + theme['name']} {{"]
+        for key, value in theme["colors"].items():
+            lines.append(f"  --color-{key}: {value};")
+        lines.append(f"  --font-body: {theme['fonts']['body']};")
+        lines.append(f"  --font-heading: {theme['fonts']['heading']};")
+        lines.append("}")
+        return "\n".join(lines) + "\n"
+
+    def _get_lazy_theme_css(self, theme: Dict) -> str:
+        """Stylesheet for a non-default theme, loaded on demand."""
+        # html.<name> outranks the :root fallback in the critical CSS whatever
+        # order the stylesheets end up in.
+        return self._get_theme_css(theme, selector=f"html.{theme['name']}")
+
+    def _get_theme_stylesheets(self) -> Dict[str, str]:
+        """Map each non-default theme to its stylesheet URL, versioned by content hash."""
+        stylesheets = {}
+        for theme in self.themes:
+            if theme["name"] == self.default_theme:
+                continue
+            digest = hashlib.sha256(self._get_lazy_theme_css(theme).encode("utf-8")).hexdigest()[:10]
+            stylesheets[theme["name"]] = f"/themes/{theme['name']}.css?v={digest}"
+        return stylesheets
+
+    def _get_themes_js_content(self) -> str:
+        """Theme registry for the store, ThemeSelector.vue and the stylesheet loader."""
+        stylesheets = self._get_theme_stylesheets()
+        registry = {
+            theme["name"]: {
+                "label": theme["label"],
+                "dark": theme["dark"],
+                "palette": theme["colors"],
+                "fonts": theme["fonts"],
+                "href": stylesheets.get(theme["name"]),
+            }
+            for theme in self.themes
+        }
+        fonts = [{"name": font, "value": font} for font in FONTS]
+        return f"""// Generated by the TrackIt scaffolder from its theme definitions.
+export const themeRegistry = {json.dumps(registry, indent=2)};
+
+export const fonts = {json.dumps(fonts, indent=2)};
+""" + """
+export const themes = Object.entries(themeRegistry).map(([value, theme]) => ({
+  name: theme.label,
+  value,
+  dark: theme.dark,
+  bg: theme.palette.background,
+  text: theme.palette.text,
+  accent: theme.palette.primary,
+  href: theme.href
+}));
+
+// Only the default theme ships in the main CSS; others are fetched on demand.
+export const loadThemeStylesheet = (themeName) => {
+  const theme = themeRegistry[themeName];
+  let link = document.getElementById('theme-stylesheet');
+  
+  if (!theme || !theme.href) {
+    if (link) link.remove();
+    return Promise.resolve();
+  }
+  if (link && link.getAttribute('href') === theme.href) {
+    return Promise.resolve();
+  }
+  
+  const next = document.createElement('link');
+  next.rel = 'stylesheet';
+  next.href = theme.href;
+  return new Promise((resolve) => {
+    next.onload = next.onerror = () => {
+      if (link) link.remove();
+      next.id = 'theme-stylesheet';
+      resolve();
+    };
+    document.head.appendChild(next);
+  });
+};
 """
 
     def _get_tailwind_css_content(self) -> str:
@@ -671,6 +4000,7 @@ import { ref } from 'vue';
 
 const collapsed = ref(false);
 const navLinks = [
+  { icon: '🏠', text: 'Overview', to: '/dashboard' },
   { icon: '📊', text: 'Projects', to: '/dashboard/projects' },
   { icon: '📋', text: 'Scrum Board', to: '/dashboard/scrum' },
   { icon: '🎯', text: 'Priority Matrix', to: '/dashboard/matrix' },
@@ -691,6 +4021,32 @@ const toggleSidebar = () => {
       <h1 class="text-xl font-bold text-gray-800 dark:text-white">{{ currentPage }}</h1>
     </div>
     
+    <div class="relative flex-1 max-w-md mx-4">
+      <input 
+        v-model="searchQuery"
+        type="search"
+        placeholder="Search projects, tasks and to-dos..."
+        class="w-full p-2 border border-gray-300 dark:border-gray-600 rounded dark:bg-gray-700 dark:text-white"
+        @keydown.esc="closeSearch"
+        @blur="closeSearchSoon"
+      />
+      
+      <div v-if="searchOpen" class="absolute left-0 right-0 mt-1 bg-white dark:bg-gray-800 rounded-md shadow-lg py-1 z-20 max-h-96 overflow-y-auto">
+        <p v-if="searching && searchResults.length === 0" class="px-4 py-2 text-sm text-gray-500 dark:text-gray-400">Searching...</p>
+        <p v-else-if="searchResults.length === 0" class="px-4 py-2 text-sm text-gray-500 dark:text-gray-400">No matches</p>
+        <button 
+          v-for="result in searchResults"
+          :key="`${result.kind}-${result.id}`"
+          @mousedown.prevent="openResult(result)"
+          class="block w-full text-left px-4 py-2 hover:bg-gray-200 dark:hover:bg-gray-700"
+        >
+          <span class="text-xs uppercase text-gray-500 dark:text-gray-400 mr-2">{{ resultLabels[result.kind] }}</span>
+          <span class="text-gray-800 dark:text-white">{{ result.title }}</span>
+          <span v-if="result.detail" class="block text-xs text-gray-500 dark:text-gray-400 truncate">{{ result.detail }}</span>
+        </button>
+      </div>
+    </div>
+    
     <div class="flex items-center space-x-4">
       <button @click="toggleTodo" class="p-2 rounded-md hover:bg-gray-200 dark:hover:bg-gray-700">
         <span class="text-xl">📝</span>
@@ -718,15 +4074,95 @@ const toggleSidebar = () => {
 </template>
 
 <script setup>
-import { ref, computed } from 'vue';
+import { ref, computed, watch } from 'vue';
 import { useRoute, useRouter } from 'vue-router';
 import { useStore } from '@/store';
 import { supabase } from '@/supabase/client';
 
+const SEARCH_DEBOUNCE_MS = 250;
+const MIN_QUERY_LENGTH = 2;
+
 const store = useStore();
 const route = useRoute();
 const router = useRouter();
 const profileMenuOpen = ref(false);
+const searchQuery = ref('');
+const searchResults = ref([]);
+const searchOpen = ref(false);
+const searching = ref(false);
+let searchTimer = null;
+let searchController = null;
+
+const resultLabels = {
+  project: 'Project',
+  task: 'Task',
+  todo: 'To-do',
+  archive: 'History'
+};
+
+// Debounce keystrokes and abort the previous request, so only the latest
+// query's results are ever shown.
+watch(searchQuery, (value) => {
+  clearTimeout(searchTimer);
+  searchController?.abort();
+  
+  const query = value.trim();
+  if (query.length < MIN_QUERY_LENGTH) {
+    searchResults.value = [];
+    searchOpen.value = false;
+    return;
+  }
+  
+  searchTimer = setTimeout(() => runSearch(query), SEARCH_DEBOUNCE_MS);
+});
+
+const runSearch = async (query) => {
+  const controller = new AbortController();
+  searchController = controller;
+  searching.value = true;
+  searchOpen.value = true;
+  
+  try {
+    const results = await store.search(query, { signal: controller.signal });
+    if (!controller.signal.aborted) {
+      searchResults.value = results;
+    }
+  } catch (error) {
+    if (!controller.signal.aborted) {
+      console.error('Error searching:', error);
+      searchResults.value = [];
+    }
+  } finally {
+    if (searchController === controller) {
+      searching.value = false;
+    }
+  }
+};
+
+const closeSearch = () => {
+  searchOpen.value = false;
+};
+
+const closeSearchSoon = () => {
+  setTimeout(closeSearch, 150);
+};
+
+const openResult = (result) => {
+  closeSearch();
+  searchQuery.value = '';
+  
+  if (result.kind === 'todo') {
+    store.isToDoOpen = true;
+    return;
+  }
+  
+  const targets = {
+    project: '/dashboard/projects',
+    task: '/dashboard/scrum',
+    archive: '/dashboard/history'
+  };
+  router.push(targets[result.kind]);
+};
 
 const currentPage = computed(() => {
   const routeName = route.name;
@@ -783,17 +4219,17 @@ const logout = async () => {
       </div>
       
       <div class="space-y-2">
-        <div v-for="(todo, index) in todos" :key="index" class="flex items-center p-2 border-b border-gray-200 dark:border-gray-700">
+        <div v-for="todo in todos" :key="todo.id" class="flex items-center p-2 border-b border-gray-200 dark:border-gray-700">
           <input 
             type="checkbox" 
             :checked="todo.completed" 
-            @change="toggleTodo(index)"
+            @change="toggleTodo(todo)"
             class="mr-2"
           />
           <span :class="{'line-through': todo.completed}" class="flex-1 text-gray-800 dark:text-white">
             {{ todo.text }}
           </span>
-          <button @click="removeTodo(index)" class="text-red-500 hover:text-red-700">
+          <button @click="removeTodo(todo)" class="text-red-500 hover:text-red-700">
             ×
           </button>
         </div>
@@ -808,7 +4244,7 @@ import { useStore } from '@/store';
 
 const store = useStore();
 const newTodo = ref('');
-const todos = ref([]);
+const todos = computed(() => store.todos);
 
 const isOpen = computed(() => store.isToDoOpen);
 
@@ -817,34 +4253,45 @@ onMounted(() => {
 });
 
 const loadTodos = async () => {
-  // In a real app, this would fetch from Supabase
-  todos.value = [
-    { text: 'Create project structure', completed: true },
-    { text: 'Design database schema', completed: false },
-    { text: 'Implement authentication', completed: false },
-  ];
+  await store.loadTodos();
 };
 
 const closeTodo = () => {
   store.toggleToDo();
 };
 
-const addTodo = () => {
+const addTodo = async () => {
   if (newTodo.value.trim()) {
-    todos.value.push({
-      text: newTodo.value,
-      completed: false
-    });
+    const text = newTodo.value;
     newTodo.value = '';
+    try {
+      await store.mutate('todos', 'insert', {
+        id: crypto.randomUUID(),
+        user_id: store.user.id,
+        text,
+        completed: false,
+        created_at: new Date().toISOString()
+      });
+    } catch (error) {
+      console.error('Error adding todo:', error);
+    }
   }
 };
 
-const toggleTodo = (index) => {
-  todos.value[index].completed = !todos.value[index].completed;
+const toggleTodo = async (todo) => {
+  try {
+    await store.mutate('todos', 'update', { id: todo.id, completed: !todo.completed });
+  } catch (error) {
+    console.error('Error updating todo:', error);
+  }
 };
 
-const removeTodo = (index) => {
-  todos.value.splice(index, 1);
+const removeTodo = async (todo) => {
+  try {
+    await store.mutate('todos', 'delete', { id: todo.id });
+  } catch (error) {
+    console.error('Error removing todo:', error);
+  }
 };
 </script>
 """
@@ -853,9 +4300,18 @@ const removeTodo = (index) => {
         return """<template>
     <div class="project-card bg-white dark:bg-gray-800 rounded-lg shadow-md p-4 hover:shadow-lg transition-shadow">
       <div class="flex justify-between items-start">
-        <div>
-          <h3 class="text-lg font-semibold text-gray-800 dark:text-white">{{ project.name }}</h3>
-          <p class="text-sm text-gray-600 dark:text-gray-400 mt-1">{{ project.description }}</p>
+        <div class="flex items-start">
+          <input
+            v-if="selectable"
+            type="checkbox"
+            :checked="selected"
+            @change="emit('select', project.id)"
+            class="mt-1.5 mr-3"
+          />
+          <div>
+            <h3 class="text-lg font-semibold text-gray-800 dark:text-white">{{ project.name }}</h3>
+            <p class="text-sm text-gray-600 dark:text-gray-400 mt-1">{{ project.description }}</p>
+          </div>
         </div>
         
         <div class="flex space-x-2">
@@ -891,10 +4347,18 @@ const removeTodo = (index) => {
     project: {
       type: Object,
       required: true
+    },
+    selectable: {
+      type: Boolean,
+      default: false
+    },
+    selected: {
+      type: Boolean,
+      default: false
     }
   });
 
-  const emit = defineEmits(['edit', 'delete']);
+  const emit = defineEmits(['edit', 'delete', 'select']);
 
   const statusClass = computed(() => {
     switch (props.project.status) {
@@ -1117,54 +4581,85 @@ const submitForm = () => {
           :class="{ 'ring-2 ring-primary border-0': currentFont === font.value }"
           :style="{ fontFamily: font.value }"
         >
-          <div class="text-sm font-medium text-gray-800 dark:text-white">{{ font.name }}</div>
-          <div class="text-xs text-gray-600 dark:text-gray-400">Sample text</div>
-        </div>
-      </div>
-    </div>
+          <div class="text-sm font-medium text-gray-800 dark:text-white">{{ font.name }}</div>
+          <div class="text-xs text-gray-600 dark:text-gray-400">Sample text</div>
+        </div>
+      </div>
+    </div>
+  </div>
+</template>
+
+<script setup>
+import { computed } from 'vue';
+import { useStore } from '@/store';
+import { themes, fonts } from '@/styles/themes';
+
+const store = useStore();
+
+const currentTheme = computed(() => store.theme);
+const currentFont = computed(() => store.font);
+
+const lightThemes = themes.filter(theme => !theme.dark);
+const darkThemes = themes.filter(theme => theme.dark);
+
+const selectTheme = (theme) => {
+  store.setTheme(theme);
+};
+
+const selectFont = (font) => {
+  store.setFont(font);
+};
+</script>
+"""
+
+    def _get_sync_conflicts_content(self) -> str:
+        return """<template>
+  <div v-if="store.conflicts.length" class="px-6 py-3 border-b border-yellow-300 bg-yellow-50 dark:bg-yellow-900 text-sm">
+    <p class="font-medium text-yellow-800 dark:text-yellow-100 mb-2">
+      Some changes you made offline clashed with newer edits and were not saved.
+    </p>
+    <ul class="space-y-2">
+      <li v-for="(conflict, index) in store.conflicts" :key="index" class="flex flex-wrap items-center gap-3">
+        <span class="text-gray-800 dark:text-gray-100">{{ describe(conflict) }}</span>
+        <button
+          v-if="conflict.server"
+          @click="reapply(conflict)"
+          class="px-3 py-1 bg-primary text-white rounded hover:bg-secondary"
+        >
+          Re-apply my change
+        </button>
+        <button
+          @click="store.dismissConflict(conflict)"
+          class="px-3 py-1 border border-gray-300 dark:border-gray-600 rounded text-gray-700 dark:text-gray-300"
+        >
+          {{ conflict.server ? 'Keep the newer version' : 'Dismiss' }}
+        </button>
+      </li>
+    </ul>
   </div>
 </template>
 
 <script setup>
-import { computed } from 'vue';
 import { useStore } from '@/store';
 
 const store = useStore();
 
-const currentTheme = computed(() => store.theme);
-const currentFont = computed(() => store.font);
-
-const lightThemes = [
-  { name: 'Ocean Breeze', value: 'ocean-breeze', bg: '#f0f9ff', text: '#0f172a', accent: '#38bdf8' },
-  { name: 'Sunrise Glow', value: 'sunrise-glow', bg: '#fff7ed', text: '#431407', accent: '#fb923c' },
-  { name: 'Minimal Mist', value: 'minimal-mist', bg: '#f8fafc', text: '#0f172a', accent: '#64748b' },
-  { name: 'Soft Leaf', value: 'soft-leaf', bg: '#f7fee7', text: '#1a2e05', accent: '#84cc16' },
-  { name: 'Neon Day', value: 'neon-day', bg: '#eff6ff', text: '#1e3a8a', accent: '#3b82f6' },
-];
-
-const darkThemes = [
-  { name: 'Midnight Code', value: 'midnight-code', bg: '#0f172a', text: '#e2e8f0', accent: '#22d3ee' },
-  { name: 'Galaxy Grape', value: 'galaxy-grape', bg: '#1a103d', text: '#e9d5ff', accent: '#c084fc' },
-  { name: 'Forest Night', value: 'forest-night', bg: '#0d160b', text: '#dcfce7', accent: '#4ade80' },
-  { name: 'Cyber Noir', value: 'cyber-noir', bg: '#18181b', text: '#f5f5f5', accent: '#ec4899' },
-  { name: 'Solar Void', value: 'solar-void', bg: '#030711', text: '#fef3c7', accent: '#fcd34d' },
-];
-
-const fonts = [
-  { name: 'Inter', value: 'Inter' },
-  { name: 'Roboto', value: 'Roboto' },
-  { name: 'Montserrat', value: 'Montserrat' },
-  { name: 'Poppins', value: 'Poppins' },
-  { name: 'Source Code Pro', value: 'Source Code Pro' },
-  { name: 'Playfair Display', value: 'Playfair Display' },
-];
+const KINDS = { projects: 'Project', tasks: 'Task', todos: 'To-do' };
 
-const selectTheme = (theme) => {
-  store.setTheme(theme);
+const describe = ({ table, local, server }) => {
+  const row = server || local;
+  const name = row.name || row.title || row.text || 'item';
+  const kind = KINDS[table] || table;
+  return server ? `${kind} "${name}"` : `${kind} "${name}" was deleted meanwhile`;
 };
 
-const selectFont = (font) => {
-  store.setFont(font);
+const reapply = async (conflict) => {
+  try {
+    await store.reapplyConflict(conflict);
+  } catch (error) {
+    console.error('Error re-applying change:', error);
+    alert('Failed to re-apply your change. Please try again.');
+  }
 };
 </script>
 """
@@ -1176,6 +4671,7 @@ const selectFont = (font) => {
     
     <div class="flex-1 flex flex-col overflow-hidden">
       <Navbar />
+      <SyncConflicts />
       
       <main class="flex-1 overflow-y-auto p-6">
         <router-view />
@@ -1192,6 +4688,7 @@ import { useStore } from '@/store';
 import Sidebar from '@/components/Sidebar.vue';
 import Navbar from '@/components/Navbar.vue';
 import ToDoPane from '@/components/ToDoPane.vue';
+import SyncConflicts from '@/components/SyncConflicts.vue';
 
 const store = useStore();
 const isToDoOpen = computed(() => store.isToDoOpen);
@@ -1524,21 +5021,84 @@ const handleRegister = async () => {
 
     def _get_dashboard_content(self) -> str:
         return """<template>
-  <div class="dashboard-redirect">
-    <!-- This is just a redirect component -->
+  <div class="dashboard-page">
+    <div class="mb-6 flex justify-between items-center">
+      <h1 class="text-2xl font-bold text-gray-800 dark:text-white">Overview</h1>
+      <button @click="refresh({ force: true })" class="btn-secondary" :disabled="loading">Refresh</button>
+    </div>
+    
+    <div v-if="loading && !stats" class="text-center py-8">
+      <p class="text-gray-600 dark:text-gray-400">Loading overview...</p>
+    </div>
+    
+    <div v-else-if="stats" class="space-y-6">
+      <div class="grid grid-cols-2 md:grid-cols-4 gap-4">
+        <div class="bg-white dark:bg-gray-800 rounded-lg shadow p-4">
+          <p class="text-sm text-gray-500 dark:text-gray-400">Projects</p>
+          <p class="text-3xl font-bold text-gray-800 dark:text-white">{{ totalProjects }}</p>
+        </div>
+        <div class="bg-white dark:bg-gray-800 rounded-lg shadow p-4">
+          <p class="text-sm text-gray-500 dark:text-gray-400">Average Progress</p>
+          <p class="text-3xl font-bold text-gray-800 dark:text-white">{{ stats.average_progress }}%</p>
+        </div>
+        <div class="bg-white dark:bg-gray-800 rounded-lg shadow p-4">
+          <p class="text-sm text-gray-500 dark:text-gray-400">Overdue</p>
+          <p class="text-3xl font-bold text-red-500">{{ stats.overdue_projects + stats.overdue_tasks }}</p>
+          <p class="text-xs text-gray-500 dark:text-gray-400">
+            {{ stats.overdue_projects }} projects, {{ stats.overdue_tasks }} tasks
+          </p>
+        </div>
+        <div class="bg-white dark:bg-gray-800 rounded-lg shadow p-4">
+          <p class="text-sm text-gray-500 dark:text-gray-400">Open To-Dos</p>
+          <p class="text-3xl font-bold text-gray-800 dark:text-white">{{ stats.open_todos }}</p>
+        </div>
+      </div>
+      
+      <div class="grid grid-cols-1 md:grid-cols-2 gap-4">
+        <div class="bg-white dark:bg-gray-800 rounded-lg shadow p-4">
+          <h2 class="text-lg font-semibold mb-3 text-gray-800 dark:text-white">Projects by Status</h2>
+          <div v-for="(count, status) in stats.projects_by_status" :key="status" class="flex justify-between py-1 text-sm">
+            <span class="text-gray-600 dark:text-gray-400">{{ status }}</span>
+            <span class="font-medium text-gray-800 dark:text-white">{{ count }}</span>
+          </div>
+        </div>
+        <div class="bg-white dark:bg-gray-800 rounded-lg shadow p-4">
+          <h2 class="text-lg font-semibold mb-3 text-gray-800 dark:text-white">Tasks by Status</h2>
+          <div v-for="(count, status) in stats.tasks_by_status" :key="status" class="flex justify-between py-1 text-sm">
+            <span class="text-gray-600 dark:text-gray-400">{{ status }}</span>
+            <span class="font-medium text-gray-800 dark:text-white">{{ count }}</span>
+          </div>
+        </div>
+      </div>
+    </div>
   </div>
 </template>
 
 <script setup>
-import { onMounted } from 'vue';
-import { useRouter } from 'vue-router';
+import { ref, computed, onMounted } from 'vue';
+import { useStore } from '@/store';
 
-const router = useRouter();
+const store = useStore();
+const loading = ref(true);
 
-onMounted(() => {
-  // Redirect to projects by default
-  router.replace('/dashboard/projects');
-});
+const stats = computed(() => store.dashboardStats);
+
+const totalProjects = computed(() =>
+  Object.values(stats.value?.projects_by_status || {}).reduce((sum, count) => sum + count, 0)
+);
+
+const refresh = async ({ force = false } = {}) => {
+  try {
+    loading.value = true;
+    await store.loadDashboardStats({ force });
+  } catch (error) {
+    console.error('Error loading overview:', error);
+  } finally {
+    loading.value = false;
+  }
+};
+
+onMounted(refresh);
 </script>
 """
 
@@ -1552,16 +5112,38 @@ onMounted(() => {
       </button>
     </div>
     
-    <div class="mb-4">
+    <div class="mb-4 flex flex-col md:flex-row md:items-center gap-4">
       <input 
         v-model="searchQuery"
         type="text"
         placeholder="Search projects..."
         class="w-full md:w-64 p-2 border border-gray-300 dark:border-gray-600 rounded dark:bg-gray-700 dark:text-white"
       />
+      <label v-if="filteredProjects.length" class="flex items-center text-sm text-gray-600 dark:text-gray-400">
+        <input type="checkbox" :checked="allSelected" @change="toggleSelectAll" class="mr-2" />
+        Select all
+      </label>
+    </div>
+    
+    <!-- Bulk Actions -->
+    <div v-if="selectedIds.size" class="mb-4 flex flex-wrap items-center gap-2 bg-white dark:bg-gray-800 rounded-lg shadow p-3">
+      <span class="text-sm text-gray-700 dark:text-gray-300 mr-2">{{ selectedIds.size }} selected</span>
+      <select 
+        v-model="bulkStatus"
+        class="border border-gray-300 dark:border-gray-600 rounded p-2 dark:bg-gray-700 dark:text-white"
+      >
+        <option value="Not Started">Not Started</option>
+        <option value="In Progress">In Progress</option>
+        <option value="On Hold">On Hold</option>
+        <option value="Completed">Completed</option>
+      </select>
+      <button @click="applyBulkStatus(bulkStatus)" :disabled="bulkBusy" class="btn-secondary">Set status</button>
+      <button @click="archiveSelected" :disabled="bulkBusy" class="btn-secondary">Archive</button>
+      <button @click="deleteSelected" :disabled="bulkBusy" class="text-red-600 hover:text-red-800 px-3 py-2">Delete</button>
+      <button @click="clearSelection" class="text-gray-500 hover:text-gray-700 px-3 py-2">Clear</button>
     </div>
     
-    <div v-if="loading" class="text-center py-8">
+    <div v-if="loading && projects.length === 0" class="text-center py-8">
       <p class="text-gray-600 dark:text-gray-400">Loading projects...</p>
     </div>
     
@@ -1575,6 +5157,9 @@ onMounted(() => {
         v-for="project in filteredProjects" 
         :key="project.id" 
         :project="project"
+        selectable
+        :selected="selectedIds.has(project.id)"
+        @select="toggleSelected"
         @edit="editProject"
         @delete="deleteProject"
       />
@@ -1593,16 +5178,18 @@ onMounted(() => {
 <script setup>
 import { ref, computed, onMounted } from 'vue';
 import { useStore } from '@/store';
-import { supabase } from '@/supabase/client';
 import ProjectCard from '@/components/ProjectCard.vue';
 import ProjectForm from '@/components/ProjectForm.vue';
 
 const store = useStore();
-const projects = ref([]);
-const loading = ref(true);
+const projects = computed(() => store.projects);
+const loading = ref(store.projects.length === 0);
 const searchQuery = ref('');
 const showProjectForm = ref(false);
 const currentProject = ref(null);
+const selectedIds = ref(new Set());
+const bulkStatus = ref('In Progress');
+const bulkBusy = ref(false);
 
 onMounted(async () => {
   await loadProjects();
@@ -1610,18 +5197,8 @@ onMounted(async () => {
 
 const loadProjects = async () => {
   try {
-    loading.value = true;
-    
-    // In a real implementation, you'd use store.loadProjects()
-    const { data, error } = await supabase
-      .from('projects')
-      .select('*')
-      .eq('user_id', store.user?.id)
-      .order('created_at', { ascending: false });
-    
-    if (error) throw error;
-    
-    projects.value = data || [];
+    // Cached projects render as soon as the store has them; this waits for the refresh.
+    await store.loadProjects();
   } catch (error) {
     console.error('Error loading projects:', error);
   } finally {
@@ -1650,47 +5227,26 @@ const closeProjectForm = () => {
 };
 
 const saveProject = async (projectData) => {
+  const fields = {
+    name: projectData.name,
+    description: projectData.description,
+    due_date: projectData.due_date || null,
+    status: projectData.status,
+    progress: Number(projectData.progress)
+  };
+  
   try {
     if (projectData.id) {
       // Update existing project
-      const { error } = await supabase
-        .from('projects')
-        .update({
-          name: projectData.name,
-          description: projectData.description,
-          due_date: projectData.due_date,
-          status: projectData.status,
-          progress: projectData.progress
-        })
-        .eq('id', projectData.id);
-      
-      if (error) throw error;
-      
-      // Update local state
-      const index = projects.value.findIndex(p => p.id === projectData.id);
-      if (index !== -1) {
-        projects.value[index] = { ...projects.value[index], ...projectData };
-      }
+      await store.mutate('projects', 'update', { id: projectData.id, ...fields });
     } else {
-      // Create new project
-      const { data, error } = await supabase
-        .from('projects')
-        .insert({
-          user_id: store.user.id,
-          name: projectData.name,
-          description: projectData.description,
-          due_date: projectData.due_date,
-          status: projectData.status,
-          progress: projectData.progress
-        })
-        .select();
-      
-      if (error) throw error;
-      
-      // Add to local state
-      if (data && data.length > 0) {
-        projects.value.unshift(data[0]);
-      }
+      // Create new project; the id is generated here so offline inserts can be replayed
+      await store.mutate('projects', 'insert', {
+        id: crypto.randomUUID(),
+        user_id: store.user.id,
+        created_at: new Date().toISOString(),
+        ...fields
+      });
     }
     
     // Close the form
@@ -1703,20 +5259,63 @@ const saveProject = async (projectData) => {
 
 const deleteProject = async (projectId) => {
   try {
-    const { error } = await supabase
-      .from('projects')
-      .delete()
-      .eq('id', projectId);
-    
-    if (error) throw error;
-    
-    // Remove from local state
-    projects.value = projects.value.filter(p => p.id !== projectId);
+    await store.mutate('projects', 'delete', { id: projectId });
   } catch (error) {
     console.error('Error deleting project:', error);
     alert('Failed to delete project. Please try again.');
   }
 };
+
+const allSelected = computed(() =>
+  filteredProjects.value.length > 0 &&
+  filteredProjects.value.every(project => selectedIds.value.has(project.id))
+);
+
+const toggleSelected = (projectId) => {
+  const next = new Set(selectedIds.value);
+  if (next.has(projectId)) {
+    next.delete(projectId);
+  } else {
+    next.add(projectId);
+  }
+  selectedIds.value = next;
+};
+
+const toggleSelectAll = () => {
+  selectedIds.value = allSelected.value
+    ? new Set()
+    : new Set(filteredProjects.value.map(project => project.id));
+};
+
+const clearSelection = () => {
+  selectedIds.value = new Set();
+};
+
+// Bulk actions send one request per chunk of ids, not one per project.
+const runBulk = async (action, failureMessage) => {
+  try {
+    bulkBusy.value = true;
+    await action([...selectedIds.value]);
+    clearSelection();
+  } catch (error) {
+    console.error(failureMessage, error);
+    alert(`${failureMessage} Please try again.`);
+  } finally {
+    bulkBusy.value = false;
+  }
+};
+
+const applyBulkStatus = (status) =>
+  runBulk(ids => store.bulkSetStatus('projects', ids, status), 'Failed to update projects.');
+
+const archiveSelected = () =>
+  runBulk(ids => store.archiveProjects(ids), 'Failed to archive projects.');
+
+const deleteSelected = () => {
+  if (confirm(`Are you sure you want to delete ${selectedIds.value.size} projects?`)) {
+    runBulk(ids => store.bulkDelete('projects', ids), 'Failed to delete projects.');
+  }
+};
 </script>
 """
 
@@ -1945,9 +5544,31 @@ const deleteTask = (taskId) => {
   <div class="matrix-page">
     <div class="mb-6 flex justify-between items-center">
       <h1 class="text-2xl font-bold text-gray-800 dark:text-white">Priority Matrix</h1>
-      <button @click="showTaskForm = true" class="btn-primary">
-        <span class="mr-1">+</span> New Task
-      </button>
+      <div class="flex items-center space-x-4">
+        <label class="flex items-center text-sm text-gray-700 dark:text-gray-300">
+          <input type="checkbox" :checked="autoClassify" :disabled="togglingAuto" @change="toggleAutoClassify" class="mr-2" />
+          Urgency from due dates
+        </label>
+        <button @click="showTaskForm = true" class="btn-primary">
+          <span class="mr-1">+</span> New Task
+        </button>
+      </div>
+    </div>
+    
+    <!-- Bulk Actions -->
+    <div v-if="selectedIds.size" class="mb-4 flex flex-wrap items-center gap-2 bg-white dark:bg-gray-800 rounded-lg shadow p-3">
+      <span class="text-sm text-gray-700 dark:text-gray-300 mr-2">{{ selectedIds.size }} selected</span>
+      <select 
+        v-model="bulkQuadrant"
+        class="border border-gray-300 dark:border-gray-600 rounded p-2 dark:bg-gray-700 dark:text-white"
+      >
+        <option value="urgent-important">Urgent & Important</option>
+        <option value="important-not-urgent">Important, Not Urgent</option>
+        <option value="urgent-not-important">Urgent, Not Important</option>
+        <option value="not-urgent-not-important">Not Urgent & Not Important</option>
+      </select>
+      <button @click="moveSelected(bulkQuadrant)" :disabled="bulkBusy" class="btn-secondary">Move</button>
+      <button @click="clearSelection" class="text-gray-500 hover:text-gray-700 px-3 py-2">Clear</button>
     </div>
     
     <div class="grid grid-cols-1 md:grid-cols-2 gap-4">
@@ -1960,10 +5581,15 @@ const deleteTask = (taskId) => {
           <div 
             v-for="task in getQuadrantTasks('urgent-important')" 
             :key="task.id"
-            class="task-item bg-white dark:bg-gray-800 p-3 rounded shadow-sm"
+            class="task-item bg-white dark:bg-gray-800 p-3 rounded shadow-sm cursor-move"
+            draggable="true"
+            @dragstart="onDragStart(task)"
           >
             <div class="flex justify-between">
-              <h3 class="font-medium text-gray-800 dark:text-white">{{ task.title }}</h3>
+              <label class="flex items-center">
+                <input type="checkbox" :checked="selectedIds.has(task.id)" @change="toggleSelected(task.id)" class="mr-2" />
+                <h3 class="font-medium text-gray-800 dark:text-white">{{ task.title }}</h3>
+              </label>
               <div class="task-actions">
                 <button @click="editTask(task)" class="text-blue-500 hover:text-blue-700 mr-2">✏️</button>
                 <button @click="deleteTask(task.id)" class="text-red-500 hover:text-red-700">×</button>
@@ -1994,10 +5620,15 @@ const deleteTask = (taskId) => {
           <div 
             v-for="task in getQuadrantTasks('important-not-urgent')" 
             :key="task.id"
-            class="task-item bg-white dark:bg-gray-800 p-3 rounded shadow-sm"
+            class="task-item bg-white dark:bg-gray-800 p-3 rounded shadow-sm cursor-move"
+            draggable="true"
+            @dragstart="onDragStart(task)"
           >
             <div class="flex justify-between">
-              <h3 class="font-medium text-gray-800 dark:text-white">{{ task.title }}</h3>
+              <label class="flex items-center">
+                <input type="checkbox" :checked="selectedIds.has(task.id)" @change="toggleSelected(task.id)" class="mr-2" />
+                <h3 class="font-medium text-gray-800 dark:text-white">{{ task.title }}</h3>
+              </label>
               <div class="task-actions">
                 <button @click="editTask(task)" class="text-blue-500 hover:text-blue-700 mr-2">✏️</button>
                 <button @click="deleteTask(task.id)" class="text-red-500 hover:text-red-700">×</button>
@@ -2028,10 +5659,15 @@ const deleteTask = (taskId) => {
           <div 
             v-for="task in getQuadrantTasks('urgent-not-important')" 
             :key="task.id"
-            class="task-item bg-white dark:bg-gray-800 p-3 rounded shadow-sm"
+            class="task-item bg-white dark:bg-gray-800 p-3 rounded shadow-sm cursor-move"
+            draggable="true"
+            @dragstart="onDragStart(task)"
           >
             <div class="flex justify-between">
-              <h3 class="font-medium text-gray-800 dark:text-white">{{ task.title }}</h3>
+              <label class="flex items-center">
+                <input type="checkbox" :checked="selectedIds.has(task.id)" @change="toggleSelected(task.id)" class="mr-2" />
+                <h3 class="font-medium text-gray-800 dark:text-white">{{ task.title }}</h3>
+              </label>
               <div class="task-actions">
                 <button @click="editTask(task)" class="text-blue-500 hover:text-blue-700 mr-2">✏️</button>
                 <button @click="deleteTask(task.id)" class="text-red-500 hover:text-red-700">×</button>
@@ -2062,10 +5698,15 @@ const deleteTask = (taskId) => {
           <div 
             v-for="task in getQuadrantTasks('not-urgent-not-important')" 
             :key="task.id"
-            class="task-item bg-white dark:bg-gray-800 p-3 rounded shadow-sm"
+            class="task-item bg-white dark:bg-gray-800 p-3 rounded shadow-sm cursor-move"
+            draggable="true"
+            @dragstart="onDragStart(task)"
           >
             <div class="flex justify-between">
-              <h3 class="font-medium text-gray-800 dark:text-white">{{ task.title }}</h3>
+              <label class="flex items-center">
+                <input type="checkbox" :checked="selectedIds.has(task.id)" @change="toggleSelected(task.id)" class="mr-2" />
+                <h3 class="font-medium text-gray-800 dark:text-white">{{ task.title }}</h3>
+              </label>
               <div class="task-actions">
                 <button @click="editTask(task)" class="text-blue-500 hover:text-blue-700 mr-2">✏️</button>
                 <button @click="deleteTask(task.id)" class="text-red-500 hover:text-red-700">×</button>
@@ -2093,31 +5734,52 @@ const deleteTask = (taskId) => {
 </template>
 
 <script setup>
-import { ref, onMounted } from 'vue';
+import { ref, computed, onMounted, onUnmounted } from 'vue';
 import { useStore } from '@/store';
 
+// How often an open Matrix asks the database which tasks became urgent.
+const REFRESH_INTERVAL_MS = 15 * 60 * 1000;
+
 const store = useStore();
-const tasks = ref([]);
 const showTaskForm = ref(false);
 const currentTask = ref(null);
+const togglingAuto = ref(false);
+const selectedIds = ref(new Set());
+const bulkQuadrant = ref('urgent-important');
+const bulkBusy = ref(false);
 let draggedTask = null;
+let refreshTimer = null;
 
-onMounted(() => {
-  loadTasks();
+const openTasks = computed(() => store.tasks.filter(task => task.status !== 'done'));
+
+const autoClassify = computed(() =>
+  openTasks.value.length > 0 && openTasks.value.every(task => task.auto_quadrant)
+);
+
+onMounted(async () => {
+  if (store.tasks.length === 0) {
+    await store.loadTasks();
+  }
+  refreshQuadrants();
+  refreshTimer = setInterval(refreshQuadrants, REFRESH_INTERVAL_MS);
 });
 
-const loadTasks = async () => {
-  // Mock data for demonstration
-  tasks.value = [
-    { id: 1, title: 'Fix critical bug', description: 'Production issue affecting users', quadrant: 'urgent-important', due_date: '2023-12-10' },
-    { id: 2, title: 'Strategic planning', description: 'Q1 planning session', quadrant: 'important-not-urgent', due_date: '2024-01-15' },
-    { id: 3, title: 'Respond to emails', description: 'Clear inbox backlog', quadrant: 'urgent-not-important', due_date: '2023-12-12' },
-    { id: 4, title: 'Social media browsing', description: 'Check Twitter for industry news', quadrant: 'not-urgent-not-important', due_date: null },
-  ];
+onUnmounted(() => {
+  clearInterval(refreshTimer);
+});
+
+// Quadrants are computed by the database; this only pulls the tasks whose
+// deadline moved them since the last check.
+const refreshQuadrants = async () => {
+  try {
+    await store.refreshQuadrants();
+  } catch (error) {
+    console.error('Error refreshing quadrants:', error);
+  }
 };
 
 const getQuadrantTasks = (quadrant) => {
-  return tasks.value.filter(task => task.quadrant === quadrant);
+  return openTasks.value.filter(task => (task.quadrant ?? 'not-urgent-not-important') === quadrant);
 };
 
 const formatDate = (dateStr) => {
@@ -2125,15 +5787,73 @@ const formatDate = (dateStr) => {
   return new Date(dateStr).toLocaleDateString();
 };
 
-const onDrop = (event, quadrant) => {
-  if (draggedTask) {
-    // Update task quadrant
-    const taskIndex = tasks.value.findIndex(t => t.id === draggedTask.id);
-    if (taskIndex !== -1) {
-      tasks.value[taskIndex] = { ...tasks.value[taskIndex], quadrant };
-      // In a real app, save to Supabase here
-    }
-    draggedTask = null;
+const onDragStart = (task) => {
+  draggedTask = task;
+};
+
+const onDrop = async (event, quadrant) => {
+  if (!draggedTask) return;
+  
+  const task = draggedTask;
+  draggedTask = null;
+  if (task.quadrant === quadrant) return;
+  
+  // With auto-classification on, only the importance of a drop sticks;
+  // urgency still follows the due date and the returned row has the
+  // quadrant the database settled on.
+  const important = quadrant === 'urgent-important' || quadrant === 'important-not-urgent';
+  
+  try {
+    await store.mutate('tasks', 'update', { id: task.id, important, quadrant });
+  } catch (error) {
+    console.error('Error moving task:', error);
+    alert('Failed to move task. Please try again.');
+  }
+};
+
+const toggleSelected = (taskId) => {
+  const next = new Set(selectedIds.value);
+  if (next.has(taskId)) {
+    next.delete(taskId);
+  } else {
+    next.add(taskId);
+  }
+  selectedIds.value = next;
+};
+
+const clearSelection = () => {
+  selectedIds.value = new Set();
+};
+
+// Re-prioritizing a selection is one upsert per chunk of tasks. Upserts
+// insert-or-update whole rows, so each carries the task as the store has it.
+const moveSelected = async (quadrant) => {
+  const important = quadrant === 'urgent-important' || quadrant === 'important-not-urgent';
+  const rows = store.tasks
+    .filter(task => selectedIds.value.has(task.id))
+    .map(task => ({ ...task, important, quadrant }));
+  
+  try {
+    bulkBusy.value = true;
+    await store.bulkUpsert('tasks', rows);
+    clearSelection();
+  } catch (error) {
+    console.error('Error moving tasks:', error);
+    alert('Failed to move tasks. Please try again.');
+  } finally {
+    bulkBusy.value = false;
+  }
+};
+
+const toggleAutoClassify = async () => {
+  try {
+    togglingAuto.value = true;
+    await store.setAutoQuadrant(!autoClassify.value);
+  } catch (error) {
+    console.error('Error changing classification mode:', error);
+    alert('Failed to change classification mode. Please try again.');
+  } finally {
+    togglingAuto.value = false;
   }
 };
 
@@ -2142,10 +5862,14 @@ const editTask = (task) => {
   showTaskForm.value = true;
 };
 
-const deleteTask = (taskId) => {
+const deleteTask = async (taskId) => {
   if (confirm('Are you sure you want to delete this task?')) {
-    tasks.value = tasks.value.filter(t => t.id !== taskId);
-    // In a real app, delete from Supabase here
+    try {
+      await store.mutate('tasks', 'delete', { id: taskId });
+    } catch (error) {
+      console.error('Error deleting task:', error);
+      alert('Failed to delete task. Please try again.');
+    }
   }
 };
 </script>
@@ -2163,46 +5887,53 @@ const deleteTask = (taskId) => {
       </div>
     </div>
     
-    <div v-if="loading" class="text-center py-8">
+    <!-- Filter and Search -->
+    <div class="mb-4 flex flex-col md:flex-row justify-between gap-4">
+      <div class="flex">
+        <select 
+          v-model="filterType"
+          class="mr-2 border border-gray-300 dark:border-gray-600 rounded p-2 dark:bg-gray-700 dark:text-white"
+        >
+          <option value="all">All</option>
+          <option value="Completed">Completed</option>
+          <option value="Archived">Archived</option>
+        </select>
+        
+        <select 
+          v-model="sortBy"
+          class="border border-gray-300 dark:border-gray-600 rounded p-2 dark:bg-gray-700 dark:text-white"
+        >
+          <option value="recent">Most Recent</option>
+          <option value="oldest">Oldest First</option>
+        </select>
+      </div>
+      
+      <div>
+        <input 
+          v-model="searchQuery"
+          type="text"
+          placeholder="Search history..."
+          class="w-full md:w-64 p-2 border border-gray-300 dark:border-gray-600 rounded dark:bg-gray-700 dark:text-white"
+        />
+      </div>
+    </div>
+    
+    <div v-if="loading && archivedProjects.length === 0" class="text-center py-8">
       <p class="text-gray-600 dark:text-gray-400">Loading project history...</p>
     </div>
     
-    <div v-else-if="completedProjects.length === 0" class="text-center py-8 bg-white dark:bg-gray-800 rounded-lg p-6">
+    <div v-else-if="archivedProjects.length === 0" class="text-center py-8 bg-white dark:bg-gray-800 rounded-lg p-6">
       <p class="text-xl text-gray-600 dark:text-gray-400 mb-4">No completed projects found</p>
       <p class="text-gray-500 dark:text-gray-400">Your completed and archived projects will appear here</p>
     </div>
     
     <div v-else>
-      <!-- Filter and Search -->
-      <div class="mb-4 flex flex-col md:flex-row justify-between gap-4">
-        <div class="flex">
-          <select 
-            v-model="filterType"
-            class="mr-2 border border-gray-300 dark:border-gray-600 rounded p-2 dark:bg-gray-700 dark:text-white"
-          >
-            <option value="all">All</option>
-            <option value="completed">Completed</option>
-            <option value="archived">Archived</option>
-          </select>
-          
-          <select 
-            v-model="sortBy"
-            class="border border-gray-300 dark:border-gray-600 rounded p-2 dark:bg-gray-700 dark:text-white"
-          >
-            <option value="recent">Most Recent</option>
-            <option value="oldest">Oldest First</option>
-            <option value="name">Name (A-Z)</option>
-          </select>
-        </div>
-        
-        <div>
-          <input 
-            v-model="searchQuery"
-            type="text"
-            placeholder="Search history..."
-            class="w-full md:w-64 p-2 border border-gray-300 dark:border-gray-600 rounded dark:bg-gray-700 dark:text-white"
-          />
-        </div>
+      <!-- Bulk Actions -->
+      <div v-if="selectedIds.size" class="mb-4 flex items-center gap-2 bg-white dark:bg-gray-800 rounded-lg shadow p-3">
+        <span class="text-sm text-gray-700 dark:text-gray-300 mr-2">{{ selectedIds.size }} selected</span>
+        <button @click="restoreSelected" :disabled="bulkBusy" class="btn-secondary">Restore</button>
+        <button @click="deleteSelected" :disabled="bulkBusy" class="text-red-600 hover:text-red-800 px-3 py-2">Delete</button>
+        <button @click="clearSelection" class="text-gray-500 hover:text-gray-700 px-3 py-2">Clear</button>
       </div>
       
       <!-- Project History List -->
@@ -2210,6 +5941,9 @@ const deleteTask = (taskId) => {
         <table class="min-w-full divide-y divide-gray-200 dark:divide-gray-700">
           <thead class="bg-gray-50 dark:bg-gray-900">
             <tr>
+              <th class="px-6 py-3 text-left">
+                <input type="checkbox" :checked="allSelected" @change="toggleSelectAll" />
+              </th>
               <th class="px-6 py-3 text-left text-xs font-medium text-gray-500 dark:text-gray-400 uppercase tracking-wider">
                 Project Name
               </th>
@@ -2225,7 +5959,10 @@ const deleteTask = (taskId) => {
             </tr>
           </thead>
           <tbody class="bg-white dark:bg-gray-800 divide-y divide-gray-200 dark:divide-gray-700">
-            <tr v-for="project in filteredProjects" :key="project.id">
+            <tr v-for="project in archivedProjects" :key="project.id">
+              <td class="px-6 py-4">
+                <input type="checkbox" :checked="selectedIds.has(project.id)" @change="toggleSelected(project.id)" />
+              </td>
               <td class="px-6 py-4 whitespace-nowrap">
                 <div class="text-sm font-medium text-gray-900 dark:text-white">{{ project.name }}</div>
                 <div class="text-sm text-gray-500 dark:text-gray-400">{{ project.description }}</div>
@@ -2253,71 +5990,80 @@ const deleteTask = (taskId) => {
           </tbody>
         </table>
       </div>
+      
+      <div v-if="nextCursor" class="mt-4 text-center">
+        <button @click="loadMore" :disabled="loading" class="btn-secondary">
+          {{ loading ? 'Loading...' : 'Load more' }}
+        </button>
+      </div>
     </div>
   </div>
 </template>
 
 <script setup>
-import { ref, computed, onMounted } from 'vue';
+import { ref, computed, watch, onMounted } from 'vue';
 import { useStore } from '@/store';
-import { supabase } from '@/supabase/client';
+
+const PAGE_SIZE = 50;
+const SEARCH_DEBOUNCE_MS = 300;
 
 const store = useStore();
-const completedProjects = ref([]);
+const archivedProjects = ref([]);
+const nextCursor = ref(null);
 const loading = ref(true);
 const filterType = ref('all');
 const sortBy = ref('recent');
 const searchQuery = ref('');
+const selectedIds = ref(new Set());
+const bulkBusy = ref(false);
+let requestId = 0;
+let searchTimer = null;
 
 onMounted(async () => {
-  await loadCompletedProjects();
+  await loadArchive();
 });
 
-const loadCompletedProjects = async () => {
+// Filtering, search and ordering all happen in the database; each page is
+// one index range scan, however large the archive grows.
+const loadArchive = async ({ append = false } = {}) => {
+  const current = ++requestId;
   try {
     loading.value = true;
     
-    // In a real implementation, fetch from Supabase
-    // For this template we'll use mock data
-    completedProjects.value = [
-      { id: 1, name: 'Website Redesign', description: 'Company website update', status: 'Completed', completed_at: '2023-11-20' },
-      { id: 2, name: 'Marketing Campaign', description: 'Q4 social media campaign', status: 'Archived', completed_at: '2023-10-15' },
-      { id: 3, name: 'Product Launch', description: 'New feature release', status: 'Completed', completed_at: '2023-09-30' },
-    ];
+    const { rows, cursor } = await store.loadArchivePage({
+      status: filterType.value === 'all' ? null : filterType.value,
+      search: searchQuery.value.trim(),
+      ascending: sortBy.value === 'oldest',
+      cursor: append ? nextCursor.value : null,
+      pageSize: PAGE_SIZE
+    });
+    
+    // Ignore responses for filters that have since changed.
+    if (current !== requestId) return;
+    archivedProjects.value = append ? [...archivedProjects.value, ...rows] : rows;
+    nextCursor.value = cursor;
   } catch (error) {
     console.error('Error loading completed projects:', error);
   } finally {
-    loading.value = false;
+    if (current === requestId) {
+      loading.value = false;
+    }
   }
 };
 
-const filteredProjects = computed(() => {
-  let filtered = [...completedProjects.value];
-  
-  // Filter by type
-  if (filterType.value !== 'all') {
-    filtered = filtered.filter(p => p.status.toLowerCase() === filterType.value);
-  }
-  
-  // Search filter
-  if (searchQuery.value) {
-    const query = searchQuery.value.toLowerCase();
-    filtered = filtered.filter(p => 
-      p.name.toLowerCase().includes(query) || 
-      p.description.toLowerCase().includes(query)
-    );
-  }
-  
-  // Sort
-  if (sortBy.value === 'recent') {
-    filtered.sort((a, b) => new Date(b.completed_at) - new Date(a.completed_at));
-  } else if (sortBy.value === 'oldest') {
-    filtered.sort((a, b) => new Date(a.completed_at) - new Date(b.completed_at));
-  } else if (sortBy.value === 'name') {
-    filtered.sort((a, b) => a.name.localeCompare(b.name));
-  }
-  
-  return filtered;
+const loadMore = () => loadArchive({ append: true });
+
+watch([filterType, sortBy], () => {
+  clearSelection();
+  loadArchive();
+});
+
+watch(searchQuery, () => {
+  clearTimeout(searchTimer);
+  searchTimer = setTimeout(() => {
+    clearSelection();
+    loadArchive();
+  }, SEARCH_DEBOUNCE_MS);
 });
 
 const formatDate = (dateStr) => {
@@ -2334,17 +6080,91 @@ const getStatusClass = (status) => {
   return '';
 };
 
-const restoreProject = (project) => {
+const removeFromHistory = (ids) => {
+  const removed = new Set(ids);
+  archivedProjects.value = archivedProjects.value.filter(p => !removed.has(p.id));
+  selectedIds.value = new Set([...selectedIds.value].filter(id => !removed.has(id)));
+};
+
+const restoreProjects = async (ids) => {
+  await store.restoreArchivedProjects(ids);
+  removeFromHistory(ids);
+};
+
+const deleteProjects = async (ids) => {
+  await store.deleteArchivedProjects(ids);
+  removeFromHistory(ids);
+};
+
+const restoreProject = async (project) => {
   if (confirm(`Are you sure you want to restore "${project.name}"?`)) {
-    // In a real app, update the project status in Supabase
-    console.log('Restoring project:', project);
+    try {
+      await restoreProjects([project.id]);
+    } catch (error) {
+      console.error('Error restoring project:', error);
+      alert('Failed to restore project. Please try again.');
+    }
   }
 };
 
-const deleteProject = (projectId) => {
+const deleteProject = async (projectId) => {
   if (confirm('Are you sure you want to permanently delete this project?')) {
-    // In a real app, delete from Supabase
-    completedProjects.value = completedProjects.value.filter(p => p.id !== projectId);
+    try {
+      await deleteProjects([projectId]);
+    } catch (error) {
+      console.error('Error deleting project:', error);
+      alert('Failed to delete project. Please try again.');
+    }
+  }
+};
+
+const allSelected = computed(() =>
+  archivedProjects.value.length > 0 &&
+  archivedProjects.value.every(project => selectedIds.value.has(project.id))
+);
+
+const toggleSelected = (projectId) => {
+  const next = new Set(selectedIds.value);
+  if (next.has(projectId)) {
+    next.delete(projectId);
+  } else {
+    next.add(projectId);
+  }
+  selectedIds.value = next;
+};
+
+const toggleSelectAll = () => {
+  selectedIds.value = allSelected.value
+    ? new Set()
+    : new Set(archivedProjects.value.map(project => project.id));
+};
+
+const clearSelection = () => {
+  selectedIds.value = new Set();
+};
+
+// Bulk actions send one request per chunk of ids, not one per project.
+const runBulk = async (action, failureMessage) => {
+  try {
+    bulkBusy.value = true;
+    await action([...selectedIds.value]);
+  } catch (error) {
+    console.error(failureMessage, error);
+    alert(`${failureMessage} Please try again.`);
+  } finally {
+    bulkBusy.value = false;
+  }
+};
+
+const restoreSelected = () => {
+  if (confirm(`Restore ${selectedIds.value.size} projects?`)) {
+    runBulk(restoreProjects, 'Failed to restore projects.');
+  }
+};
+
+const deleteSelected = () => {
+  if (confirm(`Permanently delete ${selectedIds.value.size} projects?`)) {
+    runBulk(deleteProjects, 'Failed to delete projects.');
   }
 };
 </script>
@@ -0,0 +1,449 @@
+#!/usr/bin/env python3
+"""
+TrackIt 2.0 Template Upgrades
+
+Moves generated trees onto new templates without losing their owners'
+edits. For each file, three versions are compared: the base (what the
+scaffolder last generated for the tree, identified by its manifest), the
+local file on disk, and the new render.
+
+- Untouched files are replaced with the new render.
+- Files only changed locally are left alone.
+- Files changed on both sides are merged line by line (diff3). Overlapping
+  edits are written with conflict markers.
+- Files the template removed are deleted unless they were edited.
+
+Files left in conflict, or unmerged with the new render written beside
+them (NEW_SUFFIX), keep their old base until someone resolves them. A
+conflict is resolved by removing its markers, and an unmerged file by
+deleting its NEW_SUFFIX copy. The next run then takes the new render
+the file was resolved against as its base.
+
+Base contents come from a content store (every run of this tool, and every
+create_project with content_store=, records them there), or from
+re-rendering the tree with the options it was generated with. Each tree
+gets a JSON report (UPGRADE_REPORT) listing what happened to every file.
+Trees are upgraded in parallel, one per process.
+
+Usage:
+    python scaffold_upgrade.py tenants/acme tenants/globex --store /srv/trackit-store
+    python scaffold_upgrade.py --from-file tenants.jsonl --store /srv/trackit-store --workers 16
+    python scaffold_upgrade.py tenants/acme --base-options '{"template_pack": "trackit-templates@1.0.0"}' \\
+        --options '{"template_pack": "trackit-templates@1.1.0"}' --dry-run
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from scaffold_trackit import MANIFEST_FILE, ContentStore, ProjectScaffolder, recorded_options
+
+
+# Written into every upgraded tree.
+UPGRADE_REPORT = ".trackit-upgrade.json"
+
+# Suffix of the new render, written beside a local file it could not be merged into.
+NEW_SUFFIX = ".trackit-new"
+
+# Statuses that need a person to look at the file.
+CONFLICT_STATUSES = ("conflict", "unmerged")
+
+
+def _sha256(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def _has_conflict_markers(content: str) -> bool:
+    """Whether content still holds a merge3 conflict block."""
+    lines = content.splitlines()
+    return (any(line.startswith("<<<<<<< ") for line in lines)
+            and any(line.startswith(">>>>>>> ") for line in lines))
+
+
+def _pending_files(root: Path) -> Dict[str, Dict]:
+    """Report entries of files the previous upgrade left in conflict or unmerged."""
+    try:
+        report = json.loads((root / UPGRADE_REPORT).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return {
+        file_path: entry
+        for file_path, entry in report.get("files", {}).items()
+        if entry.get("status") in CONFLICT_STATUSES and "new_sha256" in entry
+    }
+
+
+def _sync_regions(base: List[str], local: List[str], new: List[str]) -> List[Tuple[int, int, int, int, int, int]]:
+    """
+    Runs of lines that are identical in all three versions.
+
+    Returns:
+        (base_start, base_end, local_start, local_end, new_start, new_end)
+        per run, ending with an empty run at the end of every version
+    """
+    local_blocks = SequenceMatcher(None, base, local, autojunk=False).get_matching_blocks()
+    new_blocks = SequenceMatcher(None, base, new, autojunk=False).get_matching_blocks()
+    regions = []
+    i = j = 0
+    while i < len(local_blocks) and j < len(new_blocks):
+        local_base, local_start, local_len = local_blocks[i]
+        new_base, new_start, new_len = new_blocks[j]
+        # Overlap of the two matches, in base line numbers.
+        start = max(local_base, new_base)
+        end = min(local_base + local_len, new_base + new_len)
+        if start < end:
+            regions.append((
+                start, end,
+                local_start + start - local_base, local_start + end - local_base,
+                new_start + start - new_base, new_start + end - new_base,
+            ))
+        if local_base + local_len < new_base + new_len:
+            i += 1
+        else:
+            j += 1
+    regions.append((len(base), len(base), len(local), len(local), len(new), len(new)))
+    return regions
+
+
+def merge3(
+    base: List[str],
+    local: List[str],
+    new: List[str],
+    labels: Tuple[str, str, str] = ("local", "base", "template"),
+) -> Tuple[List[str], int]:
+    """
+    Three-way merge of lines (with their line endings), in the style of diff3.
+
+    Where only one side changed a stretch of the base, that side wins; where
+    both changed it differently, the stretch is written as a conflict:
+
+        <<<<<<< local
+        ...
+        ||||||| base
+        ...
+        =======
+        ...
+        >>>>>>> template
+
+    Returns:
+        The merged lines and the number of conflicts among them
+    """
+    merged: List[str] = []
+    conflicts = 0
+    base_at = local_at = new_at = 0
+    for base_start, base_end, local_start, local_end, new_start, new_end in _sync_regions(base, local, new):
+        base_part = base[base_at:base_start]
+        local_part = local[local_at:local_start]
+        new_part = new[new_at:new_start]
+        if local_part == new_part or new_part == base_part:
+            merged += local_part
+        elif local_part == base_part:
+            merged += new_part
+        else:
+            conflicts += 1
+            for marker, part in ((f"<<<<<<< {labels[0]}", local_part),
+                                 (f"||||||| {labels[1]}", base_part),
+                                 ("=======", new_part)):
+                merged.append(marker + "\n")
+                merged += part
+                if part and not part[-1].endswith("\n"):
+                    merged[-1] += "\n"
+            merged.append(f">>>>>>> {labels[2]}\n")
+        merged += base[base_start:base_end]
+        base_at, local_at, new_at = base_end, local_end, new_end
+    return merged, conflicts
+
+
+class BaseSource:
+    """Finds the base version of a tree's files, by the sha256 its manifest recorded."""
+
+    def __init__(self, target: str, store: Optional[ContentStore], base_options: Optional[Dict]):
+        self.target = target
+        self.store = store
+        self.base_options = base_options
+        self._renderer: Optional[ProjectScaffolder] = None
+
+    def get(self, file_path: str, digest: str) -> Optional[str]:
+        """The base content of file_path, or None if it cannot be recovered."""
+        if self.store:
+            try:
+                data = self.store.blob_path(digest).read_bytes()
+            except OSError:
+                data = None
+            # A blob hardlinked into a tree and edited in place no longer matches.
+            if data is not None and hashlib.sha256(data).hexdigest() == digest:
+                return data.decode("utf-8")
+        if self.base_options is not None:
+            if self._renderer is None:
+                self._renderer = ProjectScaffolder(self.target, quiet=True, validate=False, **self.base_options)
+            if file_path in self._renderer.outputs:
+                content = self._renderer._render(file_path)
+                if _sha256(content) == digest:
+                    return content
+        return None
+
+
+def _plan_file(
+    file_path: str,
+    entry: Optional[Dict],
+    local: Optional[str],
+    new: Optional[str],
+    bases: BaseSource,
+) -> Tuple[Dict, Optional[str]]:
+    """
+    Decide what happens to one file.
+
+    Args:
+        entry: The file's manifest entry, if it was generated before
+        local: Its content on disk, if present
+        new: Its new render, if it is still generated
+
+    Returns:
+        The report entry, and the content to write (None to write nothing)
+    """
+    if new is None:
+        if local is None:
+            return {"status": "removed"}, None
+        if _sha256(local) == entry["sha256"]:
+            return {"status": "removed"}, None
+        return {"status": "kept", "reason": "no longer generated, but edited locally"}, None
+    if local is None:
+        if entry is None:
+            return {"status": "added"}, new
+        if _sha256(new) == entry["sha256"]:
+            return {"status": "kept", "reason": "deleted locally"}, None
+        return {"status": "unmerged", "reason": "deleted locally, changed by the template"}, None
+    if local == new:
+        return {"status": "unchanged"}, None
+    if entry is None:
+        return {"status": "unmerged", "reason": "added locally and by the template"}, None
+    if _sha256(local) == entry["sha256"]:
+        return {"status": "updated"}, new
+    if _sha256(new) == entry["sha256"]:
+        return {"status": "kept", "reason": "edited locally only"}, None
+
+    base = bases.get(file_path, entry["sha256"])
+    if base is None:
+        return {"status": "unmerged", "reason": "edited locally and base version unavailable"}, None
+    lines, conflicts = merge3(
+        base.splitlines(keepends=True),
+        local.splitlines(keepends=True),
+        new.splitlines(keepends=True),
+    )
+    if conflicts:
+        return {"status": "conflict", "conflicts": conflicts}, "".join(lines)
+    return {"status": "merged"}, "".join(lines)
+
+
+def upgrade_tree(
+    target: str,
+    options: Optional[Dict] = None,
+    base_options: Optional[Dict] = None,
+    store: Optional[str] = None,
+    dry_run: bool = False,
+) -> Dict:
+    """
+    Upgrade one tree made by create_project to the current templates.
+
+    Args:
+        target: The tree
+        options: ProjectScaffolder options to render the new version with,
+            over the options recorded in the tree's manifest
+        base_options: Options the tree was last generated with, to re-render
+            base versions the content store does not have (default: the
+            options recorded in the tree's manifest)
+        store: Content store directory holding base versions (default: the
+            content_store option, if set); the new renders are added to it
+            as the next upgrade's bases
+        dry_run: Report what would happen without changing anything
+
+    Returns:
+        The tree's report: every file's status, and counts by status
+    """
+    start = time.perf_counter()
+    if not (Path(target) / MANIFEST_FILE).exists():
+        raise FileNotFoundError(f"{target}: no manifest; create the tree with create_project first")
+    recorded = recorded_options(target)
+    if base_options is None:
+        base_options = recorded
+    scaffolder = ProjectScaffolder(target, quiet=True, **dict(recorded, **(options or {})))
+    content_store = ContentStore(store) if store else scaffolder.content_store
+    # Upgraded files are edited by their owners: write them as plain files,
+    # never as read-only links into the store.
+    scaffolder.content_store = None
+    if scaffolder.validate_sources:
+        scaffolder.validate()
+
+    with scaffolder._locked():
+        previous = scaffolder._read_manifest()
+        pending = _pending_files(scaffolder.project_path)
+        bases = BaseSource(target, content_store, base_options)
+        files: Dict[str, Dict] = {}
+        manifest: Dict[str, Dict] = {}
+        for file_path in sorted(previous.keys() | scaffolder.outputs.keys()):
+            full_path = scaffolder.project_path / file_path
+            sidecar = full_path.with_name(full_path.name + NEW_SUFFIX)
+            try:
+                local = full_path.read_text(encoding="utf-8")
+            except FileNotFoundError:
+                local = None
+            new = scaffolder._render(file_path) if file_path in scaffolder.outputs else None
+            entry = previous.get(file_path)
+            earlier = pending.get(file_path)
+            if earlier is not None and earlier["status"] == "conflict" and local is not None \
+                    and _has_conflict_markers(local):
+                report = {"status": "conflict", "reason": "conflict markers not resolved yet",
+                          "conflicts": earlier.get("conflicts"), "new_sha256": earlier["new_sha256"]}
+                content = None
+            else:
+                resolved = earlier is not None and (earlier["status"] == "conflict" or not sidecar.exists())
+                if resolved:
+                    # The owner merged the render the file was left against; that is its base now.
+                    entry = {"sha256": earlier["new_sha256"]}
+                report, content = _plan_file(file_path, entry, local, new, bases)
+                if resolved:
+                    report["resolved"] = True
+                if report["status"] in CONFLICT_STATUSES:
+                    report["new_sha256"] = _sha256(new)
+            files[file_path] = report
+            if dry_run:
+                continue
+
+            if report["status"] == "removed" and local is not None:
+                full_path.unlink()
+            elif content is not None:
+                scaffolder._write_file(file_path, content)
+            # Only a NEW_SUFFIX copy this tool wrote, unedited, is replaced or removed.
+            ours = sidecar.exists() and earlier is not None \
+                and _sha256(sidecar.read_text(encoding="utf-8")) == earlier["new_sha256"]
+            if report["status"] == "unmerged":
+                if ours or not sidecar.exists():
+                    scaffolder._write_file(file_path + NEW_SUFFIX, new)
+            elif ours and report["status"] != "conflict":
+                sidecar.unlink()
+            if report["status"] in CONFLICT_STATUSES:
+                # Until it is resolved, the file keeps the base it was left with.
+                if file_path in previous:
+                    manifest[file_path] = previous[file_path]
+            elif new is not None:
+                # The new render is the base of the next upgrade, whatever was written.
+                manifest[file_path] = scaffolder._manifest_entry(file_path, new)
+            if new is not None and content_store:
+                content_store.put(new.encode("utf-8"))
+
+        summary: Dict[str, int] = {}
+        for report in files.values():
+            summary[report["status"]] = summary.get(report["status"], 0) + 1
+        result = {
+            "target": str(target),
+            "dry_run": dry_run,
+            "duration_s": round(time.perf_counter() - start, 6),
+            "summary": summary,
+            "files": {path: report for path, report in files.items() if report["status"] != "unchanged"},
+        }
+        if not dry_run:
+            scaffolder._write_manifest(manifest)
+            (scaffolder.project_path / UPGRADE_REPORT).write_text(
+                json.dumps(result, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    return result
+
+
+def upgrade_all(
+    trees: List[Tuple[str, Dict, Optional[Dict]]],
+    store: Optional[str] = None,
+    dry_run: bool = False,
+    workers: Optional[int] = None,
+    log=print,
+) -> List[Dict]:
+    """
+    Upgrade many trees on a process pool.
+
+    Args:
+        trees: (target, options, base_options) per tree
+        store, dry_run: As for upgrade_tree
+        workers: Trees upgraded at once (default: one per CPU)
+        log: Receives one line per finished tree
+
+    Returns:
+        One report per tree, in completion order; a tree that failed has an
+        "error" instead of files
+    """
+    reports = []
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+        futures = {
+            pool.submit(upgrade_tree, target, options, base_options, store, dry_run): target
+            for target, options, base_options in trees
+        }
+        for future in as_completed(futures):
+            target = futures[future]
+            try:
+                report = future.result()
+            except Exception as exc:
+                report = {"target": target, "error": "".join(traceback.format_exception_only(type(exc), exc)).strip()}
+                log(f"{target}: {report['error']}")
+            else:
+                counts = ", ".join(f"{count} {status}" for status, count in sorted(report["summary"].items()))
+                log(f"{target}: {counts}")
+            reports.append(report)
+    return reports
+
+
+def _read_trees(path: str) -> List[Tuple[str, Dict, Optional[Dict]]]:
+    """Trees from JSON lines of {"target", "options", "base_options"} objects."""
+    trees = []
+    with open(path, encoding="utf-8") as handle:
+        for line in handle:
+            if line.strip():
+                entry = json.loads(line)
+                trees.append((entry["target"], entry.get("options", {}), entry.get("base_options")))
+    return trees
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Upgrade TrackIt trees to the current templates, keeping local edits.")
+    parser.add_argument("targets", nargs="*", help="trees to upgrade")
+    parser.add_argument("--from-file", help="JSON lines of {\"target\", \"options\", \"base_options\"}")
+    parser.add_argument("--options", default="{}", help="ProjectScaffolder options for the new render, as JSON")
+    parser.add_argument("--base-options", help="options the trees were generated with, as JSON")
+    parser.add_argument("--store", help="content store holding base versions")
+    parser.add_argument("--workers", type=int, help="trees upgraded at once (default: one per CPU)")
+    parser.add_argument("--dry-run", action="store_true", help="report without changing anything")
+    parser.add_argument("--report", help="also write every tree's report to this JSON lines file")
+    args = parser.parse_args(argv)
+
+    options = json.loads(args.options)
+    base_options = json.loads(args.base_options) if args.base_options else None
+    trees = [(target, options, base_options) for target in args.targets]
+    if args.from_file:
+        trees += _read_trees(args.from_file)
+    if not trees:
+        parser.error("give targets or --from-file")
+
+    start = time.perf_counter()
+    reports = upgrade_all(trees, args.store, args.dry_run, args.workers)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as handle:
+            for report in reports:
+                handle.write(json.dumps(report, sort_keys=True) + "\n")
+
+    failed = sum("error" in report for report in reports)
+    conflicted = sum(
+        any(entry["status"] in CONFLICT_STATUSES for entry in report["files"].values())
+        for report in reports if "error" not in report
+    )
+    print(f"{len(reports)} tree(s) in {time.perf_counter() - start:.1f}s: "
+          f"{conflicted} with conflicts, {failed} failed")
+    return 1 if failed or conflicted else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+TrackIt 2.0 Scaffolder Watch Mode
+
+Watches the scaffolder's template sources and, whenever they change,
+reloads them and re-emits only the affected files into a target tree (see
+ProjectScaffolder.regenerate). Bursts of saves are debounced into one
+regeneration, and every file is replaced atomically, so a running
+`npm run dev` sees one clean HMR update per edit.
+
+The tree is re-rendered with the options recorded in its manifest, so
+watching never changes how it was generated; flags given on the command
+line override individual options.
+
+Uses inotify on Linux and falls back to polling elsewhere.
+
+Usage:
+    python scaffold_watch.py trackit-app
+    python scaffold_watch.py trackit-app --service-worker --debounce-ms 100
+"""
+
+import argparse
+import ctypes
+import ctypes.util
+import importlib
+import os
+import select
+import struct
+import sys
+import time
+import traceback
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+import scaffold_trackit
+
+
+# inotify event bits (sys/inotify.h). Editors save by writing in place or
+# by writing a new file and renaming it over the old one.
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+EVENT_HEADER = struct.Struct("iIII")
+
+
+class InotifyWatcher:
+    """Reports files changed in a set of directories, via inotify."""
+
+    def __init__(self, directories: List[Path]):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.directories: Dict[int, Path] = {}
+        for directory in directories:
+            wd = libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+            if wd < 0:
+                os.close(self.fd)
+                raise OSError(ctypes.get_errno(), f"cannot watch {directory}")
+            self.directories[wd] = directory
+
+    def wait(self, timeout: Optional[float]) -> Set[Path]:
+        """Block up to timeout seconds (forever if None) and return changed paths."""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return set()
+        changed = set()
+        while True:
+            try:
+                buffer = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return changed
+            offset = 0
+            while offset < len(buffer):
+                wd, _, _, length = EVENT_HEADER.unpack_from(buffer, offset)
+                offset += EVENT_HEADER.size
+                name = buffer[offset:offset + length].rstrip(b"\0")
+                offset += length
+                if name and wd in self.directories:
+                    changed.add(self.directories[wd] / os.fsdecode(name))
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """Same interface as InotifyWatcher, by comparing mtimes every interval."""
+
+    def __init__(self, directories: List[Path], interval: float = 0.25):
+        self.directories = directories
+        self.interval = interval
+        self.mtimes = self._scan()
+
+    def _scan(self) -> Dict[Path, int]:
+        mtimes = {}
+        for directory in self.directories:
+            for path in directory.iterdir():
+                try:
+                    mtimes[path] = path.stat().st_mtime_ns
+                except OSError:
+                    continue
+        return mtimes
+
+    def wait(self, timeout: Optional[float]) -> Set[Path]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            current = self._scan()
+            changed = {
+                path for path in current.keys() | self.mtimes.keys()
+                if current.get(path) != self.mtimes.get(path)
+            }
+            self.mtimes = current
+            if changed:
+                return changed
+            if deadline is not None and time.monotonic() >= deadline:
+                return set()
+            time.sleep(self.interval if deadline is None else min(self.interval, max(0.0, deadline - time.monotonic())))
+
+    def close(self) -> None:
+        pass
+
+
+def make_watcher(directories: List[Path], poll_interval: float):
+    """An inotify watcher where the platform has one, else a polling watcher."""
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(directories)
+        except (OSError, AttributeError) as exc:
+            print(f"inotify unavailable ({exc}); polling instead", file=sys.stderr)
+    return PollingWatcher(directories, poll_interval)
+
+
+def wait_for_quiet(watcher, changed: Set[Path], debounce: float) -> Set[Path]:
+    """Keep collecting changes until none arrive for `debounce` seconds."""
+    while True:
+        more = watcher.wait(debounce)
+        if not more:
+            return changed
+        changed |= more
+
+
+def regenerate(module, target: str, options: Dict) -> None:
+    """Render the target tree with the current templates and print what changed."""
+    start = time.perf_counter()
+    report = module.ProjectScaffolder(target, quiet=True, **options).regenerate()
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    for path, reasons in report.items():
+        print(f"  {path}: {', '.join(reasons)}")
+    print(f"{len(report)} file(s) updated in {elapsed_ms:.1f} ms")
+
+
+def watch(target: str, options: Dict, debounce: float, poll_interval: float) -> None:
+    """Regenerate target now and after every change to the template sources."""
+    module = scaffold_trackit
+    sources = {Path(module.__file__).resolve()}
+    regenerate(module, target, options)
+
+    watcher = make_watcher(sorted({source.parent for source in sources}), poll_interval)
+    print(f"Watching {', '.join(str(source) for source in sorted(sources))}")
+    try:
+        while True:
+            changed = watcher.wait(None)
+            if not {path.resolve() for path in changed} & sources:
+                continue
+            wait_for_quiet(watcher, changed, debounce)
+
+            # A half-finished edit may not import; report it and keep watching.
+            try:
+                module = importlib.reload(module)
+                regenerate(module, target, options)
+            except Exception:
+                traceback.print_exc()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Regenerate a TrackIt tree whenever the templates change.")
+    parser.add_argument("target", nargs="?", default="trackit-app", help="tree to keep up to date")
+    parser.add_argument("--debounce-ms", type=int, default=50,
+                        help="quiet period that ends a burst of saves")
+    parser.add_argument("--poll-interval", type=float, default=0.25,
+                        help="seconds between scans when inotify is unavailable")
+    # Option flags default to what the tree's manifest records.
+    overrides = parser.add_argument_group("generation options (default: as recorded in the tree)")
+    overrides.add_argument("--default-theme", default=argparse.SUPPRESS)
+    overrides.add_argument("--service-worker", action=argparse.BooleanOptionalAction, default=argparse.SUPPRESS)
+    overrides.add_argument("--runtime-config", action=argparse.BooleanOptionalAction, default=argparse.SUPPRESS)
+    overrides.add_argument("--dashboard-summary-tables", action=argparse.BooleanOptionalAction,
+                           default=argparse.SUPPRESS)
+    overrides.add_argument("--perf-endpoint", default=argparse.SUPPRESS)
+    overrides.add_argument("--perf-sample-rate", type=float, default=argparse.SUPPRESS)
+    overrides.add_argument("--supabase-url", default=argparse.SUPPRESS)
+    overrides.add_argument("--supabase-anon-key", default=argparse.SUPPRESS)
+    overrides.add_argument("--content-store", default=argparse.SUPPRESS)
+    overrides.add_argument("--template-pack", default=argparse.SUPPRESS)
+    args = vars(parser.parse_args(argv))
+
+    target = args.pop("target")
+    debounce, poll_interval = args.pop("debounce_ms") / 1000, args.pop("poll_interval")
+    options = dict(scaffold_trackit.recorded_options(target), **args)
+    watch(target, options, debounce, poll_interval)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
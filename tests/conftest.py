@@ -0,0 +1,20 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import scaffold_trackit  # noqa: E402
+
+
+@pytest.fixture
+def template(monkeypatch):
+    """Replace a template method for one test, as if its source had been edited."""
+    def replace(method, function):
+        monkeypatch.setattr(scaffold_trackit.ProjectScaffolder, method, function)
+        scaffold_trackit._template_fingerprint.cache_clear()
+
+    yield replace
+    monkeypatch.undo()
+    scaffold_trackit._template_fingerprint.cache_clear()
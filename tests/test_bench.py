@@ -0,0 +1,56 @@
+import os
+
+import pytest
+
+from scaffold_bench import _footprint, bench_footprint, compare_results
+
+
+def test_footprint_counts_hardlinks_once_across_roots(tmp_path):
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+    (tmp_path / "a" / "file").write_text("x" * 10000)
+    os.link(tmp_path / "a" / "file", tmp_path / "b" / "file")
+    both = _footprint(tmp_path / "a", tmp_path / "b")
+    assert both == _footprint(tmp_path / "a")
+    assert both["inodes"] == 1
+
+
+def test_store_trees_share_their_files(tmp_path):
+    metrics = bench_footprint(str(tmp_path), 2)
+    assert metrics["inodes.store"] < metrics["inodes.plain"]
+    assert metrics["disk_bytes.store"] < metrics["disk_bytes.plain"]
+    assert list(tmp_path.iterdir()) == []
+
+
+def _results(**metrics):
+    return {"meta": {}, "metrics": metrics}
+
+
+def test_compare_flags_a_regressed_metric():
+    rows = compare_results(
+        _results(**{"render_s": 1.0, "tenants_per_s.disk": 10.0}),
+        _results(**{"render_s": 1.5, "tenants_per_s.disk": 8.0}),
+        threshold=0.1,
+    )
+    assert rows == [
+        {"metric": "render_s", "baseline": 1.0, "current": 1.5, "change": 0.5, "regression": True},
+        {"metric": "tenants_per_s.disk", "baseline": 10.0, "current": 8.0,
+         "change": pytest.approx(-0.2), "regression": True},
+    ]
+
+
+def test_compare_passes_an_improved_metric():
+    rows = compare_results(
+        _results(**{"render_s": 1.0, "tenants_per_s.disk": 10.0, "write_s.disk": 2.0}),
+        _results(**{"render_s": 0.5, "tenants_per_s.disk": 20.0, "write_s.disk": 2.1}),
+        threshold=0.1,
+    )
+    assert [(row["metric"], row["regression"]) for row in rows] == [
+        ("render_s", False), ("tenants_per_s.disk", False), ("write_s.disk", False),
+    ]
+    assert rows[0]["change"] == -0.5 and rows[1]["change"] == 1.0
+
+
+def test_compare_skips_metrics_missing_from_either_run():
+    rows = compare_results(_results(render_s=1.0, import_s=0.0), _results(write_s=1.0, import_s=0.1), 0.1)
+    assert rows == []
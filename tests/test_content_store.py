@@ -0,0 +1,65 @@
+import errno
+import os
+
+import pytest
+
+from scaffold_trackit import ContentStore, ProjectScaffolder
+
+
+def test_put_stores_each_body_once(tmp_path):
+    store = ContentStore(tmp_path / "store")
+    blob, new = store.put(b"hello\n")
+    assert new and blob.read_bytes() == b"hello\n"
+    assert store.put(b"hello\n") == (blob, False)
+    assert oct(blob.stat().st_mode & 0o777) == oct(0o444)
+
+
+def test_materialize_replaces_links_without_writing_through(tmp_path):
+    store = ContentStore(tmp_path / "store")
+    first, _ = store.put(b"first\n")
+    second, _ = store.put(b"second\n")
+    target = tmp_path / "file.txt"
+    assert store.materialize(first, target) == "hardlink"
+    assert store.materialize(second, target) == "hardlink"
+    assert target.read_bytes() == b"second\n"
+    assert first.read_bytes() == b"first\n"
+
+
+def test_materialize_falls_back_to_copy(tmp_path, monkeypatch):
+    def unsupported(blob, target):
+        raise OSError(errno.EXDEV, "cross-device link")
+
+    monkeypatch.setattr(ContentStore, "_hardlink", staticmethod(unsupported))
+    monkeypatch.setattr(ContentStore, "_reflink", staticmethod(unsupported))
+    store = ContentStore(tmp_path / "store")
+    blob, _ = store.put(b"data\n")
+    assert store.materialize(blob, tmp_path / "copy.txt") == "copy"
+    assert (tmp_path / "copy.txt").read_bytes() == b"data\n"
+    assert not list(tmp_path.glob(".copy.txt.*.tmp"))
+
+
+def test_unexpected_errors_are_not_swallowed(tmp_path, monkeypatch):
+    def denied(blob, target):
+        raise OSError(errno.EACCES, "permission denied")
+
+    monkeypatch.setattr(ContentStore, "_hardlink", staticmethod(denied))
+    store = ContentStore(tmp_path / "store")
+    blob, _ = store.put(b"data\n")
+    with pytest.raises(PermissionError):
+        store.materialize(blob, tmp_path / "file.txt")
+
+
+def test_unknown_mode_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        ContentStore(tmp_path, mode="symlink")
+
+
+def test_tenant_trees_share_identical_files(tmp_path):
+    store = tmp_path / "store"
+    for tenant in ("acme", "globex"):
+        ProjectScaffolder(str(tmp_path / tenant), quiet=True, content_store=store,
+                          supabase_url=f"https://{tenant}.supabase.co", supabase_anon_key=tenant).create_project()
+    shared = tmp_path / "acme" / "src" / "App.vue"
+    assert os.path.samefile(shared, tmp_path / "globex" / "src" / "App.vue")
+    assert shared.stat().st_nlink == 3
+    assert (tmp_path / "acme" / ".env").read_text() != (tmp_path / "globex" / ".env").read_text()
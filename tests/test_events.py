@@ -0,0 +1,74 @@
+import io
+import json
+
+from scaffold_trackit import JsonLinesSink, MemorySink, ProjectScaffolder, PrometheusTextfileSink
+
+
+def _metrics(path):
+    """Sample lines of a textfile, as {name: value}."""
+    values = {}
+    for line in path.read_text().splitlines():
+        if line and not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            values[name] = float(value)
+    return values
+
+
+def test_memory_sink_collects_each_event(tmp_path):
+    sink = MemorySink()
+    scaffolder = ProjectScaffolder(str(tmp_path / "tree"), quiet=True, sinks=[sink])
+    scaffolder.create_project()
+    written = sink.of_type("file_written")
+    assert len(written) == len(scaffolder.files)
+    assert {event["path"] for event in written} == set(scaffolder.files)
+    assert all(event["project"] == str(scaffolder.project_path) for event in sink.events)
+    assert sink.events[-1]["event"] == "project_created"
+    assert sink.events[-1]["files_written"] == len(written)
+
+    sink.events.clear()
+    scaffolder.regenerate()
+    assert len(sink.of_type("file_skipped")) == len(scaffolder.files)
+    assert not sink.of_type("file_written")
+    assert sink.events[-1]["event"] == "project_regenerated"
+    assert sink.events[-1]["files_rebuilt"] == 0
+
+
+def test_json_lines_sink_writes_one_object_per_event(tmp_path):
+    stream = io.StringIO()
+    memory = MemorySink()
+    ProjectScaffolder(str(tmp_path / "tree"), quiet=True, sinks=[JsonLinesSink(stream), memory]).create_project()
+    lines = stream.getvalue().splitlines()
+    assert [json.loads(line) for line in lines] == memory.events
+    assert lines[0] == json.dumps(memory.events[0], sort_keys=True)
+
+
+def test_json_lines_sink_appends_to_a_path(tmp_path):
+    path = tmp_path / "events.jsonl"
+    path.write_text('{"event": "earlier"}\n')
+    sink = JsonLinesSink(path)
+    sink.emit({"event": "validated", "files": 3})
+    sink.close()
+    assert path.read_text().splitlines() == ['{"event": "earlier"}', '{"event": "validated", "files": 3}']
+
+
+def test_textfile_after_create_and_regenerate(tmp_path):
+    path = tmp_path / "trackit.prom"
+    sink = PrometheusTextfileSink(path)
+    scaffolder = ProjectScaffolder(str(tmp_path / "tree"), quiet=True, sinks=[sink])
+    scaffolder.create_project()
+    created = _metrics(path)
+    assert created["trackit_scaffold_projects_total"] == 1
+    assert created["trackit_scaffold_projects_regenerated_total"] == 0
+    assert created["trackit_scaffold_files_written_total"] == len(scaffolder.files)
+    assert created["trackit_scaffold_bytes_written_total"] > 0
+    assert created["trackit_scaffold_errors_total"] == 0
+    assert 'trackit_scaffold_phase_seconds_total{phase="files"}' in created
+    assert "# TYPE trackit_scaffold_projects_total counter" in path.read_text()
+
+    (scaffolder.project_path / "index.html").unlink()
+    scaffolder.regenerate()
+    regenerated = _metrics(path)
+    assert regenerated["trackit_scaffold_projects_total"] == 1
+    assert regenerated["trackit_scaffold_projects_regenerated_total"] == 1
+    assert regenerated["trackit_scaffold_files_written_total"] == len(scaffolder.files) + 1
+    assert not path.with_name(path.name + ".tmp").exists()
@@ -0,0 +1,115 @@
+import os
+import socket
+import sqlite3
+
+import pytest
+
+import scaffold_jobs
+from scaffold_jobs import JobQueue, run
+from scaffold_trackit import MANIFEST_FILE
+
+
+_provision = scaffold_jobs.provision
+
+
+def _crash_once(target, options):
+    """provision(), except the first attempt at a tree ending in "-crash" kills its worker."""
+    marker = target + ".crashed"
+    if target.endswith("-crash") and not os.path.exists(marker):
+        open(marker, "w").close()
+        os._exit(1)
+    return _provision(target, options)
+
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.db"))
+    yield queue
+    queue.close()
+
+
+def test_enqueue_dedupes_pending_jobs(queue, tmp_path):
+    first, added = queue.enqueue(str(tmp_path / "acme"), {"service_worker": True})
+    assert added
+    assert queue.enqueue(str(tmp_path / "acme"), {"service_worker": True}) == (first, False)
+    assert queue.enqueue(str(tmp_path / "acme"), {})[1]
+    assert queue.counts() == {"pending": 2}
+
+
+@pytest.mark.parametrize("options", [
+    {"colour": "red"}, {"service_worker": "yes"}, {"perf_sample_rate": True}, {"perf_sample_rate": "0.5"},
+])
+def test_enqueue_rejects_bad_options(queue, tmp_path, options):
+    with pytest.raises(ValueError):
+        queue.enqueue(str(tmp_path / "acme"), options)
+
+
+def test_enqueue_accepts_whole_numbers_for_floats(queue, tmp_path):
+    assert queue.enqueue(str(tmp_path / "acme"), {"perf_sample_rate": 1})[1]
+
+
+def test_run_provisions_and_then_regenerates(queue, tmp_path):
+    targets = [tmp_path / f"tenant-{i}" for i in range(3)]
+    for target in targets:
+        queue.enqueue(str(target), {"supabase_url": f"https://{target.name}.supabase.co"})
+    lines = []
+    assert run(queue, workers=2, log=lines.append) == {"done": 3}
+    assert all((target / MANIFEST_FILE).exists() for target in targets)
+    assert all(": create," in line for line in lines)
+
+    queue.enqueue(str(targets[0]), {"supabase_url": "https://tenant-0.supabase.co"})
+    lines.clear()
+    assert run(queue, workers=1, log=lines.append) == {"done": 1}
+    assert ": regenerate, 0 written" in lines[0]
+
+
+def test_failing_jobs_are_retried_then_marked_failed(queue, tmp_path, monkeypatch):
+    monkeypatch.setattr(scaffold_jobs, "RETRY_BASE_S", 0.01)
+    queue.enqueue(str(tmp_path / "acme"), {"default_theme": "no-such-theme"})
+    assert run(queue, workers=1, max_attempts=2, log=lambda line: None) == {"retried": 1, "failed": 1}
+    row = queue.db.execute("SELECT state, attempts, error FROM jobs").fetchone()
+    assert (row["state"], row["attempts"]) == ("failed", 2)
+    assert "no-such-theme" in row["error"]
+
+
+def test_jobs_of_dead_runners_are_recovered(queue, tmp_path):
+    queue.enqueue(str(tmp_path / "acme"))
+    queue.claim(f"{socket.gethostname()}:999999999")
+    assert queue.recover() == 1
+    assert queue.counts() == {"pending": 1}
+
+
+def test_release_gives_back_the_attempt(queue, tmp_path):
+    queue.enqueue(str(tmp_path / "acme"))
+    job = queue.claim("runner")
+    assert queue.release(job["id"]) == "pending"
+    row = queue.db.execute("SELECT state, attempts, claimed_by FROM jobs").fetchone()
+    assert tuple(row) == ("pending", 0, None)
+
+
+def test_one_job_per_target_runs_at_a_time(queue, tmp_path):
+    queue.enqueue(str(tmp_path / "acme"), {})
+    queue.enqueue(str(tmp_path / "acme"), {"service_worker": True})
+    assert queue.claim("runner") is not None
+    assert queue.claim("runner") is None
+
+
+def test_a_dead_worker_does_not_stop_the_runner(queue, tmp_path, monkeypatch):
+    monkeypatch.setattr(scaffold_jobs, "provision", _crash_once)
+    monkeypatch.setattr(scaffold_jobs, "RETRY_BASE_S", 0.01)
+    for name in ("acme-crash", "globex", "initech"):
+        queue.enqueue(str(tmp_path / name))
+    lines = []
+    outcomes = run(queue, workers=2, log=lines.append)
+    assert outcomes["done"] == 3
+    assert queue.counts() == {"done": 3}
+    assert any("restarting the pool" in line for line in lines)
+
+
+def test_queue_survives_reopening(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    JobQueue(path).enqueue(str(tmp_path / "acme"))
+    reopened = JobQueue(path)
+    assert reopened.counts() == {"pending": 1}
+    reopened.close()
+    assert sqlite3.connect(path).execute("PRAGMA journal_mode").fetchone()[0] == "wal"
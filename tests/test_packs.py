@@ -0,0 +1,116 @@
+import json
+import tarfile
+import zipfile
+
+import pytest
+
+from scaffold_trackit import (
+    ProjectScaffolder,
+    TemplatePack,
+    TemplatePackCache,
+    TemplatePackError,
+    write_pack_manifest,
+)
+
+
+def _pack(root, version, files):
+    for file_path, content in files.items():
+        path = root / "files" / file_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    write_pack_manifest(root, "acme-templates", version)
+    return root
+
+
+def _tar(source, archive):
+    with tarfile.open(archive, "w:gz") as tar:
+        tar.add(source, arcname=source.name)
+    return archive
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return TemplatePackCache(tmp_path / "cache", packs_dir=tmp_path / "packs")
+
+
+def test_pack_files_replace_and_add_outputs(tmp_path):
+    pack = _pack(tmp_path / "pack", "1.0.0", {
+        "src/pages/About.vue": "<template><p>About</p></template>\n",
+        "tailwind.config.js": "module.exports = {};\n",
+    })
+    tree = tmp_path / "tree"
+    ProjectScaffolder(str(tree), quiet=True, template_pack=str(pack)).create_project()
+    assert (tree / "src" / "pages" / "About.vue").read_text() == "<template><p>About</p></template>\n"
+    assert (tree / "tailwind.config.js").read_text() == "module.exports = {};\n"
+
+
+def test_new_pack_version_removes_outputs_only_the_old_one_had(tmp_path):
+    old = _pack(tmp_path / "old", "1.0.0", {"src/extra/old.js": "export default 1;\n"})
+    new = _pack(tmp_path / "new", "1.1.0", {"src/extra/new.js": "export default 2;\n"})
+    tree = tmp_path / "tree"
+    ProjectScaffolder(str(tree), quiet=True, template_pack=str(old)).create_project()
+    ProjectScaffolder(str(tree), quiet=True, template_pack=str(new)).create_project()
+    assert not (tree / "src" / "extra" / "old.js").exists()
+    assert (tree / "src" / "extra" / "new.js").exists()
+
+    report = ProjectScaffolder(str(tree), quiet=True).regenerate()
+    assert report["src/extra/new.js"] == ["no longer generated"]
+
+
+def test_altered_or_unlisted_files_are_rejected(tmp_path):
+    pack = _pack(tmp_path / "pack", "1.0.0", {"a.js": "export default 1;\n"})
+    (pack / "files" / "a.js").write_text("export default 2;\n")
+    with pytest.raises(TemplatePackError, match="does not match"):
+        TemplatePack.load(pack)
+    write_pack_manifest(pack, "acme-templates", "1.0.0")
+    (pack / "files" / "b.js").write_text("")
+    with pytest.raises(TemplatePackError, match="not listed"):
+        TemplatePack.load(pack)
+
+
+def test_archives_are_unpacked_once(tmp_path, cache):
+    (tmp_path / "packs").mkdir()
+    source = _pack(tmp_path / "acme-templates-1.0.0", "1.0.0", {"a.js": "1;\n"})
+    archive = _tar(source, tmp_path / "packs" / "acme-templates-1.0.0.tar.gz")
+    pack = cache.open("acme-templates@1.0.0")
+    assert pack.files == {"a.js": "1;\n"}
+    entries = [entry for entry in (tmp_path / "cache").iterdir() if entry.is_dir()]
+    assert len(entries) == 1
+
+    # A fresh cache over the same directory reuses the unpacked entry.
+    again = TemplatePackCache(tmp_path / "cache", packs_dir=tmp_path / "packs").open(archive)
+    assert again.digest == pack.digest
+    assert [entry for entry in (tmp_path / "cache").iterdir() if entry.is_dir()] == entries
+
+
+def test_tampered_cache_entries_are_unpacked_again(tmp_path, cache):
+    archive = _tar(_pack(tmp_path / "src", "1.0.0", {"a.js": "1;\n"}), tmp_path / "pack.tar.gz")
+    cache.open(archive)
+    entry = next(entry for entry in (tmp_path / "cache").iterdir() if entry.is_dir())
+    (entry / "files" / "a.js").write_text("tampered;\n")
+    fresh = TemplatePackCache(tmp_path / "cache")
+    assert fresh.open(archive).files == {"a.js": "1;\n"}
+
+
+def test_eviction_keeps_the_cache_under_its_size(tmp_path):
+    cache = TemplatePackCache(tmp_path / "cache", max_bytes=1)
+    for version in ("1.0.0", "1.1.0"):
+        source = _pack(tmp_path / version, version, {"a.js": f"// {version}\n"})
+        cache.open(_tar(source, tmp_path / f"{version}.tar.gz"))
+    assert len([entry for entry in (tmp_path / "cache").iterdir() if entry.is_dir()]) == 1
+
+
+@pytest.mark.parametrize("member", ["../escape.js", "/abs.js", "files/../../escape.js"])
+def test_archives_with_unsafe_paths_are_rejected(tmp_path, cache, member):
+    archive = tmp_path / "evil.zip"
+    with zipfile.ZipFile(archive, "w") as zipped:
+        zipped.writestr("pack.json", json.dumps({"name": "evil", "version": "1", "files": {}}))
+        zipped.writestr(member, "boom")
+    with pytest.raises(TemplatePackError, match="Unsafe path"):
+        cache.open(archive)
+    assert not (tmp_path / "escape.js").exists()
+
+
+def test_missing_packs_are_reported(cache):
+    with pytest.raises(TemplatePackError, match="not found"):
+        cache.open("nothing@0.0.0")
@@ -0,0 +1,67 @@
+import json
+
+from scaffold_trackit import MANIFEST_FILE, ProjectScaffolder, recorded_options
+
+
+_original_app_vue = ProjectScaffolder._get_app_vue_content
+
+
+class _Templates:
+    def app_vue(self):
+        return _original_app_vue(self) + "<!-- edited -->\n"
+
+
+def _create(path, **options):
+    scaffolder = ProjectScaffolder(str(path), quiet=True, **options)
+    scaffolder.create_project()
+    return scaffolder
+
+
+def test_noop_regenerate_writes_nothing(tmp_path):
+    _create(tmp_path)
+    before = {path: path.stat().st_mtime_ns for path in tmp_path.rglob("*") if path.is_file()}
+    scaffolder = ProjectScaffolder(str(tmp_path), quiet=True)
+    assert scaffolder.regenerate() == {}
+    assert scaffolder.stats["files_written"] == 0
+    assert scaffolder._rendered == {}
+    after = {path: path.stat().st_mtime_ns for path in tmp_path.rglob("*") if path.is_file()}
+    assert {path: mtime for path, mtime in after.items() if path.name != MANIFEST_FILE} == \
+        {path: mtime for path, mtime in before.items() if path.name != MANIFEST_FILE}
+
+
+def test_template_edit_rebuilds_only_its_outputs(tmp_path, template):
+    _create(tmp_path)
+    template("_get_app_vue_content", _Templates.app_vue)
+    report = ProjectScaffolder(str(tmp_path), quiet=True).regenerate()
+    assert report == {"src/App.vue": ["template changed"]}
+    assert (tmp_path / "src" / "App.vue").read_text().endswith("<!-- edited -->\n")
+    assert ProjectScaffolder(str(tmp_path), quiet=True).regenerate() == {}
+
+
+def test_option_change_rebuilds_dependents_and_removes_dropped_outputs(tmp_path):
+    _create(tmp_path, service_worker=True)
+    assert (tmp_path / "public" / "sw.js").exists()
+    report = ProjectScaffolder(str(tmp_path), quiet=True).regenerate()
+    assert "src/main.js" in report and "options.service_worker changed" in report["src/main.js"]
+    assert report["public/sw.js"] == ["no longer generated"]
+    assert not (tmp_path / "public" / "sw.js").exists()
+
+
+def test_files_changed_or_missing_on_disk_are_restored(tmp_path):
+    scaffolder = _create(tmp_path)
+    (tmp_path / "src" / "App.vue").write_text("broken")
+    (tmp_path / "tailwind.config.js").unlink()
+    report = ProjectScaffolder(str(tmp_path), quiet=True).regenerate()
+    assert report == {"src/App.vue": ["modified on disk"], "tailwind.config.js": ["missing on disk"]}
+    assert (tmp_path / "src" / "App.vue").read_text() == scaffolder.files["src/App.vue"]
+
+
+def test_manifest_records_build_options(tmp_path):
+    _create(tmp_path, service_worker=True, supabase_url="https://acme.supabase.co", supabase_anon_key="key")
+    options = recorded_options(tmp_path)
+    assert options["service_worker"] is True
+    assert options["supabase_url"] == "https://acme.supabase.co"
+    assert "themes" not in options
+    manifest = json.loads((tmp_path / MANIFEST_FILE).read_text())
+    assert set(manifest["files"]) == set(ProjectScaffolder(str(tmp_path), **options).outputs)
+    assert ProjectScaffolder(str(tmp_path), quiet=True, **options).regenerate() == {}
@@ -0,0 +1,156 @@
+import asyncio
+import io
+import json
+import tarfile
+import zipfile
+
+import pytest
+
+import scaffold_service
+from scaffold_service import LRUCache, ScaffoldService
+
+
+def _request(service, body, headers=None, path="/scaffold", method="POST"):
+    return asyncio.run(service.handle(method, path, json.dumps(body).encode("utf-8"), headers or {}))
+
+
+def test_scaffold_returns_a_tar_with_the_tenant_credentials():
+    status, headers, body = _request(ScaffoldService(), {
+        "supabase_url": "https://acme.supabase.co", "supabase_anon_key": "acme-key",
+    })
+    assert status == 200 and headers["Content-Type"] == "application/gzip"
+    with tarfile.open(fileobj=io.BytesIO(body), mode="r:gz") as archive:
+        names = archive.getnames()
+        env = archive.extractfile("trackit-app/.env").read().decode("utf-8")
+    assert "trackit-app/src/App.vue" in names
+    assert "https://acme.supabase.co" in env and "acme-key" in env
+
+
+def test_zip_format_and_etag():
+    service = ScaffoldService()
+    status, headers, body = _request(service, {"format": "zip"})
+    assert status == 200
+    assert "trackit-app/package.json" in zipfile.ZipFile(io.BytesIO(body)).namelist()
+    status, _, body = _request(service, {"format": "zip"}, {"if-none-match": headers["ETag"]})
+    assert (status, body) == (304, b"")
+
+
+def test_identical_requests_are_served_from_the_archive_cache():
+    service = ScaffoldService()
+    first = _request(service, {"service_worker": True})
+    second = _request(service, {"service_worker": True})
+    assert first[2] == second[2]
+    assert service.builds == 1 and service.archives.hits == 1
+
+
+@pytest.mark.parametrize("body, message", [
+    ({"colour": "red"}, b"unknown fields: colour"),
+    ({"service_worker": "yes"}, b"service_worker must be a bool"),
+    ({"format": "rar"}, b"format must be one of"),
+    ({"default_theme": "no-such-theme"}, b"is not defined"),
+    ({"supabase_anon_key": "key\nVITE_PERF_ENDPOINT=https://evil.example"},
+     b"supabase_anon_key must not contain control characters"),
+    ({"perf_endpoint": "https://perf.example\r"}, b"perf_endpoint must not contain control characters"),
+])
+def test_bad_requests_get_400(body, message):
+    status, _, payload = _request(ScaffoldService(), body)
+    assert status == 400 and message in payload
+
+
+def test_routes():
+    service = ScaffoldService()
+    assert _request(service, {}, path="/healthz", method="GET")[0] == 200
+    assert _request(service, {}, path="/nope")[0] == 404
+    assert _request(service, {}, method="GET")[0] == 405
+    assert b"trackit_service_builds_total 0" in _request(service, {}, path="/metrics", method="GET")[2]
+
+
+def test_tenants_differing_only_in_credentials_share_one_render(monkeypatch):
+    renders = []
+    real = scaffold_service.ProjectScaffolder
+
+    class Counting(real):
+        @property
+        def files(self):
+            renders.append(self)
+            return real.files.fget(self)
+
+    monkeypatch.setattr(scaffold_service, "ProjectScaffolder", Counting)
+
+    async def main():
+        service = ScaffoldService(concurrency=8)
+        bodies = [json.dumps({"supabase_url": f"https://t{i}.supabase.co"}).encode() for i in range(6)]
+        return await asyncio.gather(*(service.handle("POST", "/scaffold", body, {}) for body in bodies))
+
+    results = asyncio.run(main())
+    assert [status for status, _, _ in results] == [200] * 6
+    assert len(renders) == 1
+
+
+def test_cancelled_build_releases_waiters():
+    async def main():
+        service = ScaffoldService()
+        first = asyncio.create_task(service.handle("POST", "/scaffold", b"{}", {}))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(service.handle("POST", "/scaffold", b"{}", {}))
+        await asyncio.sleep(0)
+        first.cancel()
+        status, _, _ = await second
+        return status, service
+
+    status, service = asyncio.run(main())
+    assert status == 503
+    assert service.building == {} and service.rendering == {} and service.pending == 0
+
+
+def _http(data):
+    """Send raw bytes to a running service; returns everything it answers."""
+    async def main():
+        service = ScaffoldService()
+        server = await service.start(port=0)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(data)
+        response = await reader.read()
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        return response
+
+    return asyncio.run(main())
+
+
+def test_http_rejects_bad_content_length():
+    response = _http(b"POST /scaffold HTTP/1.1\r\nContent-Length: ten\r\n\r\n")
+    assert response.startswith(b"HTTP/1.1 400 Bad Request")
+
+
+def test_http_limits_header_count_and_line_length():
+    many = b"".join(b"X-%d: 1\r\n" % i for i in range(scaffold_service.MAX_HEADERS + 1))
+    response = _http(b"GET /healthz HTTP/1.1\r\n" + many + b"\r\n")
+    assert response.startswith(b"HTTP/1.1 431 Request Header Fields Too Large")
+    assert response.endswith(b"too many headers\n")
+
+    long_header = b"X-Long: " + b"a" * scaffold_service.MAX_LINE_BYTES + b"\r\n"
+    response = _http(b"GET /healthz HTTP/1.1\r\n" + long_header + b"\r\n")
+    assert response.startswith(b"HTTP/1.1 431 Request Header Fields Too Large")
+
+    long_target = b"/" + b"a" * scaffold_service.MAX_LINE_BYTES
+    assert _http(b"GET " + long_target + b" HTTP/1.1\r\n\r\n").startswith(b"HTTP/1.1 400 Bad Request")
+
+
+def test_http_accepts_headers_within_the_limits():
+    headers = b"".join(b"X-%d: 1\r\n" % i for i in range(scaffold_service.MAX_HEADERS - 1))
+    response = _http(b"GET /healthz HTTP/1.1\r\n" + headers + b"Connection: close\r\n\r\n")
+    assert response.startswith(b"HTTP/1.1 200 OK")
+
+
+def test_lru_cache_bounds():
+    cache = LRUCache(max_entries=2, max_bytes=10)
+    cache.put("a", 1, 4)
+    cache.put("b", 2, 4)
+    assert cache.get("a") == 1
+    cache.put("c", 3, 4)
+    assert cache.get("b") is None and cache.evictions == 1
+    cache.put("huge", 4, 11)
+    assert "huge" not in cache.entries
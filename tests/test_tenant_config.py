@@ -0,0 +1,41 @@
+import json
+
+import pytest
+
+from scaffold_trackit import DEFAULT_THEME, THEMES, write_tenant_config
+
+
+def test_writes_the_tenant_settings(tmp_path):
+    path = write_tenant_config(tmp_path, "https://acme.supabase.co", "acme-key")
+    assert path == tmp_path / "config.json"
+    assert json.loads(path.read_text()) == {
+        "supabaseUrl": "https://acme.supabase.co",
+        "supabaseAnonKey": "acme-key",
+        "defaultTheme": DEFAULT_THEME,
+    }
+    assert path.read_text().endswith("}\n")
+    assert not (tmp_path / "config.json.tmp").exists()
+
+
+def test_rewrites_with_theme_and_perf_settings(tmp_path):
+    write_tenant_config(tmp_path, "https://old.supabase.co", "old-key")
+    theme = THEMES[-1]["name"]
+    path = write_tenant_config(
+        tmp_path, "https://acme.supabase.co", "acme-key", default_theme=theme,
+        perf_endpoint="https://perf.example/beacon", perf_sample_rate=0.5,
+    )
+    assert json.loads(path.read_text()) == {
+        "supabaseUrl": "https://acme.supabase.co",
+        "supabaseAnonKey": "acme-key",
+        "defaultTheme": theme,
+        "perfEndpoint": "https://perf.example/beacon",
+        "perfSampleRate": 0.5,
+    }
+
+
+def test_rejects_a_theme_the_app_was_not_built_with(tmp_path):
+    with pytest.raises(ValueError, match="is not defined"):
+        write_tenant_config(tmp_path, "https://acme.supabase.co", "acme-key", default_theme="neon")
+    custom = [{"name": "neon"}]
+    write_tenant_config(tmp_path, "https://acme.supabase.co", "acme-key", default_theme="neon", themes=custom)
+    assert json.loads((tmp_path / "config.json").read_text())["defaultTheme"] == "neon"
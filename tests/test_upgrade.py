@@ -0,0 +1,179 @@
+import json
+import shutil
+
+import pytest
+
+from scaffold_trackit import MANIFEST_FILE, ProjectScaffolder
+from scaffold_upgrade import NEW_SUFFIX, UPGRADE_REPORT, merge3, upgrade_tree
+
+
+_original_index_html = ProjectScaffolder._get_index_html_content
+_original_tailwind_config = ProjectScaffolder._get_tailwind_config_content
+
+
+class _Templates:
+    """Edited templates; methods so their source parses like the real ones."""
+
+    def index_html(self):
+        return _original_index_html(self).replace("<title>TrackIt 2.0</title>", "<title>TrackIt 3</title>")
+
+    def tailwind_config(self):
+        return _original_tailwind_config(self) + "// template change\n"
+
+
+def _lines(text):
+    return text.splitlines(keepends=True)
+
+
+def _edit(path, content):
+    """Save like an editor does: a new file, not a write into a store hardlink."""
+    path.unlink()
+    path.write_text(content)
+
+
+def _manifest(tree):
+    return json.loads((tree / MANIFEST_FILE).read_text(encoding="utf-8"))["files"]
+
+
+@pytest.fixture
+def tree(tmp_path):
+    target = tmp_path / "tree"
+    ProjectScaffolder(str(target), quiet=True, content_store=tmp_path / "store").create_project()
+    return target
+
+
+def test_merge3_takes_each_sides_changes():
+    base = _lines("a\nb\nc\nd\n")
+    local = _lines("a\nB\nc\nd\n")
+    new = _lines("a\nb\nc\nD\n")
+    merged, conflicts = merge3(base, local, new)
+    assert "".join(merged) == "a\nB\nc\nD\n"
+    assert conflicts == 0
+
+
+def test_merge3_marks_overlapping_changes():
+    merged, conflicts = merge3(_lines("a\nb\nc\n"), _lines("a\nlocal\nc\n"), _lines("a\nnew\nc\n"))
+    assert conflicts == 1
+    assert "".join(merged) == (
+        "a\n<<<<<<< local\nlocal\n||||||| base\nb\n=======\nnew\n>>>>>>> template\nc\n"
+    )
+
+
+def test_merge3_without_trailing_newline():
+    merged, conflicts = merge3(_lines("a\nb"), _lines("a\nb"), _lines("a\nc"))
+    assert "".join(merged) == "a\nc"
+    assert conflicts == 0
+
+
+def test_untouched_files_follow_the_template(tree, tmp_path, template):
+    template("_get_tailwind_config_content", _Templates.tailwind_config)
+    report = upgrade_tree(str(tree), store=str(tmp_path / "store"))
+    assert report["files"]["tailwind.config.js"] == {"status": "updated"}
+    assert (tree / "tailwind.config.js").read_text().endswith("// template change\n")
+    assert json.loads((tree / UPGRADE_REPORT).read_text())["summary"] == report["summary"]
+
+
+def test_local_edits_merge_with_template_changes(tree, tmp_path, template):
+    path = tree / "tailwind.config.js"
+    _edit(path, "// local header\n" + path.read_text())
+    template("_get_tailwind_config_content", _Templates.tailwind_config)
+    report = upgrade_tree(str(tree), store=str(tmp_path / "store"))
+    assert report["files"]["tailwind.config.js"] == {"status": "merged"}
+    content = path.read_text()
+    assert content.startswith("// local header\n") and content.endswith("// template change\n")
+
+
+def test_dry_run_changes_nothing(tree, tmp_path, template):
+    template("_get_tailwind_config_content", _Templates.tailwind_config)
+    before = (tree / "tailwind.config.js").read_text()
+    report = upgrade_tree(str(tree), store=str(tmp_path / "store"), dry_run=True)
+    assert report["files"]["tailwind.config.js"]["status"] == "updated"
+    assert (tree / "tailwind.config.js").read_text() == before
+    assert not (tree / UPGRADE_REPORT).exists()
+
+
+def test_conflict_keeps_its_base_until_resolved(tree, tmp_path, template):
+    store = str(tmp_path / "store")
+    path = tree / "index.html"
+    _edit(path, path.read_text().replace("<title>TrackIt 2.0</title>", "<title>Acme</title>"))
+    base = _manifest(tree)["index.html"]
+    template("_get_index_html_content", _Templates.index_html)
+
+    first = upgrade_tree(str(tree), store=store)
+    assert first["files"]["index.html"]["status"] == "conflict"
+    assert _manifest(tree)["index.html"] == base
+    marked = path.read_text()
+    assert "<<<<<<< local" in marked
+
+    # Running again before anyone resolves it changes nothing.
+    second = upgrade_tree(str(tree), store=store)
+    assert second["files"]["index.html"]["status"] == "conflict"
+    assert path.read_text() == marked
+    assert _manifest(tree)["index.html"] == base
+
+    resolved = ProjectScaffolder(str(tree))._get_index_html_content().replace("TrackIt 3", "Acme 3")
+    path.write_text(resolved)
+    third = upgrade_tree(str(tree), store=store)
+    assert third["files"]["index.html"] == {"status": "kept", "reason": "edited locally only", "resolved": True}
+    assert path.read_text() == resolved
+    assert _manifest(tree)["index.html"]["sha256"] == first["files"]["index.html"]["new_sha256"]
+
+
+def test_unmerged_sidecar_is_only_removed_once_resolved(tree, tmp_path, template):
+    shutil.rmtree(tmp_path / "store")
+    path = tree / "tailwind.config.js"
+    sidecar = tree / ("tailwind.config.js" + NEW_SUFFIX)
+    _edit(path, path.read_text() + "// local\n")
+    base = _manifest(tree)["tailwind.config.js"]
+    template("_get_tailwind_config_content", _Templates.tailwind_config)
+
+    # The store is gone and the template changed, so the base cannot be recovered.
+    for _ in range(2):
+        report = upgrade_tree(str(tree))
+        assert report["files"]["tailwind.config.js"]["status"] == "unmerged"
+        assert sidecar.read_text().endswith("// template change\n")
+        assert _manifest(tree)["tailwind.config.js"] == base
+
+    # A copy the owner edited is neither replaced nor removed.
+    sidecar.write_text("owner's notes\n")
+    upgrade_tree(str(tree))
+    assert sidecar.read_text() == "owner's notes\n"
+
+    # Deleting it marks the file resolved against the render it was left with.
+    sidecar.unlink()
+    path.write_text(ProjectScaffolder(str(tree))._get_tailwind_config_content() + "// local\n")
+    report = upgrade_tree(str(tree))
+    assert report["files"]["tailwind.config.js"]["resolved"] is True
+    assert report["files"]["tailwind.config.js"]["status"] == "kept"
+    assert not sidecar.exists()
+    assert upgrade_tree(str(tree))["files"]["tailwind.config.js"]["status"] == "kept"
+
+
+def test_foreign_sidecar_is_never_removed(tree):
+    sidecar = tree / ("index.html" + NEW_SUFFIX)
+    sidecar.write_text("not written by the upgrade tool\n")
+    upgrade_tree(str(tree))
+    assert sidecar.exists()
+
+
+def test_requires_a_manifest(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        upgrade_tree(str(tmp_path / "missing"))
+    assert not (tmp_path / "missing").exists()
+
+
+def test_keeps_the_options_the_tree_was_created_with(tmp_path, template):
+    target = tmp_path / "custom"
+    ProjectScaffolder(
+        str(target), quiet=True, service_worker=True,
+        supabase_url="https://acme.supabase.co", supabase_anon_key="anon-key",
+    ).create_project()
+    env = (target / ".env").read_text()
+    template("_get_tailwind_config_content", _Templates.tailwind_config)
+
+    report = upgrade_tree(str(target))
+    assert report["files"]["tailwind.config.js"]["status"] == "updated"
+    assert (target / ".env").read_text() == env
+    assert "VITE_SUPABASE_URL=https://acme.supabase.co" in env
+    assert (target / "public" / "sw.js").exists()
+    assert "public/sw.js" in _manifest(target)
@@ -0,0 +1,94 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import scaffold_trackit
+from scaffold_trackit import ProjectScaffolder, ScaffoldValidationError
+
+
+class _Templates:
+    def broken_app_vue(self):
+        return "<template><div>\n"
+
+
+def _broken(path, edit):
+    """A scaffolder whose render of path has been altered by edit."""
+    scaffolder = ProjectScaffolder("unused", quiet=True)
+    scaffolder.files
+    scaffolder._rendered[path] = edit(scaffolder._render(path))
+    return scaffolder
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    scaffold_trackit._VALIDATION_CACHE.clear()
+    yield
+    scaffold_trackit._VALIDATION_CACHE.clear()
+
+
+@pytest.mark.parametrize("options", [
+    {},
+    {"service_worker": True, "runtime_config": True},
+    {"dashboard_summary_tables": True, "perf_endpoint": "https://perf.example"},
+])
+def test_generated_trees_validate(options):
+    ProjectScaffolder("unused", quiet=True, **options).validate()
+
+
+@pytest.mark.parametrize("path, edit, message", [
+    ("src/store/offline.js", lambda c: c + "\nfunction broken() {\n", "'{' is never closed"),
+    ("src/App.vue", lambda c: c.replace("</template>", "<MissingWidget />\n</template>", 1),
+     "<MissingWidget> is used in <template> but never imported"),
+    ("src/main.js", lambda c: "import x from '@/components/Missing.vue'\n" + c,
+     "imports '@/components/Missing.vue', which is not generated"),
+    ("src/main.js", lambda c: "import _ from 'lodash'\n" + c, "imports 'lodash', which is not in package.json"),
+    ("src/components/Navbar.vue", lambda c: c.replace("</template>", "", 1), "<template> tag(s) but 0 </template>"),
+    ("package.json", lambda c: c[:-3], "invalid JSON"),
+])
+def test_faults_are_reported(path, edit, message):
+    with pytest.raises(ScaffoldValidationError) as error:
+        _broken(path, edit).validate()
+    assert any(where == path and message in problem for where, problem in error.value.problems)
+
+
+def test_create_project_writes_nothing_when_invalid(tmp_path, template):
+    template("_get_app_vue_content", _Templates.broken_app_vue)
+    with pytest.raises(ScaffoldValidationError):
+        ProjectScaffolder(str(tmp_path / "tree"), quiet=True).create_project()
+    assert not (tmp_path / "tree").exists()
+    ProjectScaffolder(str(tmp_path / "unchecked"), quiet=True, validate=False).create_project()
+
+
+def test_results_are_cached_by_content():
+    events = []
+
+    class Sink:
+        def emit(self, payload):
+            events.append(payload)
+
+    for _ in range(2):
+        ProjectScaffolder("unused", quiet=True, sinks=[Sink()]).validate()
+    first, second = [event for event in events if event["event"] == "validated"]
+    assert first["cache_hits"] == 0
+    assert second["cache_hits"] == second["files"]
+
+
+def test_misses_use_a_given_executor():
+    used = []
+
+    class Recording(ThreadPoolExecutor):
+        def map(self, *args, **kwargs):
+            used.append(True)
+            return super().map(*args, **kwargs)
+
+    with Recording(2) as executor:
+        ProjectScaffolder("unused", quiet=True, validation_executor=executor).validate()
+    assert used
+
+
+def test_no_default_pool_inside_worker_processes(monkeypatch):
+    monkeypatch.setattr(scaffold_trackit, "_validation_pool", None)
+    monkeypatch.setattr(scaffold_trackit.os, "cpu_count", lambda: 4)
+    monkeypatch.setattr(scaffold_trackit.multiprocessing, "parent_process", lambda: object())
+    ProjectScaffolder("unused", quiet=True).validate()
+    assert scaffold_trackit._validation_pool is None
@@ -0,0 +1,65 @@
+import sys
+
+import pytest
+
+import scaffold_trackit
+import scaffold_watch
+from scaffold_trackit import ProjectScaffolder
+
+
+def test_polling_watcher_reports_changes(tmp_path):
+    source = tmp_path / "templates.py"
+    source.write_text("a = 1\n")
+    watcher = scaffold_watch.PollingWatcher([tmp_path], interval=0.01)
+    assert watcher.wait(0.05) == set()
+    source.write_text("a = 22\n")
+    assert watcher.wait(1.0) == {source}
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux only")
+def test_inotify_watcher_reports_changes(tmp_path):
+    source = tmp_path / "templates.py"
+    watcher = scaffold_watch.InotifyWatcher([tmp_path])
+    try:
+        source.write_text("a = 1\n")
+        assert source in watcher.wait(1.0)
+        assert watcher.wait(0.01) == set()
+    finally:
+        watcher.close()
+
+
+def test_wait_for_quiet_collects_a_burst(tmp_path):
+    class Burst:
+        def __init__(self, batches):
+            self.batches = batches
+
+        def wait(self, timeout):
+            return self.batches.pop(0) if self.batches else set()
+
+    first, second = tmp_path / "a", tmp_path / "b"
+    assert scaffold_watch.wait_for_quiet(Burst([{second}]), {first}, 0.01) == {first, second}
+
+
+def test_main_keeps_the_options_the_tree_was_built_with(tmp_path, monkeypatch):
+    ProjectScaffolder(str(tmp_path), quiet=True, service_worker=True, perf_endpoint="https://perf.example",
+                      supabase_url="https://acme.supabase.co", supabase_anon_key="key").create_project()
+    calls = []
+    monkeypatch.setattr(scaffold_watch, "watch", lambda target, options, *args: calls.append(options))
+
+    scaffold_watch.main([str(tmp_path)])
+    scaffold_watch.main([str(tmp_path), "--no-service-worker", "--default-theme", "ocean-breeze"])
+
+    assert calls[0]["service_worker"] is True
+    assert calls[0]["supabase_anon_key"] == "key"
+    assert calls[0]["perf_endpoint"] == "https://perf.example"
+    assert calls[1]["service_worker"] is False
+    assert calls[1]["supabase_url"] == "https://acme.supabase.co"
+
+
+def test_regenerate_reports_what_changed(tmp_path, capsys):
+    ProjectScaffolder(str(tmp_path), quiet=True).create_project()
+    (tmp_path / "src" / "App.vue").unlink()
+    scaffold_watch.regenerate(scaffold_trackit, str(tmp_path), {})
+    output = capsys.readouterr().out
+    assert "src/App.vue: missing on disk" in output
+    assert "1 file(s) updated" in output